@@ -0,0 +1,132 @@
+"""
+Benchmark: contact extraction per page body.
+
+Compares the old approach (string patterns handed to re.finditer/re.findall on
+every call, one pass per field plus a line-by-line address scan, re.sub per phone
+match) with the precompiled single-pass ContactExtractor, and checks that both
+find the same phones and address line.
+
+The corpus is a directory of saved pages (.html or .txt). HTML is reduced to its
+visible text first, the way the crawler sees it. Without --corpus a synthetic
+corpus of PG-style pages is generated.
+
+Usage:
+    python scripts/bench_contacts.py --corpus data/pages --repeat 5
+    python scripts/bench_contacts.py --pages 2000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.core.contacts import CONTACTS, PHONE_PATTERN, EMAIL_PATTERN, ADDRESS_HINTS
+from src.scrapers.core.http_fetch import parse_html
+
+
+def legacy_clean_phone(phone_str):
+    digits = re.sub(r"\D", "", phone_str)
+    if len(digits) > 10:
+        if digits.startswith("91"):
+            digits = digits[2:]
+        elif digits.startswith("0") and len(digits) == 11:
+            digits = digits[1:]
+    return digits if len(digits) == 10 else None
+
+
+def legacy_extract(text):
+    phones = set()
+    for match in re.finditer(PHONE_PATTERN, text):
+        p = legacy_clean_phone(match.group(0))
+        if p: phones.add(p)
+    emails = set(re.findall(EMAIL_PATTERN, text))
+    address = None
+    for line in text.split("\n"):
+        if len(line) < 150 and not re.search(PHONE_PATTERN, line):
+            if any(ind in line.lower() for ind in ADDRESS_HINTS):
+                address = line
+                break
+    return phones, emails, address
+
+
+def single_pass_extract(text):
+    found = CONTACTS.extract(text)
+    address = None
+    for line in found.address_lines:
+        if not CONTACTS.has_phone(line):
+            address = line
+            break
+    return found.phones, found.emails, address
+
+
+def synthetic_page(rng, i):
+    areas = ["Navrangpura", "Satellite", "Bodakdev", "Vastrapur", "Gurukul", "Thaltej", "Maninagar"]
+    lines = [f"Shree Residency {i} - Boys & Girls PG in {rng.choice(areas)}"]
+    for _ in range(rng.randint(40, 160)):
+        lines.append(rng.choice([
+            "Fully furnished rooms with AC, Wi-Fi, laundry and home cooked meals.",
+            "Single, double and triple sharing available for students and working professionals.",
+            "Book a visit today and get the first week free. Limited beds available!",
+            "Our residents love the peaceful environment and 24x7 security.",
+            f"Rent starts at Rs {rng.randint(5, 15)},{rng.randint(100, 999)} per month.",
+        ]))
+    lines.insert(rng.randrange(len(lines)), f"Call us: +91 {rng.randint(60000, 99999)} {rng.randint(10000, 99999)}")
+    lines.insert(rng.randrange(len(lines)), f"Email: info@residency{i}.in")
+    lines.insert(rng.randrange(len(lines)), f"{rng.randint(1, 99)}, Opp. {rng.choice(areas)} Road, Ahmedabad 3800{rng.randint(10, 99)}")
+    return "\n".join(lines)
+
+
+def load_corpus(path):
+    pages = []
+    for name in sorted(os.listdir(path)):
+        full = os.path.join(path, name)
+        if not os.path.isfile(full):
+            continue
+        with open(full, "r", encoding="utf-8", errors="ignore") as f:
+            raw = f.read()
+        pages.append(parse_html(raw).text if name.endswith((".html", ".htm")) else raw)
+    return pages
+
+
+def run(fn, pages, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            fn(page)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", help="Directory of saved pages (.html/.txt)")
+    parser.add_argument("--pages", type=int, default=1000, help="Synthetic pages when no corpus is given")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)
+    else:
+        rng = random.Random(42)
+        pages = [synthetic_page(rng, i) for i in range(args.pages)]
+    total_kb = sum(len(p) for p in pages) / 1024
+    print(f"Corpus: {len(pages)} pages, {total_kb:.0f} KB of text")
+
+    mismatches = sum(1 for p in pages if legacy_extract(p) != single_pass_extract(p))
+    print(f"Pages where results differ: {mismatches}")
+
+    legacy = run(legacy_extract, pages, args.repeat)
+    single = run(single_pass_extract, pages, args.repeat)
+    print(f"{'':>12} {'total (ms)':>12} {'us/page':>10} {'MB/s':>8}")
+    for label, elapsed in (("legacy", legacy), ("single-pass", single)):
+        print(f"{label:>12} {elapsed * 1e3:>12.1f} {elapsed / len(pages) * 1e6:>10.1f} {total_kb / 1024 / elapsed:>8.1f}")
+    print(f"Speedup: {legacy / single:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Benchmark: universal list extraction, sequential extract_pg_data vs the async
+extractor with N URLs in flight (process_websites_list's two paths).
+
+The pages are stand-ins for Playwright pages: goto() takes `--latency` seconds
+(a real page load) and the snapshot evaluate() returns fixture data, half of
+the sites listing pages with cards (every other card needs its detail page),
+half direct sites. Everything else is the real code: the 3-try loop, the
+blocking-element / reveal passes, the waits between steps, card detection,
+the page cache (empty for each run) and the per-URL append to the output.
+No Chromium is needed, so the numbers isolate how the URL list and the detail
+pages of each listing are scheduled. A sync page started with
+wait_until="commit" finishes loading `--latency` after its goto(), like a tab
+loading in the background.
+
+Usage:
+    python scripts/bench_listing.py --urls 20 --concurrency 1 5 10 --latency 0.8
+    python scripts/bench_listing.py --urls 10 --cards 30 --concurrency 1 5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.core.rate_limit import RateLimiter
+from src.scrapers.core import listing
+from src.scrapers.core.page_cache import PageCache
+
+CARD = "Twin sharing rooms with meals, wifi and laundry for students near the university campus. "
+
+
+def fixture_pages(n, n_cards):
+    pages = {}
+    for i in range(n):
+        if i % 2:
+            pages[f"https://site{i}.in"] = {
+                "title": f"Site {i} PG", "text": f"Site {i} PG\nCall 97250 {i:05d}\nGota, Ahmedabad 382481",
+            }
+            continue
+        cards = []
+        for c in range(n_cards):
+            has_phone = c % 2 == 0
+            cards.append({
+                "text": CARD + (f"Call 98250 {i:02d}{c:03d}" if has_phone else "Near Sindhu Bhavan Road"),
+                "heading": f"PG {i}-{c}", "heading_href": f"/pg/{c}", "first_href": None, "tel_links": [],
+            })
+            pages[f"https://list{i}.in/pg/{c}"] = {"text": f"PG {i}-{c}", "tel_links": [f"tel:99250{i:02d}{c:03d}"]}
+        pages[f"https://list{i}.in"] = {"title": f"Listings {i}", "scanned_cards": True, "cards": cards}
+    return pages
+
+
+class Locator:
+    first = property(lambda self: self)
+
+    def is_visible(self):
+        return False
+
+    def all(self):
+        return []
+
+
+class SyncPage:
+    def __init__(self, pages, latency):
+        self.pages, self.latency, self.url = pages, latency, "about:blank"
+        self.loaded_at = 0
+
+    def goto(self, url, timeout=None, wait_until="load"):
+        # wait_until="commit" returns at once; the page keeps loading "in the browser"
+        self.loaded_at = time.perf_counter() + self.latency
+        self.url = url
+        if wait_until != "commit":
+            self.wait_for_load_state()
+
+    def wait_for_load_state(self, state="load", timeout=None):
+        time.sleep(max(0.0, self.loaded_at - time.perf_counter()))
+
+    def locator(self, selector):
+        return Locator()
+
+    def content(self):
+        return "<html></html>"
+
+    def evaluate(self, js, arg=None):
+        if js.startswith("window."):
+            return None
+        return {**self.pages.get(self.url, {}), "scanned_cards": bool(arg)}
+
+    def close(self):
+        pass
+
+
+class AsyncLocator(Locator):
+    async def is_visible(self):
+        return False
+
+    async def all(self):
+        return []
+
+
+class AsyncPage(SyncPage):
+    async def goto(self, url, timeout=None, wait_until="load"):
+        await asyncio.sleep(self.latency)
+        self.url = url
+
+    async def wait_for_load_state(self, state="load", timeout=None):
+        pass
+
+    def locator(self, selector):
+        return AsyncLocator()
+
+    async def content(self):
+        return "<html></html>"
+
+    async def evaluate(self, js, arg=None):
+        return SyncPage.evaluate(self, js, arg)
+
+    async def close(self):
+        pass
+
+
+class SyncPool:
+    def __init__(self, pages, latency):
+        self.pages, self.latency = pages, latency
+
+    def new_context(self, **kwargs):
+        pool = self
+
+        class Context:
+            def new_page(self):
+                return SyncPage(pool.pages, pool.latency)
+
+            def close(self):
+                pass
+
+        return Context()
+
+
+class AsyncPool(SyncPool):
+    async def new_context(self, **kwargs):
+        pool = self
+
+        class Context:
+            async def new_page(self):
+                return AsyncPage(pool.pages, pool.latency)
+
+            async def close(self):
+                pass
+
+        return Context()
+
+
+def run(urls, pages, concurrency, latency, tmp):
+    cache = PageCache(os.path.join(tmp, f"pages_{concurrency}.db"))
+    output = listing.ListingOutput(os.path.join(tmp, f"pg_{concurrency}.json"))
+    limiter = RateLimiter(site_limit=(1000, 1000))
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        if concurrency == 1:
+            # The sequential path exactly as process_websites_list runs it
+            listing.get_sync_browser_pool = lambda: SyncPool(pages, latency)
+            listing.get_page_cache = lambda: cache
+            listing.get_rate_limiter = lambda: limiter
+            for url in urls:
+                output.add(listing.extract_pg_data(url))
+        else:
+            extractor = listing.AsyncListingExtractor(pool=AsyncPool(pages, latency), limiter=limiter, cache=cache)
+            asyncio.run(listing.extract_websites(urls, output, concurrency=concurrency, extractor=extractor))
+    cache.close()
+    return output.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--urls", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 5, 10], help="1 = sequential extract_pg_data")
+    parser.add_argument("--cards", type=int, default=6, help="Cards per listing page, every other one without contacts")
+    parser.add_argument("--latency", type=float, default=0.8, help="Seconds per page load")
+    args = parser.parse_args()
+
+    pages = fixture_pages(args.urls, args.cards)
+    urls = [f"https://list{i}.in" if i % 2 == 0 else f"https://site{i}.in" for i in range(args.urls)]
+    print(f"{args.urls} URLs ({args.urls // 2} listing pages with {args.cards} cards, "
+          f"{args.cards // 2} needing a detail page), "
+          f"{args.latency}s per page load")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for concurrency in args.concurrency:
+            start = time.perf_counter()
+            records = run(urls, pages, concurrency, args.latency, tmp)
+            results.append((concurrency, time.perf_counter() - start, records))
+
+    base = results[0][1]
+    print(f"\n{'path':<22} {'time (s)':>9} {'records':>8} {'URLs/s':>7} {'speedup':>8}")
+    for concurrency, elapsed, records in results:
+        label = "extract_pg_data (seq)" if concurrency == 1 else f"async, {concurrency} in flight"
+        print(f"{label:<22} {elapsed:>9.2f} {records:>8} {args.urls / elapsed:>7.2f} {base / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
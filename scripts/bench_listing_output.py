@@ -0,0 +1,99 @@
+"""
+Benchmark: per-URL save cost of process_websites_list's output as pg.json grows.
+
+- rewrite: the old ListingOutput, whole pg.json loaded, a set of source+name
+  strings built, and the full list rewritten with indent=2 after every URL
+- jsonl:   ListingOutput, new records appended to pg.jsonl, keys to the
+  ProcessedSites key log + sorted hash index; pg.json written by compact()
+
+Each run starts from a pg.json of `--existing` records (the jsonl run indexes
+its keys once on the first open, reported separately), then saves `--urls`
+URLs of `--per-url` new records each. "next run" opens and closes the same
+output again with nothing to add.
+
+Usage:
+    python scripts/bench_listing_output.py --existing 1000 10000 100000 --urls 50
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.scrapers.core.listing import ListingOutput
+
+
+def record(i):
+    return {
+        "name": f"Shree Krishna PG {i}", "mobile": [f"98250{i % 100000:05d}"], "email": [f"stay{i}@example.in"],
+        "address": f"{i} Near Gurukul Road, Memnagar, Ahmedabad 380052", "source": f"https://listings.in/pg/{i}",
+        "type": "Aggregator Listing",
+    }
+
+
+class RewriteOutput:
+    """The old writer, kept here for comparison."""
+    def __init__(self, output_file):
+        self.output_file = output_file
+        with open(output_file) as f:
+            self.all_pgs = json.load(f)
+        self.seen_entries = {pg.get("source", "") + pg.get("name", "") for pg in self.all_pgs}
+
+    def add(self, pg_data_list):
+        for pg in pg_data_list:
+            key = pg["source"] + pg["name"]
+            if key not in self.seen_entries:
+                self.seen_entries.add(key)
+                self.all_pgs.append(pg)
+        with open(self.output_file, "w") as f:
+            json.dump(self.all_pgs, f, indent=2)
+
+    def close(self):
+        return len(self.all_pgs)
+
+
+def run(writer_cls, existing, urls, per_url, tmp):
+    output_file = os.path.join(tmp, f"{writer_cls.__name__}_{existing}", "pg.json")
+    os.makedirs(os.path.dirname(output_file))
+    with open(output_file, "w") as f:
+        json.dump([record(i) for i in range(existing)], f, indent=2)
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        start = time.perf_counter()
+        output = writer_cls(output_file)
+        opened = time.perf_counter()
+        for u in range(urls):
+            output.add([record(existing + u * per_url + r) for r in range(per_url)])
+        saved = time.perf_counter()
+        total = output.close()
+        closed = time.perf_counter()
+        # Next run on the same output
+        writer_cls(output_file).close()
+        reopened = time.perf_counter()
+    assert total == existing + urls * per_url
+    return opened - start, (saved - opened) / urls, closed - saved, reopened - closed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--existing", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--urls", type=int, default=50)
+    parser.add_argument("--per-url", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.urls} URLs x {args.per_url} new records on top of an existing pg.json\n")
+    print(f"{'existing':>9} {'writer':<8} {'open (ms)':>10} {'per URL (ms)':>13} {'close (ms)':>11} {'next run (ms)':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for existing in args.existing:
+            for label, writer_cls in (("rewrite", RewriteOutput), ("jsonl", ListingOutput)):
+                opened, per_url, closed, rerun = run(writer_cls, existing, args.urls, args.per_url, tmp)
+                print(f"{existing:>9} {label:<8} {opened * 1000:>10.1f} {per_url * 1000:>13.2f} "
+                      f"{closed * 1000:>11.1f} {rerun * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+Benchmark: Google Maps feed walk, sync click-per-entry (search_google_maps) vs
+the async engine opening place pages in parallel tabs (search_google_maps_async).
+
+The feed is replayed from a local fixture (scripts/fixtures/maps_feed.json:
+place URLs and side panel fields in feed order, `per_scroll` entries revealed
+per scroll) through stand-ins for the Playwright page, so no Chromium or
+network is needed. A clicked entry's panel appears `--panel-ms` after the click,
+a place page opened in a tab is ready `--place-ms` after goto(). Everything
+else is the real code: the click loop with its random_delay(0.8, 1.5) and 2 s
+h1 wait, the feed scroll pauses, MapsCollector's upsert / early exit, and the
+tab window of the async engine.
+
+With `--known N`, places from the N-th on are already in the master list, so
+both engines stop on the consecutive-duplicates early exit.
+
+Usage:
+    python scripts/bench_maps.py --tabs 1 4 8 --panel-ms 600 --place-ms 1500
+    python scripts/bench_maps.py --tabs 4 --known 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.scrapers.engines import google_maps
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "maps_feed.json")
+END_OF_LIST = "text=You've reached the end of the list"
+
+
+def panel_snapshot(place):
+    """What PANEL_JS returns for this place's panel (empty fields while no panel is shown)."""
+    if place is None:
+        return {"name": "", "rating": "", "address": "", "phone": "", "website": ""}
+    return {
+        "name": place["name"], "rating": place["rating"],
+        "address": "Address: " + place["address"] if place["address"] else "",
+        "phone": "Phone: " + place["phone"] if place["phone"] else "",
+        "website": place["website"],
+    }
+
+
+class Feed:
+    """Scroll state of the recorded feed."""
+    def __init__(self, fixture):
+        self.places = fixture["places"]
+        self.per_scroll = fixture["per_scroll"]
+        self.shown = self.per_scroll
+
+    def visible(self):
+        return self.places[:self.shown]
+
+    def scroll(self):
+        self.shown = min(len(self.places), self.shown + self.per_scroll)
+
+    def at_end(self):
+        return self.shown >= len(self.places)
+
+
+# --- Sync stand-ins: the click model of search_google_maps ---
+class SyncElement:
+    def __init__(self, page, selector, place=None):
+        self.page, self.selector, self.place = page, selector, place
+
+    first = property(lambda self: self)
+
+    def locator(self, selector):
+        return SyncElement(self.page, selector)
+
+    def all(self):
+        if self.selector == "div[role='article']":
+            return [SyncElement(self.page, "article", place) for place in self.page.feed.visible()]
+        return []
+
+    def scroll_into_view_if_needed(self):
+        pass
+
+    def click(self):
+        self.page.panel, self.page.panel_ready = self.place, time.perf_counter() + self.page.panel_delay
+
+    def focus(self):
+        pass
+
+    def is_visible(self):
+        return self.selector == END_OF_LIST and self.page.feed.at_end()
+
+
+class SyncMouse:
+    def __init__(self, page):
+        self.page = page
+
+    def wheel(self, x, y):
+        self.page.feed.scroll()
+
+
+class SyncFeedPage:
+    def __init__(self, fixture, panel_delay):
+        self.feed, self.panel_delay = Feed(fixture), panel_delay
+        self.panel, self.panel_ready = None, 0
+        self.mouse = SyncMouse(self)
+
+    def current_panel(self):
+        return self.panel if self.panel is not None and time.perf_counter() >= self.panel_ready else None
+
+    def goto(self, url, timeout=None):
+        pass
+
+    def wait_for_selector(self, selector, timeout=None):
+        if selector == "div[role='main'] h1":
+            wait = self.panel_ready - time.perf_counter()
+            time.sleep(max(0.0, min(wait, timeout / 1000)))
+            if wait > timeout / 1000:
+                raise TimeoutError(selector)
+
+    def locator(self, selector):
+        return SyncElement(self, selector)
+
+    def evaluate(self, js, arg=None):
+        return panel_snapshot(self.current_panel())
+
+
+class SyncPool:
+    def __init__(self, fixture, panel_delay):
+        self.fixture, self.panel_delay = fixture, panel_delay
+
+    def new_context(self, **kwargs):
+        pool = self
+
+        class Context:
+            def new_page(self):
+                return SyncFeedPage(pool.fixture, pool.panel_delay)
+
+            def close(self):
+                pass
+
+        return Context()
+
+
+# --- Async stand-ins: feed page + one tab per place page ---
+class AsyncElement:
+    def __init__(self, page, selector):
+        self.page, self.selector = page, selector
+
+    first = property(lambda self: self)
+
+    async def focus(self):
+        pass
+
+    async def is_visible(self):
+        return self.selector == END_OF_LIST and self.page.feed.at_end()
+
+
+class AsyncMouse:
+    def __init__(self, page):
+        self.page = page
+
+    async def wheel(self, x, y):
+        self.page.feed.scroll()
+
+
+class AsyncPage:
+    def __init__(self, fixture, feed, place_delay):
+        self.by_url = {place["url"]: place for place in fixture["places"]}
+        self.feed, self.place_delay, self.place = feed, place_delay, None
+        self.mouse = AsyncMouse(self)
+
+    async def goto(self, url, timeout=None, wait_until="load"):
+        if url in self.by_url:
+            await asyncio.sleep(self.place_delay)
+            self.place = self.by_url[url]
+
+    async def wait_for_selector(self, selector, timeout=None):
+        pass
+
+    async def evaluate(self, js, arg=None):
+        if js == google_maps.PANEL_JS:
+            return panel_snapshot(self.place)
+        return [place["url"] for place in self.feed.visible()]
+
+    def locator(self, selector):
+        return AsyncElement(self, selector)
+
+    async def close(self):
+        pass
+
+
+class AsyncPool:
+    def __init__(self, fixture, place_delay):
+        self.fixture, self.place_delay = fixture, place_delay
+
+    async def new_context(self, **kwargs):
+        pool, feed = self, Feed(self.fixture)
+
+        class Context:
+            async def new_page(self):
+                return AsyncPage(pool.fixture, feed, pool.place_delay)
+
+            async def close(self):
+                pass
+
+        return Context()
+
+
+class CountingManager:
+    """Master list stand-in: places from `known` on already exist."""
+    def __init__(self, fixture, known=None):
+        self.known = {place["name"] for place in fixture["places"][known:]} if known is not None else set()
+        self.upserts = 0
+
+    def upsert_entity(self, entity):
+        self.upserts += 1
+        return "Skipped (Already exists)" if entity["name"] in self.known else "Added"
+
+    def save_master(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class NoSerpCache:
+    def get(self, *args, **kwargs):
+        return None
+
+    def put(self, *args, **kwargs):
+        pass
+
+
+def run(fixture, tabs, args):
+    manager = CountingManager(fixture, args.known)
+    google_maps.get_serp_cache = NoSerpCache
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        start = time.perf_counter()
+        if tabs == 0:
+            google_maps.get_sync_browser_pool = lambda: SyncPool(fixture, args.panel_ms / 1000)
+            google_maps.MasterDataManager = lambda *a, **kw: manager
+            google_maps.search_google_maps(fixture["query"], limit=0, headless=True)
+        else:
+            pool = AsyncPool(fixture, args.place_ms / 1000)
+            google_maps.get_browser_pool = lambda: pool
+            asyncio.run(google_maps.search_google_maps_async(fixture["query"], limit=0, headless=True,
+                                                             manager=manager, tabs=tabs))
+        elapsed = time.perf_counter() - start
+    return elapsed, manager.upserts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tabs", type=int, nargs="+", default=[1, 4, 8], help="Async place tabs (sync click loop always runs first)")
+    parser.add_argument("--panel-ms", type=int, default=600, help="Side panel load after a click")
+    parser.add_argument("--place-ms", type=int, default=1500, help="Place page load in a tab")
+    parser.add_argument("--known", type=int, default=None, help="Places from this index on are duplicates")
+    args = parser.parse_args()
+
+    with open(FIXTURE) as f:
+        fixture = json.load(f)
+    print(f"Fixture feed: {len(fixture['places'])} places, {fixture['per_scroll']} per scroll; "
+          f"panel {args.panel_ms} ms after a click, place page {args.place_ms} ms in a tab")
+
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)   # the engines save found websites under data/
+        try:
+            for tabs in [0] + args.tabs:
+                results.append((tabs,) + run(fixture, tabs, args))
+        finally:
+            os.chdir(cwd)
+
+    base = results[0][1]
+    print(f"\n{'engine':<24} {'time (s)':>9} {'places':>7} {'places/s':>9} {'speedup':>8}")
+    for tabs, elapsed, places in results:
+        label = "sync, click per entry" if tabs == 0 else f"async, {tabs} tab{'s' if tabs > 1 else ''}"
+        print(f"{label:<24} {elapsed:>9.2f} {places:>7} {places / elapsed:>9.2f} {base / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: processed-domain set at scale (startup time, memory, lookups, marking).
+
+Compares the old approach (read the whole processed_sites.txt into a Python set
+on every run_batch, open the file in append mode once per marked domain) with
+ProcessedSites (sorted 64-bit hash index + log tail, batched appends).
+
+Memory is what the loaded structure keeps alive (tracemalloc, after load). The
+first ProcessedSites start on an existing log hashes it once and writes the
+index; later starts only read the index. Everything runs in a temporary directory.
+
+Usage:
+    python scripts/bench_processed_sites.py --domains 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.core.processed import ProcessedSites
+
+
+def legacy_load(path):
+    with open(path, "r") as f:
+        return set(line.strip() for line in f if line.strip())
+
+
+def legacy_mark(path, domain):
+    with open(path, "a") as f:
+        f.write(f"{domain}\n")
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def retained(fn):
+    """Bytes kept alive by fn()'s result (separate run: tracemalloc slows loading down)."""
+    tracemalloc.start()
+    result = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--domains", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--marks", type=int, default=10_000, help="Domains marked in the append test")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    tlds = [".com", ".in", ".co.in", ".org", ".net"]
+    domains = [f"pg-{rng.getrandbits(40):x}-{i}{rng.choice(tlds)}" for i in range(args.domains)]
+    probes = [rng.choice(domains) if i % 2 else f"new-{i}.com" for i in range(args.lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "processed_sites.txt")
+        with open(path, "w") as f:
+            f.write("".join(f"{d}\n" for d in domains))
+        print(f"Log: {args.domains:,} domains, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        legacy, legacy_t = timed(lambda: legacy_load(path))
+        _, first_t = timed(lambda: ProcessedSites(path))   # no index yet: hashes the log, writes .idx
+        sites, warm_t = timed(lambda: ProcessedSites(path))
+        legacy_mem = retained(lambda: legacy_load(path))
+        warm_mem = retained(lambda: ProcessedSites(path))
+        print(f"Index: {os.path.getsize(path + '.idx') / 1e6:.1f} MB")
+
+        print(f"\n{'startup':<26} {'time (ms)':>10} {'memory (MB)':>12}")
+        print(f"{'legacy set':<26} {legacy_t * 1e3:>10.0f} {legacy_mem / 1e6:>12.1f}")
+        print(f"{'ProcessedSites (1st run)':<26} {first_t * 1e3:>10.0f} {'-':>12}")
+        print(f"{'ProcessedSites':<26} {warm_t * 1e3:>10.1f} {warm_mem / 1e6:>12.1f}")
+
+        assert all((p in legacy) == (p in sites) for p in probes[:20000])
+        start = time.perf_counter()
+        for p in probes:
+            p in legacy
+        legacy_lookup = time.perf_counter() - start
+        start = time.perf_counter()
+        for p in probes:
+            p in sites
+        sites_lookup = time.perf_counter() - start
+        print(f"\n{'lookups':<26} {'us/lookup':>10}")
+        print(f"{'legacy set':<26} {legacy_lookup / len(probes) * 1e6:>10.2f}")
+        print(f"{'ProcessedSites':<26} {sites_lookup / len(probes) * 1e6:>10.2f}")
+
+        new = [f"fresh-{i}.com" for i in range(args.marks)]
+        start = time.perf_counter()
+        for d in new:
+            legacy_mark(path + ".legacy", d)
+        legacy_marks = time.perf_counter() - start
+        start = time.perf_counter()
+        for i, d in enumerate(new):
+            sites.add("b-" + d)
+            if i % 10 == 9:        # run_batch flushes once per batch of 10
+                sites.flush()
+        sites.flush()
+        batched_marks = time.perf_counter() - start
+        print(f"\n{'marking ' + format(args.marks, ','):<26} {'time (s)':>10}")
+        print(f"{'legacy append per domain':<26} {legacy_marks:>10.3f}")
+        print(f"{'ProcessedSites, batch=10':<26} {batched_marks:>10.3f}")
+
+        print(f"\nStartup: {legacy_t / warm_t:.1f}x faster, memory: {legacy_mem / max(warm_mem, 1):.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
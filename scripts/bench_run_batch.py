@@ -0,0 +1,159 @@
+"""
+Benchmark: run_batch scheduling, fixed gather batches vs the sliding-window pool.
+
+Starts one local HTTP server per fixture site (each a separate host:port, so
+every site is its own root domain). Every `--slow-every`-th site answers each
+request after `--slow-ms`, the others after `--fast-ms`. Both modes crawl the
+same sites through the real AsyncDeepCrawler HTTP tier with the same
+concurrency:
+
+- batches: the old loop, slices of 10 awaited with asyncio.gather under a
+  Semaphore(concurrency), so each slice waits for its slowest site
+- pool:    run_batch, `concurrency` workers pulling from a queue
+
+Politeness limits are lifted and each mode gets an empty page cache, so only
+the scheduling differs.
+
+Usage:
+    python scripts/bench_run_batch.py --sites 60 --concurrency 5 --slow-every 4 --slow-ms 1500
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.core.rate_limit import RateLimiter
+from src.scrapers.core.deep_crawler import AsyncDeepCrawler, run_batch
+from src.scrapers.core.http_fetch import HttpFetcher
+from src.scrapers.core.page_cache import PageCache
+
+FILLER = "<p>Spacious rooms with attached bathrooms, home cooked food, Wi-Fi and laundry for students.</p>" * 3
+
+
+def site_pages(i):
+    return {
+        "/": f"""<html><head><title>Site {i} PG | Home</title></head><body><h1>Site {i} PG</h1>{FILLER}
+            <a href="/contact-us">Contact</a> <a href="/about">About us</a></body></html>""",
+        "/contact-us": f"<html><body><p>Call 98765 {i:05d}</p><p>Gurukul Road, Ahmedabad</p></body></html>",
+        "/about": f"<html><body>{FILLER}</body></html>",
+    }
+
+
+def start_site(i, delay):
+    pages = site_pages(i)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            body = pages.get(self.path)
+            if body is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            data = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+class NoBrowserPool:
+    async def new_context(self, **kwargs):
+        raise RuntimeError("fixture site escalated to the browser")
+
+
+class CountingManager:
+    def __init__(self):
+        self.leads = 0
+
+    def upsert_entity(self, entity):
+        self.leads += 1
+        return "Inserted"
+
+    def save_master(self):
+        pass
+
+
+def make_crawler(tmp, name):
+    return AsyncDeepCrawler(
+        pool=NoBrowserPool(), limiter=RateLimiter(site_limit=(1000, 1000)), fetcher=HttpFetcher(timeout=30),
+        cache=PageCache(os.path.join(tmp, f"{name}.db")),
+    )
+
+
+async def gather_batches(urls, crawler, concurrency):
+    """The previous run_batch loop (crawl part only)."""
+    roots = [u.split("//", 1)[1] for u in urls]
+    sem = asyncio.Semaphore(concurrency)
+    leads = 0
+
+    async def sem_task(root):
+        async with sem:
+            return await crawler.sub_process_domain(root, [])
+
+    for i in range(0, len(roots), 10):
+        results = await asyncio.gather(*[sem_task(r) for r in roots[i:i + 10]])
+        leads += sum(1 for entity in results if entity)
+    await crawler.close()
+    return leads
+
+
+async def sliding_pool(urls, crawler, concurrency):
+    manager = CountingManager()
+    await run_batch(urls, None, manager=manager, track_processed=False, crawler=crawler, concurrency=concurrency)
+    await crawler.close()
+    return manager.leads
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sites", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--slow-every", type=int, default=4, help="Every Nth site is slow")
+    parser.add_argument("--slow-ms", type=float, default=1500)
+    parser.add_argument("--fast-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    servers = [
+        start_site(i, (args.slow_ms if i % args.slow_every == 0 else args.fast_ms) / 1000)
+        for i in range(args.sites)
+    ]
+    urls = [f"http://127.0.0.1:{httpd.server_address[1]}" for httpd in servers]
+    slow = sum(1 for i in range(args.sites) if i % args.slow_every == 0)
+    print(f"{args.sites} sites ({slow} slow at {args.slow_ms:.0f} ms/request, rest {args.fast_ms:.0f} ms), "
+          f"concurrency {args.concurrency}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, mode in (("batches of 10", gather_batches), ("sliding pool", sliding_pool)):
+            crawler = make_crawler(tmp, name.replace(" ", "_"))
+            start = time.perf_counter()
+            leads = asyncio.run(mode(urls, crawler, args.concurrency))
+            results[name] = (time.perf_counter() - start, leads)
+
+    for httpd in servers:
+        httpd.shutdown()
+
+    print(f"\n{'mode':<16} {'time (s)':>9} {'leads':>6} {'sites/s':>8}")
+    for name, (elapsed, leads) in results.items():
+        print(f"{name:<16} {elapsed:>9.2f} {leads:>6} {args.sites / elapsed:>8.1f}")
+    old, new = results["batches of 10"][0], results["sliding pool"][0]
+    print(f"\nSliding pool: {old / new:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
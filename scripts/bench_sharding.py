@@ -0,0 +1,151 @@
+"""
+Benchmark: Deep Study throughput with K crawler processes (run_sharded).
+
+Local fixture sites (one HTTP server per site, so each is its own root domain)
+serve large pages, so the crawl is bound by CPU work: HTML parsing, text
+extraction and the contact regexes, the same work that caps a single event loop.
+Each K gets an empty page cache, politeness limits are lifted and every process
+runs `--concurrency` workers. K=0 is the in-process run_batch baseline.
+
+Scaling needs free cores: on a single-core machine the extra processes only add
+startup and IPC overhead, and the numbers show exactly that.
+
+Usage:
+    python scripts/bench_sharding.py --sites 80 --shards 0 1 2 4 --page-kb 300
+"""
+import argparse
+import asyncio
+import functools
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.core.rate_limit import RateLimiter
+from src.scrapers.core.deep_crawler import AsyncDeepCrawler, run_batch
+from src.scrapers.core.http_fetch import HttpFetcher
+from src.scrapers.core.page_cache import PageCache
+from src.scrapers.core.sharding import run_sharded
+
+ROW = ("<div class='room'><h3>Twin sharing room</h3><p>Rs. 8,500 per month, meals included, "
+       "call 98250 {i:05d} or write to stay{i}@example.in. Near Gurukul Road, Ahmedabad.</p>"
+       "<a href='/rooms/{i}'>Room {i}</a></div>")
+
+
+def site_pages(i, page_kb):
+    rows = []
+    size = 0
+    while size < page_kb * 1024:
+        rows.append(ROW.format(i=len(rows)))
+        size += len(rows[-1])
+    body = "".join(rows)
+    return {
+        "/": f"""<html><head><title>Site {i} PG | Home</title></head><body><h1>Site {i} PG</h1>
+            <p>Paying guest rooms for students</p>{body}
+            <a href="/contact-us">Contact</a></body></html>""".encode(),
+        "/contact-us": f"<html><body><p>Call 98765 {i:05d}</p>{body}</body></html>".encode(),
+    }
+
+
+def start_site(i, page_kb):
+    pages = site_pages(i, page_kb)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            data = pages.get(self.path)
+            if data is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+class NoBrowserPool:
+    async def new_context(self, **kwargs):
+        raise RuntimeError("fixture site escalated to the browser")
+
+
+def make_crawler(cache_path):
+    """Crawler factory for every shard process (module level, so it pickles)."""
+    return AsyncDeepCrawler(
+        pool=NoBrowserPool(), limiter=RateLimiter(site_limit=(1000, 1000)), fetcher=HttpFetcher(timeout=60),
+        cache=PageCache(cache_path),
+    )
+
+
+class CountingManager:
+    def __init__(self):
+        self.leads = 0
+
+    def upsert_entity(self, entity):
+        self.leads += 1
+        return "Inserted"
+
+    def save_master(self):
+        pass
+
+
+def run(urls, shards, concurrency, cache_path):
+    manager = CountingManager()
+    if shards == 0:
+        async def in_process():
+            crawler = make_crawler(cache_path)
+            try:
+                await run_batch(urls, None, manager=manager, track_processed=False, crawler=crawler,
+                                concurrency=concurrency)
+            finally:
+                await crawler.close()
+        asyncio.run(in_process())
+    else:
+        run_sharded(urls, None, shards=shards, concurrency=concurrency, track_processed=False, manager=manager,
+                    crawler_factory=functools.partial(make_crawler, cache_path))
+    return manager.leads
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sites", type=int, default=80)
+    parser.add_argument("--shards", type=int, nargs="+", default=[0, 1, 2, 4], help="0 = in-process run_batch")
+    parser.add_argument("--concurrency", type=int, default=5, help="Workers per process")
+    parser.add_argument("--page-kb", type=int, default=300)
+    args = parser.parse_args()
+
+    servers = [start_site(i, args.page_kb) for i in range(args.sites)]
+    urls = [f"http://127.0.0.1:{httpd.server_address[1]}" for httpd in servers]
+    print(f"{args.sites} sites, 2 pages of ~{args.page_kb} KB each, {args.concurrency} workers per process, "
+          f"{os.cpu_count()} CPUs")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for shards in args.shards:
+            start = time.perf_counter()
+            leads = run(urls, shards, args.concurrency, os.path.join(tmp, f"pages_{shards}.db"))
+            results.append((shards, time.perf_counter() - start, leads))
+
+    for httpd in servers:
+        httpd.shutdown()
+
+    base = results[0][1]
+    print(f"\n{'processes':<20} {'time (s)':>9} {'leads':>6} {'sites/s':>8} {'speedup':>8}")
+    for shards, elapsed, leads in results:
+        label = "run_batch (1 loop)" if shards == 0 else f"K={shards}"
+        print(f"{label:<20} {elapsed:>9.2f} {leads:>6} {args.sites / elapsed:>8.1f} {base / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+Benchmark: browser round trips per page, per-element reads vs one snapshot.
+
+Playwright sends every locator.all() / inner_text() / get_attribute() /
+is_visible() / count() call to the browser and waits for the answer. This script
+runs the old per-element extraction (priority links, smart name, listing cards,
+tel: links, meta description) and the single-evaluate snapshot against the same
+synthetic page, counts the calls each makes and checks they read the same data.
+
+The page is an in-process fake, because the point is to count calls: --rtt-ms
+adds a simulated round-trip latency per call (a local Chromium is ~0.2-1 ms, a
+remote browser several ms) to turn the counts into wall time.
+
+Usage:
+    python scripts/bench_snapshot_ipc.py --links 300 --cards 40 --rtt-ms 0.5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from urllib.parse import urljoin, urlparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.core.contacts import clean_phone
+from src.scrapers.core.snapshot import PageSnapshot
+from src.scrapers.core.listing import CARD_SELECTORS, tel_link_phones
+from src.scrapers.core.deep_crawler import PRIORITY_KEYWORDS, NAME_BAD_WORDS
+
+
+# --- Fake DOM ---
+class Node:
+    def __init__(self, text="", attrs=None, children=None, visible=True):
+        self.text = text
+        self.attrs = attrs or {}
+        self.children = children or {}   # selector -> [Node]
+        self.visible = visible
+
+
+def descendants(node, selector):
+    for sel, kids in node.children.items():
+        for kid in kids:
+            if sel == selector:
+                yield kid
+            yield from descendants(kid, selector)
+
+
+class CountingPage:
+    """Minimal sync Page/Locator API over a fake DOM; counts browser round trips."""
+    def __init__(self, root, title, rtt):
+        self.root = root
+        self._title = title
+        self.rtt = rtt
+        self.calls = 0
+
+    def hit(self):
+        self.calls += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+    def locator(self, selector):
+        return FakeLocator(self, [self.root], selector)
+
+    def title(self):
+        self.hit()
+        return self._title
+
+    def evaluate(self, js, arg=None):
+        self.hit()
+        return build_snapshot(self.root, self._title, arg or [])
+
+
+class FakeLocator:
+    def __init__(self, page, parents, selector):
+        self.page = page
+        self.nodes = [n for p in parents for n in descendants(p, selector)]
+
+    @property
+    def first(self):
+        loc = FakeLocator.__new__(FakeLocator)
+        loc.page, loc.nodes = self.page, self.nodes[:1]
+        return loc
+
+    def all(self):
+        self.page.hit()
+        out = []
+        for n in self.nodes:
+            loc = FakeLocator.__new__(FakeLocator)
+            loc.page, loc.nodes = self.page, [n]
+            out.append(loc)
+        return out
+
+    def locator(self, selector):
+        return FakeLocator(self.page, self.nodes, selector)
+
+    def count(self):
+        self.page.hit()
+        return len(self.nodes)
+
+    def is_visible(self):
+        self.page.hit()
+        return bool(self.nodes) and self.nodes[0].visible
+
+    def inner_text(self):
+        self.page.hit()
+        return self.nodes[0].text
+
+    def get_attribute(self, name):
+        self.page.hit()
+        return self.nodes[0].attrs.get(name)
+
+
+def build_snapshot(root, title, card_selectors):
+    """What SNAPSHOT_JS returns for the fake DOM."""
+    body = root.children["body"][0]
+    data = {
+        "title": title, "text": body.text,
+        "meta_description": root.children["meta"][0].attrs["content"],
+        "h1s": [h.text.strip() for h in descendants(body, "h1")],
+        "img_alts": [i.attrs["alt"] for i in descendants(body, "img")],
+        "links": [[a.attrs["href"], a.text] for a in descendants(body, "a[href]")],
+        "tel_links": [a.attrs["href"] for a in descendants(body, "tel")],
+        "card_selector": None, "cards": [],
+    }
+    for selector in card_selectors:
+        valid = [c for c in body.children.get(selector, []) if len(c.text) > 100]
+        if len(valid) < 2:
+            continue
+        data["card_selector"] = selector
+        for card in valid:
+            heading = (card.children.get("heading") or [None])[0]
+            shown = heading is not None and heading.visible
+            heading_link = (heading.children.get("a") or [None])[0] if shown else None
+            first_link = (card.children.get("a") or [None])[0]
+            data["cards"].append({
+                "text": card.text,
+                "heading": heading.text.strip() if shown else None,
+                "heading_href": heading_link.attrs.get("href") if heading_link else None,
+                "first_href": first_link.attrs.get("href") if first_link else None,
+                "tel_links": [a.attrs["href"] for a in card.children.get("tel", [])],
+            })
+        break
+    return data
+
+
+def synthetic_page(rng, n_links, n_cards):
+    links = []
+    for i in range(n_links):
+        kind = rng.choice(["contact", "about", "blog", "rooms", "gallery", "faq", "location", "offers"])
+        links.append(Node(text=f"{kind.title()} {i}", attrs={"href": f"/{kind}-{i}"}))
+    cards = []
+    for i in range(n_cards):
+        link = Node(attrs={"href": f"/pg/{i}"})
+        heading = Node(text=f"Residency {i}", children={"a": [link]}, visible=rng.random() > 0.1)
+        tels = [Node(attrs={"href": f"tel:+91 98{rng.randint(10000000, 99999999)}"})] if rng.random() > 0.5 else []
+        cards.append(Node(
+            text=f"Residency {i}\n" + "Furnished rooms with meals and Wi-Fi near the metro. " * 3,
+            children={"heading": [heading], "a": [link], "tel": tels},
+        ))
+    body = Node(
+        text="Sunrise PG\nCall 9876543210",
+        children={
+            "h1": [Node(text="Welcome to our PG"), Node(text="Sunrise PG")],
+            "img": [Node(attrs={"alt": "Sunrise logo"})],
+            "a[href]": links,
+            "tel": [Node(attrs={"href": "tel:9876543210"})],
+            CARD_SELECTORS[0]: cards,
+        },
+    )
+    meta = Node(attrs={"content": "Boys and girls PG in Ahmedabad"})
+    return Node(children={"body": [body], "meta": [meta]})
+
+
+# --- Legacy per-element extraction (pre-snapshot code paths) ---
+def legacy_extract(page, base_url):
+    body = page.locator("body").inner_text()
+    title = page.title()
+
+    name = None
+    for h1 in page.locator("h1").all():
+        text = h1.inner_text().strip()
+        if 3 < len(text) < 50 and not any(w in text.lower() for w in NAME_BAD_WORDS):
+            name = text
+            break
+    if name is None:
+        for img in page.locator("img").all():
+            alt = img.get_attribute("alt")
+            if alt and len(alt) > 3:
+                name = alt
+                break
+
+    links = []
+    domain = urlparse(base_url).netloc
+    for el in page.locator("a[href]").all():
+        href = el.get_attribute("href")
+        if not href or href.startswith("#") or "javascript" in href: continue
+        full_url = urljoin(base_url, href)
+        if urlparse(full_url).netloc != domain: continue
+        text = (el.inner_text() or "").lower()
+        if any(kw in href.lower() or kw in text for kw in PRIORITY_KEYWORDS):
+            links.append(full_url)
+
+    meta = ""
+    desc = page.locator("meta").first
+    if desc.count() > 0:
+        meta = desc.get_attribute("content") or ""
+
+    page_tels = set()
+    for link in page.locator("tel").all():
+        p = clean_phone(link.get_attribute("href").replace("tel:", ""))
+        if p: page_tels.add(p)
+
+    cards = []
+    for selector in CARD_SELECTORS:
+        elements = page.locator("body").locator(selector).all()
+        valid = [el for el in elements if len(el.inner_text()) > 100]
+        if len(valid) < 2:
+            continue
+        for card in valid:
+            card_text = card.inner_text()
+            card_name, detail_url = None, None
+            heading = card.locator("heading").first
+            if heading.is_visible():
+                card_name = heading.inner_text().strip()
+                link = heading.locator("a").first
+                if link.count() > 0:
+                    detail_url = link.get_attribute("href")
+                else:
+                    parent_link = card.locator("a").first
+                    if parent_link.count() > 0:
+                        detail_url = parent_link.get_attribute("href")
+            tels = set()
+            for link in card.locator("tel").all():
+                p = clean_phone(link.get_attribute("href").replace("tel:", ""))
+                if p: tels.add(p)
+            cards.append((card_text, card_name, detail_url, tels))
+        break
+    return body, title, name, sorted(set(links)), meta, page_tels, cards
+
+
+def snapshot_extract(page, base_url):
+    snap = PageSnapshot(page.evaluate("SNAPSHOT_JS", CARD_SELECTORS))
+
+    name = None
+    for text in snap.h1s:
+        if 3 < len(text) < 50 and not any(w in text.lower() for w in NAME_BAD_WORDS):
+            name = text
+            break
+    if name is None:
+        name = next((alt for alt in snap.img_alts if alt and len(alt) > 3), None)
+
+    links = []
+    domain = urlparse(base_url).netloc
+    for href, text in snap.links:
+        if href.startswith("#") or "javascript" in href: continue
+        full_url = urljoin(base_url, href)
+        if urlparse(full_url).netloc != domain: continue
+        if any(kw in href.lower() or kw in text.lower() for kw in PRIORITY_KEYWORDS):
+            links.append(full_url)
+
+    cards = [
+        (c["text"], c["heading"], (c["heading_href"] or c["first_href"]) if c["heading"] is not None else None,
+         tel_link_phones(c["tel_links"]))
+        for c in snap.cards
+    ]
+    return (snap.text, snap.title, name, sorted(set(links)), snap.meta_description,
+            tel_link_phones(snap.tel_links), cards)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--links", type=int, default=300, help="Anchors on the page")
+    parser.add_argument("--cards", type=int, default=40, help="Listing cards on the page")
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="Simulated latency per browser call")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    root = synthetic_page(rng, args.links, args.cards)
+    base_url = "https://sunrisepg.in/"
+
+    results = {}
+    print(f"Page: {args.links} links, {args.cards} cards, {args.rtt_ms} ms per round trip")
+    print(f"{'':>10} {'calls':>8} {'wall (ms)':>10}")
+    for label, fn in (("legacy", legacy_extract), ("snapshot", snapshot_extract)):
+        page = CountingPage(root, "Sunrise PG | Home", args.rtt_ms / 1000)
+        start = time.perf_counter()
+        results[label] = fn(page, base_url)
+        elapsed = time.perf_counter() - start
+        results[label + "_calls"] = page.calls
+        print(f"{label:>10} {page.calls:>8} {elapsed * 1e3:>10.1f}")
+
+    same = results["legacy"] == results["snapshot"]
+    print(f"Same data extracted: {same}")
+    print(f"Round trips saved: {results['legacy_calls'] - results['snapshot_calls']} "
+          f"({results['legacy_calls'] / results['snapshot_calls']:.0f}x fewer)")
+
+
+if __name__ == "__main__":
+    main()
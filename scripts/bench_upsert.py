@@ -0,0 +1,64 @@
+"""
+Benchmark: MasterDataManager.upsert_entity throughput.
+
+Upserts synthetic entities (mix of inserts, domain matches and name matches)
+and prints the time per checkpoint. With the hash indexes the per-record cost
+should stay flat, i.e. total time grows linearly with the number of records.
+
+Usage:
+    python scripts/bench_upsert.py --total 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.core.data_manager import MasterDataManager
+
+
+def make_entity(i, rng):
+    # ~20% of records hit an existing domain, ~10% an existing name only
+    roll = rng.random()
+    if i > 100 and roll < 0.2:
+        n = rng.randrange(i)
+        return {"name": f"Shree PG {n}", "source": f"https://www.pg-{n}.com/contact",
+                "mobile": [f"98{n % 100000000:08d}"], "address": "Navrangpura, Ahmedabad 380009"}
+    if i > 100 and roll < 0.3:
+        n = rng.randrange(i)
+        return {"name": f"Shree PG {n}", "source": "google.com/maps",
+                "mobile": [f"+91 97{n % 100000000:08d}"], "address": "Satellite, Ahmedabad"}
+    return {"name": f"Shree PG {i}", "source": f"https://pg-{i}.com",
+            "mobile": [f"98{i % 100000000:08d}"], "email": [f"info@pg-{i}.com"],
+            "address": "Navrangpura, Ahmedabad 380009"}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--total", type=int, default=100000)
+    parser.add_argument("--checkpoints", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = MasterDataManager(os.path.join(tmp, "master.json"))
+        step = max(1, args.total // args.checkpoints)
+
+        start = time.perf_counter()
+        last = start
+        print(f"{'records':>10} {'total (s)':>10} {'chunk (s)':>10} {'us/record':>10}")
+        for i in range(args.total):
+            manager.upsert_entity(make_entity(i, rng))
+            if (i + 1) % step == 0:
+                now = time.perf_counter()
+                print(f"{i + 1:>10} {now - start:>10.2f} {now - last:>10.2f} {(now - last) / step * 1e6:>10.1f}")
+                last = now
+
+        print(f"Master list size: {len(manager.data)}")
+
+
+if __name__ == "__main__":
+    main()
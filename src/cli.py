@@ -36,13 +36,15 @@ def discover(
         urls = search_waterfall(query, limit, headless, output_file=output)
     elif engine.lower() == "bing":
         from src.scrapers.engines.bing import search_bing
-        urls = search_bing(query, limit, headless)
+        from src.scrapers.core.browser_pool import get_browser_pool
+        urls = get_browser_pool().run(search_bing(query, limit, headless))
     elif engine.lower() == "google":
         from src.scrapers.core.search_coordinator import search_google_fallback
         urls = search_google_fallback(query, limit, headless)
     elif engine.lower() == "brave":
         from src.scrapers.engines.brave import search_brave
-        urls = search_brave(query, limit, headless, output_file=output)
+        from src.scrapers.core.browser_pool import get_browser_pool
+        urls = get_browser_pool().run(search_brave(query, limit, headless, output_file=output))
     elif engine.lower() == "ddg":
         from src.scrapers.engines.duckduckgo import search_ddg
         urls = search_ddg(query, limit, headless)
@@ -60,20 +62,42 @@ def discover(
 def extract(
     input: str = typer.Option("data/websites.json", help="Input JSON file with URLs"),
     output: str = typer.Option("data/master_pg_list.json", help="Output Master List JSON"),
-    fresh: bool = typer.Option(False, help="Delete processed log and start fresh")
+    fresh: bool = typer.Option(False, help="Delete processed log and crawl checkpoint and start fresh"),
+    storage: str = typer.Option("journal", help="Master list backend: 'journal' (default), 'json', 'sqlite'"),
+    cache_only: bool = typer.Option(False, help="Re-parse pages from the page cache only (no network, ignores processed log)"),
+    concurrency: int = typer.Option(5, help="Sites crawled at the same time (per process)"),
+    shards: int = typer.Option(1, help="Crawler processes; domains are split across them by hash"),
+    queue: str = typer.Option(None, help="Shared work queue (redis://host:6379/0 or sqlite:///path.db); results stay there until 'collect'")
 ):
     """
     Deep Scan websites for contact info (BFS: Home -> Contact/About).
     """
     
     if fresh:
-        processed_file = "data/processed_sites.txt"
-        if os.path.exists(processed_file):
-            os.remove(processed_file)
-            console.print(f"[bold yellow]Deleted {processed_file}. Starting Fresh![/bold yellow]")
+        from src.core.processed import reset_processed_sites, PROCESSED_FILE
+        from src.core.checkpoint import reset_crawl_checkpoint
+        reset_crawl_checkpoint()
+        if reset_processed_sites():
+            console.print(f"[bold yellow]Deleted {PROCESSED_FILE}. Starting Fresh![/bold yellow]")
             
     from src.scrapers.core.deep_crawler import process_deep_study
-    process_deep_study(input, output)
+    process_deep_study(input, output, storage=storage, cache_only=cache_only, concurrency=concurrency,
+                       shards=shards, work_queue=queue)
+
+@app.command()
+def stream(
+    query: str = typer.Option(..., help="Search query (e.g., 'PG in Bangalore')"),
+    limit: int = typer.Option(50, help="Limit for search results per engine"),
+    output: str = typer.Option("data/master_pg_list.json", help="Output Master List JSON"),
+    city: str = typer.Option(None, help="City used for location validation"),
+    workers: int = typer.Option(5, help="Parallel deep crawl workers"),
+    storage: str = typer.Option("journal", help="Master list backend: 'journal' (default), 'json', 'sqlite'")
+):
+    """
+    Discover and Deep Scan in one go: sites are crawled as soon as they are found.
+    """
+    from src.scrapers.core.pipeline import run_pipeline
+    run_pipeline(query, limit=limit, city=city, storage=storage, output_file=output, workers=workers)
 
 @app.command()
 def export(
@@ -86,18 +110,84 @@ def export(
     from src.exporters.excel import export_to_excel_perfect
     export_to_excel_perfect(input, output)
 
+@app.command()
+def compact(
+    master: str = typer.Option("data/master_pg_list.json", help="Master List JSON to compact"),
+    storage: str = typer.Option("journal", help="Master list backend: 'journal' (default), 'json', 'sqlite'"),
+    listings: str = typer.Option(None, help="Also fold the list extractor's JSONL into this JSON (e.g. data/pg.json)")
+):
+    """
+    Fold the master list journal into a fresh JSON snapshot.
+    """
+    from src.core.data_manager import MasterDataManager
+    manager = MasterDataManager(master, storage=storage)
+    manager.compact()
+    console.print(f"[bold green]Compacted {len(manager.all_entities())} records into {master}[/bold green]")
+    if listings:
+        from src.scrapers.core.listing import ListingOutput
+        total = ListingOutput(listings).close()
+        console.print(f"[bold green]Compacted {total} listings into {listings}[/bold green]")
+
+@app.command()
+def collect(
+    queue: str = typer.Option(..., help="Shared work queue (redis://host:6379/0 or sqlite:///path.db)"),
+    output: str = typer.Option("data/master_pg_list.json", help="Output Master List JSON"),
+    city: str = typer.Option(None, help="City used for location validation"),
+    storage: str = typer.Option("journal", help="Master list backend: 'journal' (default), 'json', 'sqlite'")
+):
+    """
+    Merge the entities of a shared run (extract/run_all --queue) into the master list.
+    """
+    from src.core.work_queue import open_work_queue
+    from src.scrapers.core.deep_crawler import collect_shared
+    domains, places = open_work_queue(queue, "domains"), open_work_queue(queue, "places")
+    try:
+        domains.print_summary()
+        places.print_summary()
+        leads = collect_shared([domains, places], output, city=city, storage=storage)
+    finally:
+        domains.close()
+        places.close()
+    console.print(f"[bold green]Collected {leads} leads into {output}[/bold green]")
+
+@app.command()
+def cache(
+    clear: bool = typer.Option(False, help="Delete every cached page and search result")
+):
+    """
+    Show (or clear) the on-disk page and search result caches.
+    """
+    from datetime import datetime
+    from src.scrapers.core.page_cache import get_page_cache
+    from src.scrapers.core.serp_cache import get_serp_cache
+    page_cache = get_page_cache()
+    serp_cache = get_serp_cache()
+    if clear:
+        page_cache.clear()
+        serp_cache.clear()
+        console.print(f"[bold yellow]Cleared {page_cache.path} and {serp_cache.path}[/bold yellow]")
+        return
+    stats = page_cache.summary()
+    oldest = datetime.fromtimestamp(stats["oldest"]).strftime("%Y-%m-%d %H:%M") if stats["oldest"] else "-"
+    console.print(
+        f"[bold]{page_cache.path}:[/bold] {stats['entries']} pages, {stats['bytes'] / 1e6:.1f} MB "
+        f"of {page_cache.max_bytes / 1e6:.0f} MB, TTL {page_cache.ttl / 3600:.0f}h, oldest fetch {oldest}"
+    )
+    console.print(f"[bold]{serp_cache.path}:[/bold] {serp_cache.count()} result pages, TTL {serp_cache.ttl / 3600:.0f}h")
+
 @app.command()
 def maps(
     query: str = typer.Option(..., help="Search query (e.g., 'PG in Ahmedabad')"),
     limit: int = typer.Option(50, help="Max number of records to find"),
     output: str = typer.Option("data/master_pg_list.json", help="Output JSON file"),
-    headless: bool = typer.Option(False, help="Run in headless mode (False recommended for Maps)")
+    headless: bool = typer.Option(False, help="Run in headless mode (False recommended for Maps)"),
+    storage: str = typer.Option("journal", help="Master list backend: 'journal' (default), 'json', 'sqlite'")
 ):
     """
     Scrape Google Maps Side Panel for Direct Phone Numbers.
     """
     from src.scrapers.engines.google_maps import search_google_maps
-    search_google_maps(query, limit, headless, output)
+    search_google_maps(query, limit, headless, output, storage=storage)
 
 @app.command()
 def enrich(
@@ -128,18 +218,26 @@ def run_all(
     limit: int = typer.Option(50, help="Limit for search results"),
     fresh: bool = typer.Option(False, help="Delete processed log and start fresh"),
     use_harvested: bool = typer.Option(False, help="Use harvested location keywords for massive coverage"),
-    city: str = typer.Option("Ahmedabad", help="City to use for harvested keywords")
+    city: str = typer.Option("Ahmedabad", help="City to use for harvested keywords"),
+    storage: str = typer.Option("journal", help="Master list backend: 'journal' (default), 'json', 'sqlite'"),
+    concurrency: int = typer.Option(3, help="Queries processed at the same time"),
+    engine_concurrency: int = typer.Option(2, help="Max simultaneous searches per engine (Maps/Brave/Bing/DDG)"),
+    domain_interval: float = typer.Option(2.0, help="Min seconds between visits to the same domain"),
+    workers: int = typer.Option(5, help="Deep crawl workers per query"),
+    queue: str = typer.Option(None, help="Shared work queue (redis://host:6379/0 or sqlite:///path.db) to split the run across boxes")
 ):
     """
     Executes the full pipeline: Discovery -> Deep Study -> Maps Verification -> Export.
     """
     
     if fresh:
-        processed_file = "data/processed_sites.txt"
+        from src.core.processed import reset_processed_sites
+        from src.core.checkpoint import reset_crawl_checkpoint
+        reset_processed_sites()
+        reset_crawl_checkpoint()
         status_file = "data/run_all_status.json"
-        for f_path in [processed_file, status_file]:
-            if os.path.exists(f_path):
-                os.remove(f_path)
+        if os.path.exists(status_file):
+            os.remove(status_file)
         console.print(f"[bold yellow]Cleaned state. Starting Fresh![/bold yellow]")
 
     # Load Progress
@@ -185,6 +283,26 @@ def run_all(
         else:
             console.print(f"[red]Harvest file not found: {json_path}. Run 'python main.py harvest --city \"{city}\"' first.[/red]")
 
+    if queue:
+        # Every box may seed the same queries: the queue adds each one once
+        from src.core.work_queue import open_work_queue
+        from src.scrapers.core.scheduler import run_scheduled
+        query_queue, domain_queue = open_work_queue(queue, "queries"), open_work_queue(queue, "domains")
+        place_queue = open_work_queue(queue, "places")
+        try:
+            run_scheduled(
+                queries, set(), limit=limit, city=city, storage=storage,
+                concurrency=concurrency, engine_concurrency=engine_concurrency,
+                domain_interval=domain_interval, workers=workers,
+                query_queue=query_queue, domain_queue=domain_queue, place_queue=place_queue
+            )
+        finally:
+            query_queue.close()
+            domain_queue.close()
+            place_queue.close()
+        console.print(f"\n[bold green]Shared run drained on this box. Run 'python main.py collect --queue {queue}' to build the master list.[/bold green]")
+        return
+
     # Filter out completed queries
     total_queries = len(queries)
     queries = [q for q in queries if q not in completed_queries]
@@ -193,43 +311,15 @@ def run_all(
         console.print(f"[bold green]Skipping {total_queries - len(queries)} areas already completed.[/bold green]")
 
     console.print(f"[bold magenta]Starting Full Run for {len(queries)} remaining queries...[/bold magenta]")
-    
-    for i, q in enumerate(queries):
-        console.print(f"\n[bold cyan]Processing Batch {i+1}/{len(queries)}: {q}[/bold cyan]")
-        
-        # Step 1: Discovery (Waterfal)
-        console.print(f"\n[bold]Step 1: Discovery ({q})[/bold]")
-        found_urls = []
-        try:
-            from src.scrapers.core.search_coordinator import search_waterfall
-            found_urls = search_waterfall(q, limit=limit, city=city)
-        except Exception as e:
-            console.print(f"[red]Step 1 Failed: {e}[/red]")
-
-        # Step 2: Deep Study
-        if found_urls:
-            console.print(f"\n[bold]Step 2: Deep Study (Enriching {len(found_urls)} new links)[/bold]")
-            try:
-                from src.scrapers.core.deep_crawler import process_deep_study
-                process_deep_study(input_file="data/websites.json", output_file="data/master_pg_list.json", city=city)
-            except Exception as e:
-                console.print(f"[red]Step 2 Failed: {e}[/red]")
-        else:
-            console.print("[dim]No new website URLs to study in Step 2.[/dim]")
 
-        # Step 3: Incremental Export (Refresh Excel after every batch)
-        console.print(f"\n[bold yellow]Step 3: Refreshing Excel Export...[/bold yellow]")
-        try:
-            from src.exporters.excel import export_to_excel
-            export_to_excel(input_file="data/master_pg_list.json", output_file="data/verified_pg_database.xlsx")
-            
-            # Record Success
-            completed_queries.add(q)
-            with open(status_file, "w") as f:
-                json.dump(list(completed_queries), f)
-                
-        except Exception as e:
-            console.print(f"[dim red]Incremental export failed: {e}[/dim red]")
+    # Discovery -> Deep Study -> Export per query, `concurrency` queries at a time
+    from src.scrapers.core.scheduler import run_scheduled
+    run_scheduled(
+        queries, completed_queries, status_file=status_file,
+        limit=limit, city=city, storage=storage,
+        concurrency=concurrency, engine_concurrency=engine_concurrency,
+        domain_interval=domain_interval, workers=workers
+    )
 
     console.print(f"\n[bold green]Full Run Complete! All results are in 'data/verified_pg_database.xlsx'.[/bold green]")
 
@@ -0,0 +1,229 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from rich.console import Console
+from .config import CHECKPOINT_FILE, CRAWL_MAX_ATTEMPTS, CRAWL_RETRY_BACKOFF, CRAWL_RETRY_MAX_DELAY
+
+console = Console()
+
+QUEUED = "queued"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+FAILED = "failed"
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True   # exists, owned by someone else
+    return True
+
+
+class CrawlCheckpoint:
+    """
+    Durable per-domain crawl state (SQLite), so an interrupted extract resumes
+    exactly where it stopped.
+
+        queued --start()--> in_progress --finish()--> done
+                                 |
+                               fail() --> queued again (retry after backoff)
+                                      --> failed (after max_attempts)
+
+    Finished rows keep the crawled entity until the caller has written it to the
+    master list and the processed log (mark_saved()); rows finished but not saved
+    when a run died are handed back by unsaved() instead of being crawled again.
+    In-progress rows of a dead process go back to the queue on recover().
+    """
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS domains (domain TEXT PRIMARY KEY, state TEXT NOT NULL, "
+        "attempts INTEGER NOT NULL DEFAULT 0, pages TEXT NOT NULL, entity TEXT, saved INTEGER NOT NULL DEFAULT 0, "
+        "error TEXT, owner INTEGER, next_attempt_at REAL NOT NULL DEFAULT 0, updated_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_domains_state ON domains(state)",
+    ]
+
+    def __init__(self, path: str = CHECKPOINT_FILE, max_attempts: int = CRAWL_MAX_ATTEMPTS,
+                 backoff: float = CRAWL_RETRY_BACKOFF, max_delay: float = CRAWL_RETRY_MAX_DELAY):
+        self.path = path
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.lock = threading.Lock()
+        self.conn = None
+
+    def connect(self):
+        if self.conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            for statement in self.SCHEMA:
+                self.conn.execute(statement)
+            self.conn.commit()
+        return self.conn
+
+    def retry_delay(self, attempts):
+        """Seconds to wait after the given number of failed attempts."""
+        return min(self.max_delay, self.backoff * 2 ** max(0, attempts - 1))
+
+    # --- Resume ---
+    def recover(self):
+        """Requeues domains left in progress by processes that are gone. Returns how many."""
+        with self.lock:
+            conn = self.connect()
+            rows = conn.execute("SELECT domain, owner FROM domains WHERE state = ?", (IN_PROGRESS,)).fetchall()
+            stale = [(domain,) for domain, owner in rows if owner is None or not pid_alive(owner)]
+            conn.executemany(
+                "UPDATE domains SET state = 'queued', owner = NULL WHERE domain = ? AND state = 'in_progress'", stale
+            )
+            conn.commit()
+            return len(stale)
+
+    def release(self):
+        """Requeues this process's in-progress domains (interrupted run)."""
+        with self.lock:
+            conn = self.connect()
+            conn.execute("UPDATE domains SET state = 'queued', owner = NULL WHERE state = 'in_progress' AND owner = ?",
+                         (os.getpid(),))
+            conn.commit()
+
+    def unfinished(self):
+        """{domain: pages} of every queued domain (new, retried or recovered)."""
+        with self.lock:
+            rows = self.connect().execute("SELECT domain, pages FROM domains WHERE state = ?", (QUEUED,)).fetchall()
+        return {domain: json.loads(pages) for domain, pages in rows}
+
+    def unsaved(self):
+        """[(domain, entity or None)] finished by a run that died before saving them."""
+        with self.lock:
+            rows = self.connect().execute(
+                "SELECT domain, entity FROM domains WHERE state IN ('done', 'failed') AND saved = 0"
+            ).fetchall()
+        return [(domain, json.loads(entity) if entity else None) for domain, entity in rows]
+
+    # --- State changes ---
+    def enqueue(self, domain_map):
+        """Queues {domain: pages}. Finished domains queued again (processed log reset) start over."""
+        now = time.time()
+        with self.lock:
+            conn = self.connect()
+            conn.executemany(
+                "INSERT INTO domains (domain, state, pages, updated_at) VALUES (?, 'queued', ?, ?) "
+                "ON CONFLICT(domain) DO UPDATE SET pages = excluded.pages, updated_at = excluded.updated_at, "
+                "attempts = CASE WHEN state IN ('done', 'failed') THEN 0 ELSE attempts END, "
+                "saved = CASE WHEN state IN ('done', 'failed') THEN 0 ELSE saved END, "
+                "entity = CASE WHEN state IN ('done', 'failed') THEN NULL ELSE entity END, "
+                "state = CASE WHEN state IN ('done', 'failed') THEN 'queued' ELSE state END",
+                [(domain, json.dumps(pages), now) for domain, pages in domain_map.items()]
+            )
+            conn.commit()
+
+    def wait_time(self, domain):
+        """Seconds until the domain's next attempt is due (0 if it is)."""
+        with self.lock:
+            row = self.connect().execute("SELECT next_attempt_at FROM domains WHERE domain = ?", (domain,)).fetchone()
+        return max(0.0, row[0] - time.time()) if row else 0.0
+
+    def start(self, domain):
+        """Marks an attempt as started. Returns the attempt number."""
+        with self.lock:
+            conn = self.connect()
+            conn.execute(
+                "UPDATE domains SET state = 'in_progress', attempts = attempts + 1, owner = ?, updated_at = ? "
+                "WHERE domain = ?", (os.getpid(), time.time(), domain)
+            )
+            conn.commit()
+            row = conn.execute("SELECT attempts FROM domains WHERE domain = ?", (domain,)).fetchone()
+        return row[0] if row else 1
+
+    def finish(self, domain, entity):
+        with self.lock:
+            conn = self.connect()
+            conn.execute(
+                "UPDATE domains SET state = 'done', entity = ?, error = NULL, owner = NULL, updated_at = ? "
+                "WHERE domain = ?", (json.dumps(entity) if entity else None, time.time(), domain)
+            )
+            conn.commit()
+
+    def fail(self, domain, error):
+        """
+        Records a failed attempt. Returns the delay before the retry, or None when
+        the domain has used up its attempts and is now failed for good.
+        """
+        with self.lock:
+            conn = self.connect()
+            row = conn.execute("SELECT attempts FROM domains WHERE domain = ?", (domain,)).fetchone()
+            attempts = row[0] if row else self.max_attempts
+            now = time.time()
+            if attempts >= self.max_attempts:
+                conn.execute(
+                    "UPDATE domains SET state = 'failed', error = ?, owner = NULL, updated_at = ? WHERE domain = ?",
+                    (str(error), now, domain)
+                )
+                delay = None
+            else:
+                delay = self.retry_delay(attempts)
+                conn.execute(
+                    "UPDATE domains SET state = 'queued', error = ?, owner = NULL, next_attempt_at = ?, updated_at = ? "
+                    "WHERE domain = ?", (str(error), now + delay, now, domain)
+                )
+            conn.commit()
+        return delay
+
+    def mark_saved(self, domains):
+        """The results of these domains are in the master list and the processed log."""
+        with self.lock:
+            conn = self.connect()
+            conn.executemany("UPDATE domains SET saved = 1, entity = NULL WHERE domain = ? AND state IN ('done', 'failed')",
+                             [(d,) for d in domains])
+            conn.commit()
+
+    # --- Reporting ---
+    def counts(self):
+        """{state: number of domains}"""
+        with self.lock:
+            rows = self.connect().execute("SELECT state, COUNT(*) FROM domains GROUP BY state").fetchall()
+        return dict(rows)
+
+    def print_summary(self):
+        counts = self.counts()
+        if counts:
+            console.print(
+                f"[dim]Checkpoint: {counts.get(DONE, 0)} done, {counts.get(FAILED, 0)} failed, "
+                f"{counts.get(QUEUED, 0)} queued, {counts.get(IN_PROGRESS, 0)} in progress[/dim]"
+            )
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+def reset_crawl_checkpoint(path: str = CHECKPOINT_FILE):
+    """Deletes the checkpoint database (--fresh)."""
+    global _checkpoint
+    with _checkpoint_lock:
+        if _checkpoint is not None:
+            _checkpoint.close()
+            _checkpoint = None
+    for f_path in (path, path + "-wal", path + "-shm"):
+        if os.path.exists(f_path):
+            os.remove(f_path)
+
+
+_checkpoint = None
+_checkpoint_lock = threading.Lock()
+
+def get_crawl_checkpoint():
+    """Process-wide crawl checkpoint."""
+    global _checkpoint
+    with _checkpoint_lock:
+        if _checkpoint is None:
+            _checkpoint = CrawlCheckpoint()
+        return _checkpoint
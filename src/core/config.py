@@ -9,3 +9,69 @@ USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36 Edg/121.0.0.0",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 ]
+
+# Minimum seconds between background Excel exports of the master list
+EXCEL_EXPORT_MIN_INTERVAL = 60
+
+# Google Maps place pages the async engine loads at the same time (tabs of the search's context)
+MAPS_PLACE_TABS = 4
+
+# Per-engine time budget (seconds) inside the async search waterfall
+ENGINE_TIMEOUTS = {
+    "maps": 240,
+    "brave": 180,
+    "bing": 60,
+    "ddg": 45,
+}
+
+# --- Politeness: token buckets keyed by host ---
+# (requests per second, burst). Hosts match exactly or as a parent domain, "www." is ignored.
+# Search engines get their own budgets so discovery never eats into crawling budget (and vice versa).
+ENGINE_RATE_LIMITS = {
+    "google.com": (0.5, 2),
+    "search.brave.com": (0.5, 1),
+    "bing.com": (0.5, 1),
+    "duckduckgo.com": (0.3, 1),
+}
+# Default budget for every target website
+SITE_RATE_LIMIT = (1.0, 2)
+# Per-site overrides, e.g. "magicbricks.com": (0.5, 1)
+HOST_RATE_LIMITS = {}
+
+# HTTP-first fetch tier of the deep crawler (needs httpx; falls back to Playwright without it)
+HTTP_FETCH_TIMEOUT = 10
+HTTP_MAX_CONNECTIONS = 20
+
+# --- Page cache: fetched pages on disk, keyed by normalized URL ---
+PAGE_CACHE_FILE = "data/page_cache.db"
+# Seconds before a cached page is fetched again (7 days)
+PAGE_CACHE_TTL = 7 * 24 * 3600
+# Least recently used pages are evicted beyond this size
+PAGE_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+# --- SERP cache: result URLs per (engine, normalized query, page) ---
+SERP_CACHE_FILE = "data/serp_cache.db"
+# Seconds before a query is searched again (1 day)
+SERP_CACHE_TTL = 24 * 3600
+# Filler words dropped from cache keys ("PG near X" and "PG in X" share results)
+SERP_QUERY_STOPWORDS = {"in", "near", "at", "the", "a", "an", "of", "for", "and", "around", "nearby"}
+
+# --- Crawl checkpoint: per-domain state of extract runs (resume after a crash) ---
+CHECKPOINT_FILE = "data/crawl_checkpoint.db"
+# Attempts per domain before it is given up as failed
+CRAWL_MAX_ATTEMPTS = 3
+# Retry delay after a failed attempt: base * 2^(attempt - 1) seconds, capped
+CRAWL_RETRY_BACKOFF = 5.0
+CRAWL_RETRY_MAX_DELAY = 120.0
+
+# --- Shared work queue (several crawler boxes on one run, see core/work_queue.py) ---
+# Seconds a leased query / domain stays invisible to other boxes without a heartbeat
+WORK_QUEUE_VISIBILITY = 300
+# Leases per item before it is given up as failed
+WORK_QUEUE_MAX_ATTEMPTS = 3
+# Longest sleep of an idle worker between polls while items are still leased or waiting out a retry delay
+WORK_QUEUE_POLL_INTERVAL = 10.0
+
+# --- Universal list extractor (scrapers/core/listing.py) ---
+# Detail pages of one listing page loaded at the same time (tabs of one context)
+LISTING_DETAIL_CONCURRENCY = 5
@@ -0,0 +1,145 @@
+import re
+
+# --- Patterns (compiled once) ---
+# regex for 10-13 digit numbers, likely mobiles
+# Matches: +91 9999999999, 99999 99999, 09999999999, 999-999-9999
+PHONE_PATTERN = r"(?:\+91|91|0)?\s?[\-]?\s?([6-9][0-9\s\-]{8,13})"
+PINCODE_PATTERN = r"\b\d{6}\b"
+EMAIL_PATTERN = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+# Words that make a short line an address candidate (matched case-insensitively, as substrings)
+ADDRESS_HINTS = ["pin", "zip", "road", "sector", "block", "opp", "near", "behind", "colony", "nagar", "street", "lane"]
+
+PHONE_RE = re.compile(PHONE_PATTERN)
+PINCODE_RE = re.compile(PINCODE_PATTERN)
+EMAIL_RE = re.compile(EMAIL_PATTERN)
+NON_DIGITS_RE = re.compile(r"\D")
+# Maximal runs of the only characters a phone match can contain (+, digits, spaces, dashes).
+# Every PHONE_RE match lies inside one such run, and pincodes are 6-digit runs,
+# so the expensive patterns only ever look at these short slices.
+NUMBER_RUN_RE = re.compile(r"[+\d\s\-]{6,}")
+EMAIL_LOCAL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-")
+
+# Address candidates are lines shorter than this
+MAX_ADDRESS_LINE = 150
+
+
+def clean_phone(phone):
+    """
+    Standardizes a phone number to 10 digits.
+    Removes +91, 0 prefix, spaces, dashes. Returns None if it is not a mobile-length number.
+    """
+    if not phone: return None
+    digits = NON_DIGITS_RE.sub("", str(phone))
+
+    # Handle country code / trunk prefix
+    if len(digits) > 10:
+        if digits.startswith("91"):
+            digits = digits[2:]
+        elif digits.startswith("0") and len(digits) == 11:
+            digits = digits[1:]
+
+    return digits if len(digits) == 10 else None
+
+
+def is_word_char(c):
+    return c.isalnum() or c == "_"
+
+
+class PageContacts:
+    """Everything ContactExtractor found in one text."""
+    __slots__ = ("phones", "emails", "pincodes", "address_lines")
+
+    def __init__(self):
+        self.phones = set()
+        self.emails = set()
+        self.pincodes = set()
+        self.address_lines = []   # page order, unique
+
+
+class ContactExtractor:
+    """
+    Contact extraction in one sweep over a page body.
+
+    Same patterns and phone cleaning as the old per-field regex passes, but the text
+    itself is walked once per anchor instead of once per field and per line:
+    - number runs ([+digits spaces -]) feed both the phone pattern and pincodes
+    - emails are expanded around each "@" only
+    - address hints are plain substring searches on the lowercased text
+    A single alternation regex (email|phone|pin|hint) was measured slower than this
+    with CPython's re, since it has to try every branch at every character.
+    """
+    def __init__(self, address_hints=ADDRESS_HINTS, max_address_line: int = MAX_ADDRESS_LINE):
+        self.address_hints = list(address_hints)
+        self.max_address_line = max_address_line
+
+    def extract(self, text):
+        found = PageContacts()
+        if not text:
+            return found
+        line_starts = set()
+
+        # Phones + pincodes
+        for run in NUMBER_RUN_RE.finditer(text):
+            chunk = run.group()
+            if len(chunk) >= 9:
+                for match in PHONE_RE.finditer(chunk):
+                    phone = clean_phone(match.group())
+                    if phone:
+                        found.phones.add(phone)
+            offset = run.start()
+            for match in PINCODE_RE.finditer(chunk):
+                # \b at the edges of the slice must hold in the full text too
+                start, end = offset + match.start(), offset + match.end()
+                if (start and is_word_char(text[start - 1])) or (end < len(text) and is_word_char(text[end])):
+                    continue
+                found.pincodes.add(match.group())
+                line_starts.add(text.rfind("\n", 0, start) + 1)
+
+        # Emails
+        if "@" in text:
+            at = text.find("@")
+            last_end = 0
+            while at != -1:
+                start = at
+                while start > last_end and text[start - 1] in EMAIL_LOCAL_CHARS:
+                    start -= 1
+                match = EMAIL_RE.match(text, start) if start < at else None
+                if match and match.end() > at:
+                    found.emails.add(match.group())
+                    last_end = match.end()
+                at = text.find("@", max(at + 1, last_end))
+
+        # Address hint words
+        lower = text.lower()
+        if len(lower) != len(text):
+            # A few characters grow when lowercased; keep offsets aligned with text
+            lower = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+        for hint in self.address_hints:
+            pos = lower.find(hint)
+            while pos != -1:
+                line_start = lower.rfind("\n", 0, pos) + 1
+                line_starts.add(line_start)
+                line_end = lower.find("\n", pos)
+                if line_end == -1:
+                    break
+                pos = lower.find(hint, line_end)
+
+        for start in sorted(line_starts):
+            end = text.find("\n", start)
+            line = text[start:] if end == -1 else text[start:end]
+            if len(line) < self.max_address_line:
+                found.address_lines.append(line)
+        return found
+
+    def phones(self, text):
+        return self.extract(text).phones
+
+    def emails(self, text):
+        return set(EMAIL_RE.findall(text or ""))
+
+    def has_phone(self, text):
+        return PHONE_RE.search(text or "") is not None
+
+
+# Shared instance
+CONTACTS = ContactExtractor()
@@ -1,39 +1,77 @@
 import json
-import os
 import re
 from urllib.parse import urlparse
 from rich.console import Console
-from src.exporters.excel import export_to_excel_perfect
+from src.exporters.excel import get_background_exporter
+from src.core.storage import open_store
+from src.core.contacts import clean_phone
 
 console = Console()
 
 class MasterDataManager:
     BLACKLIST_TERMS = ["news", "samachar", "quora", "wikipedia", "article", "report", "times of india", "divya bhaskar"]
+    # Sources shared by many businesses (e.g. "google.com/maps") are not identity keys
+    SHARED_SOURCE_DOMAINS = {"google.com"}
 
-    def __init__(self, master_file: str = "data/master_pg_list.json", city: str = None):
+    def __init__(self, master_file: str = "data/master_pg_list.json", city: str = None, storage: str = "journal",
+                 exporter=None):
         self.master_file = master_file
+        self.store = open_store(master_file, storage)
+        # Excel exporter for save_master; None -> the process-wide one
+        self.exporter = exporter
         self.city = city.lower() if city else None
         self.data = []
         self.unverified_numbers = []
+        # Hash indexes: normalized domain / normalized name -> position in self.data
+        self.domain_index = {}
+        self.name_index = {}
         self.load_master()
         
     def load_master(self):
-        """Loads existing master list."""
-        if os.path.exists(self.master_file):
-            try:
-                with open(self.master_file, "r") as f:
-                    self.data = json.load(f)
-            except json.JSONDecodeError:
-                self.data = []
-        else:
+        """Loads existing master list (snapshot + journal replay)."""
+        if self.store.indexed:
+            # Database answers lookups itself; nothing is held in memory
+            self.store.import_json(self.index_keys, self.merge_fields)
             self.data = []
+            return
+        self.data = self.store.load(self.index_keys)
+        self.rebuild_indexes()
+
+    def all_entities(self):
+        """Full master list, regardless of backend."""
+        if self.store.indexed:
+            return self.store.load()
+        return self.data
+
+    def rebuild_indexes(self):
+        """Builds the domain/name lookup tables from scratch (once per load)."""
+        self.domain_index = {}
+        self.name_index = {}
+        for i, entity in enumerate(self.data):
+            self.index_entity(i, entity)
+
+    def index_entity(self, idx, entity):
+        """
+        Registers an entity's match keys.
+        First writer wins, mirroring the old linear scan which returned the earliest match.
+        """
+        domain, norm_name = self.index_keys(entity)
+        if domain:
+            self.domain_index.setdefault(domain, idx)
+        if norm_name:
+            self.name_index.setdefault(norm_name, idx)
+
+    def index_keys(self, entity):
+        """(domain, normalized name) match keys of an entity."""
+        return self.entity_domain(entity), self.normalize_name(entity.get("name"))
             
     def save_master(self):
-        """Atomically saves master list."""
+        """Persists changes since the last save (journal append, not a full rewrite)."""
         try:
             # Save main data
-            with open(self.master_file, "w") as f:
-                json.dump(self.data, f, indent=2)
+            if self.store.flush(self.data):
+                # Compacted: data now includes other writers' records, in new positions
+                self.rebuild_indexes()
                 
             # Save verification log if needed
             if self.unverified_numbers:
@@ -42,31 +80,41 @@ class MasterDataManager:
         except Exception as e:
             console.print(f"[red]Error saving master data: {e}[/red]")
             
-        # Trigger perfect excel export
+        # Schedule perfect excel export (debounced, runs on a worker thread)
         try:
-            export_to_excel_perfect(self.master_file)
+            exporter = self.exporter or get_background_exporter()
+            exporter.request(self.master_file, data_fn=self.export_snapshot)
         except Exception as e:
             console.print(f"[red]Error triggering excel export: {e}[/red]")
 
+    def export_snapshot(self):
+        """Copy of the master list for the export thread."""
+        if self.store.indexed:
+            return self.store.load()
+        return list(self.data)
+
+    def compact(self):
+        """Rewrites the JSON snapshot and clears the journal."""
+        try:
+            if self.store.indexed:
+                # Records another backend wrote to the JSON/journal since open would be overwritten
+                self.store.import_json(self.index_keys, self.merge_fields)
+            if self.store.compact(self.data):
+                self.rebuild_indexes()
+        except Exception as e:
+            console.print(f"[red]Error compacting master data: {e}[/red]")
+
+    def close(self):
+        """Final save at the end of a run; leaves a plain, up-to-date JSON file behind."""
+        self.save_master()
+        self.compact()
+
     def clean_phone_10_digit(self, phone):
         """
         Standardizes phone number to 10 digits.
-        Removes +91, 0 prefix, spaces, dashes.
+        Removes +91, 0 prefix, spaces, dashes (shared with the scrapers, see src/core/contacts.py).
         """
-        if not phone: return None
-        # Remove non-digits
-        digits = re.sub(r"\D", "", str(phone))
-        
-        # Handle country code
-        if len(digits) > 10:
-            if digits.startswith("91"):
-                digits = digits[2:]
-            elif digits.startswith("0"):
-                digits = digits[1:]
-                
-        if len(digits) == 10:
-            return digits
-        return None
+        return clean_phone(phone)
 
     def get_domain(self, url):
         if not url: return None
@@ -75,6 +123,13 @@ class MasterDataManager:
             return urlparse(url).netloc.replace("www.", "")
         except: return None
         
+    def entity_domain(self, entity):
+        """Domain used for matching: source first, website if the source is a shared platform."""
+        domain = self.get_domain(entity.get("source") or entity.get("website"))
+        if domain in self.SHARED_SOURCE_DOMAINS:
+            domain = self.get_domain(entity.get("website"))
+        return domain
+
     def normalize_name(self, name):
         if not name: return ""
         return re.sub(r'[^a-zA-Z0-9]', '', name).lower()
@@ -118,36 +173,55 @@ class MasterDataManager:
             # console.print(f"[dim red]Skipped Location: {reason}[/dim red]")
             return f"Skipped ({reason})"
 
+        if self.store.indexed:
+            return self.upsert_indexed(new_entity)
+
         matched_idx = -1
         
         # 1. Match by Domain (High Confidence)
-        new_domain = self.get_domain(new_entity.get("source") or new_entity.get("website"))
+        new_domain = self.entity_domain(new_entity)
         
         if new_domain:
-            for i, entity in enumerate(self.data):
-                existing_domain = self.get_domain(entity.get("source") or entity.get("website"))
-                if existing_domain and existing_domain == new_domain:
-                    matched_idx = i
-                    break
+            matched_idx = self.domain_index.get(new_domain, -1)
         
         # 2. Match by Name (If domain didn't match)
         if matched_idx == -1 and new_entity.get("name"):
             norm_name = self.normalize_name(new_entity["name"])
             if norm_name: # Only if name is valid
-                for i, entity in enumerate(self.data):
-                    if self.normalize_name(entity.get("name")) == norm_name:
-                        matched_idx = i
-                        break
+                matched_idx = self.name_index.get(norm_name, -1)
                     
         if matched_idx != -1:
             # MERGE
             self.data[matched_idx] = self.merge_fields(self.data[matched_idx], new_entity)
+            # Merge can fill in a missing website, so refresh the keys
+            self.index_entity(matched_idx, self.data[matched_idx])
+            self.store.record(matched_idx, self.data[matched_idx])
             return "Updated"
         else:
             # INSERT
             # Clean before inserting
             new_entity = self.clean_entity(new_entity)
             self.data.append(new_entity)
+            self.index_entity(len(self.data) - 1, new_entity)
+            self.store.record(len(self.data) - 1, new_entity)
+            return "Inserted"
+
+    def upsert_indexed(self, new_entity):
+        """
+        Same matching rules as upsert_entity, but looked up and written inside one
+        database transaction so concurrent writers cannot interleave.
+        """
+        new_domain, norm_name = self.index_keys(new_entity)
+        with self.store.transaction():
+            matched_id = self.store.find(new_domain, norm_name)
+            if matched_id is not None:
+                # MERGE
+                merged = self.merge_fields(self.store.get(matched_id), new_entity)
+                self.store.update(matched_id, merged, *self.index_keys(merged))
+                return "Updated"
+            # INSERT
+            new_entity = self.clean_entity(new_entity)
+            self.store.insert(new_entity, *self.index_keys(new_entity))
             return "Inserted"
 
     def merge_fields(self, existing, new):
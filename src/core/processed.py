@@ -0,0 +1,240 @@
+import atexit
+import os
+import threading
+import hashlib
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, appends are still line-atomic
+    fcntl = None
+
+PROCESSED_FILE = "data/processed_sites.txt"
+
+# Index file: magic, log bytes covered (uint64), then sorted uint64 domain hashes
+INDEX_MAGIC = b"PSIDX001"
+HEADER_SIZE = 16
+
+
+def domain_hash(domain):
+    """64-bit hash of a domain (collision odds at 10M domains: ~3e-6 for the whole set)."""
+    return int.from_bytes(hashlib.blake2b(domain.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class ProcessedSites:
+    """
+    Set of already crawled domains, sized for millions of entries.
+
+    The append-only text log (one domain per line) stays the exact store.
+    Next to it, <log>.idx holds the sorted 64-bit hashes of the log up to a byte
+    offset, so startup is one read of 8 bytes per domain plus the lines appended
+    since; membership is a binary search (plus a small set for recent entries).
+
+    add() only buffers; flush() appends the batch in one write under a file lock
+    and first picks up whatever other runs appended. The index is rewritten
+    (temp file + os.replace) once enough new lines pile up, and on close().
+    """
+    def __init__(self, path: str = PROCESSED_FILE, batch_size: int = 500, compact_every: int = 50000):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.batch_size = batch_size
+        self.compact_every = compact_every
+        self.lock = threading.Lock()
+        self.index = array("Q")   # sorted hashes covered by the index file
+        self.recent = set()       # hashes not in the index (log tail + this run)
+        self.pending = []         # domains waiting for flush()
+        self.offset = 0           # bytes of the log already read
+        self.log = None           # append handle, kept open between flushes
+        self.lock_file = None
+        self.load()
+
+    @contextmanager
+    def file_lock(self):
+        """Exclusive lock shared by every run that touches the processed log."""
+        if fcntl is None:
+            yield
+            return
+        if self.lock_file is None:
+            self.ensure_dir()
+            self.lock_file = open(self.path + ".lock", "a")
+        fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+
+    def ensure_dir(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def log_handle(self):
+        """Append handle on the current log file (reopened if the log was deleted or replaced)."""
+        try:
+            inode = os.stat(self.path).st_ino
+        except OSError:
+            inode = None
+        if self.log is not None and inode != os.fstat(self.log.fileno()).st_ino:
+            self.log.close()
+            self.log = None
+        if self.log is None:
+            self.ensure_dir()
+            self.log = open(self.path, "ab")
+        return self.log
+
+    # --- Loading ---
+    def load(self):
+        with self.lock:
+            self.index, self.offset = self.read_index()
+            self.recent = set()
+            self.read_tail()
+            if len(self.recent) >= self.compact_every:
+                with self.file_lock():
+                    self.compact_locked()
+
+    def read_index(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return array("Q"), 0
+        if len(data) < HEADER_SIZE or data[:8] != INDEX_MAGIC or (len(data) - HEADER_SIZE) % 8:
+            return array("Q"), 0
+        covered = int.from_bytes(data[8:HEADER_SIZE], "little")
+        try:
+            log_size = os.path.getsize(self.path)
+        except OSError:
+            log_size = 0
+        if log_size < covered:
+            # Log deleted or truncated (--fresh): the index is stale
+            return array("Q"), 0
+        index = array("Q")
+        index.frombytes(data[HEADER_SIZE:])
+        return index, covered
+
+    def read_tail(self):
+        """Reads log lines appended after self.offset (by this or another run)."""
+        try:
+            with open(self.path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < self.offset:
+                    # Log was replaced under us; start over from the exact store
+                    self.index, self.offset, self.recent = array("Q"), 0, set()
+                f.seek(self.offset)
+                data = f.read()
+        except OSError:
+            return
+        end = data.rfind(b"\n") + 1   # complete lines only
+        blake2b, from_bytes = hashlib.blake2b, int.from_bytes
+        hashes = {
+            from_bytes(blake2b(line, digest_size=8).digest(), "little")
+            for line in map(bytes.strip, data[:end].split(b"\n")) if line
+        }
+        if self.index:
+            hashes = {h for h in hashes if not self.in_index(h)}
+        self.recent |= hashes
+        self.offset += end
+
+    def refresh(self):
+        """Picks up domains other runs marked since the last read."""
+        with self.lock:
+            self.read_tail()
+
+    # --- Membership ---
+    def in_index(self, h):
+        i = bisect_left(self.index, h)
+        return i < len(self.index) and self.index[i] == h
+
+    def __contains__(self, domain):
+        if not domain:
+            return False
+        h = domain_hash(domain)
+        return h in self.recent or self.in_index(h)
+
+    def __len__(self):
+        return len(self.index) + len(self.recent)
+
+    # --- Writing ---
+    def add(self, domain):
+        if not domain:
+            return
+        with self.lock:
+            h = domain_hash(domain)
+            if h in self.recent or self.in_index(h):
+                return
+            self.recent.add(h)
+            self.pending.append(domain)
+            if len(self.pending) >= self.batch_size:
+                self.flush_locked()
+
+    def flush(self):
+        with self.lock:
+            self.flush_locked()
+
+    def flush_locked(self):
+        if not self.pending:
+            return
+        data = "".join(f"{domain}\n" for domain in self.pending).encode("utf-8")
+        with self.file_lock():
+            log = self.log_handle()
+            # Other runs' lines first, so our offset stays at the end of the log
+            if os.fstat(log.fileno()).st_size != self.offset:
+                self.read_tail()
+            log.write(data)
+            log.flush()
+            self.offset += len(data)
+            self.pending = []
+            if len(self.recent) >= self.compact_every:
+                self.compact_locked()
+
+    def compact_locked(self):
+        """Folds recent hashes into a new index file (atomic replace). Caller holds both locks."""
+        # Two sorted runs: timsort merges them in one linear pass
+        merged = array("Q", sorted(self.index.tolist() + sorted(self.recent)))
+        tmp = self.index_path + f".{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(INDEX_MAGIC + self.offset.to_bytes(8, "little"))
+            f.write(merged.tobytes())
+        os.replace(tmp, self.index_path)
+        self.index = merged
+        self.recent = set()
+
+    def close(self):
+        with self.lock:
+            self.flush_locked()
+            if self.recent and os.path.exists(self.path):
+                with self.file_lock():
+                    self.read_tail()
+                    self.compact_locked()
+            for handle in (self.log, self.lock_file):
+                if handle is not None:
+                    handle.close()
+            self.log = self.lock_file = None
+
+
+def reset_processed_sites(path: str = PROCESSED_FILE):
+    """Deletes the processed log and its index. Returns True if a log existed."""
+    existed = os.path.exists(path)
+    for f_path in (path, path + ".idx"):
+        if os.path.exists(f_path):
+            os.remove(f_path)
+    global _processed_sites
+    with _processed_lock:
+        _processed_sites = None
+    return existed
+
+
+_processed_sites = None
+_processed_lock = threading.Lock()
+
+def get_processed_sites():
+    """Process-wide processed set; loaded once, kept current by flush()/refresh()."""
+    global _processed_sites
+    with _processed_lock:
+        if _processed_sites is None:
+            _processed_sites = ProcessedSites()
+            # Unflushed marks are written and the index refreshed on exit
+            atexit.register(_processed_sites.close)
+        return _processed_sites
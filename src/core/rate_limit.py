@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+from rich.console import Console
+from .config import ENGINE_RATE_LIMITS, SITE_RATE_LIMIT, HOST_RATE_LIMITS
+
+console = Console()
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, at most `burst` saved up.
+
+    reserve() takes a token immediately (going into debt if needed) and returns how
+    long the caller has to wait before using it. Callers sleep outside the lock, so
+    the same bucket works from threads, sync code and any event loop.
+    """
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Host-keyed politeness limiter replacing the fixed sleeps.
+
+    Engine hosts (ENGINE_RATE_LIMITS) and target sites (SITE_RATE_LIMIT +
+    HOST_RATE_LIMITS) have separate budgets. Every target site gets its own bucket.
+    Use `await limiter.wait(url)` in async code and `limiter.acquire(url)` in sync code.
+    """
+    def __init__(self, engine_limits=None, site_limit=None, host_limits=None):
+        self.engine_limits = ENGINE_RATE_LIMITS if engine_limits is None else engine_limits
+        self.site_limit = SITE_RATE_LIMIT if site_limit is None else site_limit
+        self.host_limits = HOST_RATE_LIMITS if host_limits is None else host_limits
+        self.buckets = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def host_of(self, url):
+        if "//" not in url:
+            url = "https://" + url
+        host = (urlparse(url).hostname or "").lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def match(self, host, table):
+        """Exact host or closest parent domain listed in table."""
+        parts = host.split(".")
+        for i in range(len(parts) - 1):
+            key = ".".join(parts[i:])
+            if key in table:
+                return key
+        return None
+
+    def bucket_for(self, url):
+        host = self.host_of(url)
+        engine = self.match(host, self.engine_limits)
+        if engine:
+            key, group, limit = engine, "engines", self.engine_limits[engine]
+        else:
+            override = self.match(host, self.host_limits)
+            key = override or host
+            group, limit = "sites", self.host_limits.get(override, self.site_limit)
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = TokenBucket(*limit)
+                self.stats[key] = {"group": group, "requests": 0, "waited": 0, "wait_seconds": 0.0}
+            return key, bucket
+
+    def reserve(self, url):
+        key, bucket = self.bucket_for(url)
+        delay = bucket.reserve()
+        with self.lock:
+            entry = self.stats[key]
+            entry["requests"] += 1
+            if delay > 0:
+                entry["waited"] += 1
+                entry["wait_seconds"] += delay
+        return delay
+
+    async def wait(self, url):
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def acquire(self, url):
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def summary(self):
+        """Requests / waits / total wait seconds per group (engines, sites)."""
+        totals = {}
+        with self.lock:
+            for entry in self.stats.values():
+                group = totals.setdefault(entry["group"], {"requests": 0, "waited": 0, "wait_seconds": 0.0})
+                group["requests"] += entry["requests"]
+                group["waited"] += entry["waited"]
+                group["wait_seconds"] += entry["wait_seconds"]
+        return totals
+
+    def print_summary(self):
+        for group, entry in sorted(self.summary().items()):
+            console.print(
+                f"[dim]Rate limit ({group}): {entry['requests']} requests, "
+                f"{entry['waited']} waited, {entry['wait_seconds']:.1f}s total wait[/dim]"
+            )
+
+
+_rate_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Process-wide limiter so all engines, crawlers and threads share the same budgets."""
+    global _rate_limiter
+    with _limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
@@ -0,0 +1,433 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager, nullcontext
+from rich.console import Console
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock on the journal
+    fcntl = None
+
+console = Console()
+
+class JsonStore:
+    """
+    Legacy storage: the whole master list is rewritten on every flush.
+    """
+    # In-memory stores keep the list in MasterDataManager.data; indexed stores answer lookups themselves
+    indexed = False
+
+    def __init__(self, master_file: str):
+        self.master_file = master_file
+
+    def transaction(self):
+        return nullcontext()
+
+    def load(self, index_keys=None):
+        """Returns the stored list of entities. index_keys(entity) -> (domain, norm_name)."""
+        return self.read_snapshot()
+
+    def read_snapshot(self):
+        if not os.path.exists(self.master_file):
+            return []
+        try:
+            with open(self.master_file, "r") as f:
+                data = json.load(f)
+            return data if isinstance(data, list) else []
+        except json.JSONDecodeError:
+            return []
+
+    def write_snapshot(self, data):
+        """Writes the full list via a temp file + rename so readers never see half a file."""
+        directory = os.path.dirname(self.master_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Unique temp name: several threads/processes may compact the same file
+        tmp_file = f"{self.master_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_file, self.master_file)
+
+    def record(self, idx, entity):
+        """Notes that data[idx] was inserted or changed."""
+        pass
+
+    def flush(self, data):
+        """Persists `data`. True if the list was replaced by the merged on-disk state."""
+        self.write_snapshot(data)
+        return False
+
+    def compact(self, data):
+        self.write_snapshot(data)
+        return False
+
+    def close(self):
+        pass
+
+
+class JournalStore(JsonStore):
+    """
+    Snapshot + append-only delta log.
+
+    The snapshot is the plain JSON list (same format as before, so it can still be
+    imported/exported by hand). Every flush appends one JSONL line per changed entity:
+        {"k": [<domain>, <normalized name>], "e": <entity>}
+    load() replays the journal on top of the snapshot, matching records by domain,
+    then name, like MasterDataManager.upsert_entity (the last entry for a record
+    wins). Replaying is idempotent, so a crash between writing the snapshot and
+    removing the journal is harmless.
+
+    Several managers may share one file: appends, loads and compactions run under
+    an exclusive lock (<base>.journal.lock), and compact() folds in whatever the
+    other writers appended instead of overwriting it.
+    """
+    def __init__(self, master_file: str, compact_every: int = 5000):
+        super().__init__(master_file)
+        base, _ = os.path.splitext(master_file)
+        self.journal_file = base + ".journal.jsonl"
+        self.lock_path = base + ".journal.lock"
+        self.lock_file = None
+        self.compact_every = compact_every
+        self.journal_entries = 0
+        self.pending = {}
+        self.index_keys = None
+
+    @contextmanager
+    def file_lock(self):
+        """Exclusive lock shared by every writer of this journal."""
+        if fcntl is None:
+            yield
+            return
+        if self.lock_file is None:
+            directory = os.path.dirname(self.lock_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.lock_file = open(self.lock_path, "a")
+        fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+
+    def load(self, index_keys=None):
+        self.index_keys = index_keys
+        self.journal_entries = 0
+        self.pending = {}
+        with self.file_lock():
+            data, self.journal_entries = self.replay(self.read_snapshot())
+        return data
+
+    def replay(self, data):
+        """Applies the journal to `data` in place. Returns (data, entries applied)."""
+        if not os.path.exists(self.journal_file):
+            return data, 0
+
+        with open(self.journal_file, "rb") as f:
+            content = f.read()
+        end = content.rfind(b"\n") + 1
+        if end < len(content):
+            # Torn last line from a crash mid-append: cut it off, or the next flush would glue onto it
+            console.print(f"[yellow]Dropping torn last line of {self.journal_file}[/yellow]")
+            with open(self.journal_file, "r+b") as f:
+                f.truncate(end)
+            content = content[:end]
+
+        domains, names = {}, {}
+
+        def register(pos, domain, norm_name):
+            if domain:
+                domains.setdefault(domain, pos)
+            if norm_name:
+                names.setdefault(norm_name, pos)
+
+        for pos, entity in enumerate(data):
+            register(pos, *self.keys_of(entity))
+
+        applied = 0
+        for line in content.decode("utf-8").splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                console.print(f"[yellow]Skipping corrupt journal line in {self.journal_file}[/yellow]")
+                continue
+            entity = entry.get("e")
+            if entity is None:
+                continue
+            if isinstance(entry.get("k"), list) and len(entry["k"]) == 2:
+                domain, norm_name = entry["k"]
+                pos = domains.get(domain) if domain else None
+                if pos is None and norm_name:
+                    pos = names.get(norm_name)
+            elif isinstance(entry.get("i"), int):
+                # Older journals address records by list position
+                domain, norm_name = self.keys_of(entity)
+                pos = entry["i"] if entry["i"] < len(data) else None
+            else:
+                continue
+            if pos is None:
+                data.append(entity)
+                pos = len(data) - 1
+            else:
+                data[pos] = entity
+            register(pos, domain, norm_name)
+            applied += 1
+        return data, applied
+
+    def keys_of(self, entity):
+        return self.index_keys(entity) if self.index_keys else ("", "")
+
+    def record(self, idx, entity):
+        # Coalesce repeated updates to the same record within one batch
+        self.pending[idx] = entity
+
+    def append_pending(self, data):
+        """Appends the pending records to the journal (caller holds the file lock)."""
+        if not self.pending:
+            return
+        directory = os.path.dirname(self.journal_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lines = [json.dumps({"k": list(self.keys_of(data[idx])), "e": data[idx]}) for idx in sorted(self.pending)]
+        with open(self.journal_file, "a") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_entries += len(lines)
+        self.pending = {}
+
+    def flush(self, data):
+        with self.file_lock():
+            if not os.path.exists(self.master_file) and not os.path.exists(self.journal_file):
+                # First save: start from a snapshot so the JSON file always exists
+                self.pending = {}
+                self.write_snapshot(data)
+                return False
+            self.append_pending(data)
+
+        if self.compact_every and self.journal_entries >= self.compact_every:
+            return self.compact(data)
+        return False
+
+    def compact(self, data):
+        """
+        Folds the journal into a fresh snapshot. The snapshot is rebuilt from disk,
+        so records other writers appended are kept; `data` is replaced with it.
+        """
+        with self.file_lock():
+            self.append_pending(data)
+            merged, _ = self.replay(self.read_snapshot())
+            self.write_snapshot(merged)
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+        data[:] = merged
+        self.journal_entries = 0
+        self.pending = {}
+        return True
+
+    def close(self):
+        if self.lock_file is not None:
+            self.lock_file.close()
+            self.lock_file = None
+
+
+class SqliteStore(JsonStore):
+    """
+    SQLite master store (<master>.db) for crash safety and concurrent writers.
+
+    Every record is a JSON blob plus indexed match columns (domain, normalized
+    name) and one row per phone number. Upserts run in short BEGIN IMMEDIATE
+    transactions in WAL mode, so several MasterDataManager instances (threads or
+    processes) can write to the same database without clobbering each other.
+    The JSON file is kept as an import source (on open, when it changed since the
+    last sync) and export target (compact).
+    """
+    indexed = True
+
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS entities (id INTEGER PRIMARY KEY, domain TEXT, norm_name TEXT, data TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_entities_domain ON entities(domain)",
+        "CREATE INDEX IF NOT EXISTS idx_entities_name ON entities(norm_name)",
+        "CREATE TABLE IF NOT EXISTS phones (entity_id INTEGER NOT NULL, phone TEXT NOT NULL, PRIMARY KEY (entity_id, phone))",
+        "CREATE INDEX IF NOT EXISTS idx_phones_phone ON phones(phone)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    ]
+
+    def __init__(self, master_file: str):
+        super().__init__(master_file)
+        base, _ = os.path.splitext(master_file)
+        self.db_file = base + ".db"
+        directory = os.path.dirname(self.db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit mode; transactions are opened explicitly in transaction()
+        self.conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.in_transaction = False
+        for statement in self.SCHEMA:
+            self.conn.execute(statement)
+
+    @contextmanager
+    def transaction(self):
+        if self.in_transaction:
+            yield
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.in_transaction = True
+        try:
+            yield
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        finally:
+            self.in_transaction = False
+
+    def json_signature(self):
+        """(mtime, size) of the JSON snapshot and journal; None when neither exists."""
+        stats = []
+        for path in (self.master_file, JournalStore(self.master_file).journal_file):
+            if os.path.exists(path):
+                st = os.stat(path)
+                stats.append([path, st.st_mtime_ns, st.st_size])
+        return json.dumps(stats) if stats else None
+
+    def synced_signature(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'json_signature'").fetchone()
+        return row[0] if row else None
+
+    def mark_synced(self, signature):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_signature', ?)", (signature,))
+
+    def import_json(self, index_keys, merge):
+        """
+        Brings in records the JSON snapshot (+ journal, if any) holds that the
+        database does not, e.g. written by the journal backend since the last
+        sync. Skipped while the files are unchanged since the last import/export.
+        index_keys(entity) -> (domain, norm_name); merge(existing, new) -> entity.
+        """
+        signature = self.json_signature()
+        if signature is None or signature == self.synced_signature():
+            return 0
+        journal = JournalStore(self.master_file)
+        try:
+            data = journal.load(index_keys)
+        finally:
+            journal.close()
+        added = updated = 0
+        with self.transaction():
+            if self.synced_signature() == signature:
+                return 0  # Another writer won the race
+            for entity in data:
+                domain, norm_name = index_keys(entity)
+                matched_id = self.find(domain, norm_name)
+                if matched_id is None:
+                    self.insert(entity, domain, norm_name)
+                    added += 1
+                    continue
+                existing = self.get(matched_id)
+                merged = merge(existing, entity)
+                if merged != existing:
+                    self.update(matched_id, merged, *index_keys(merged))
+                    updated += 1
+            self.mark_synced(signature)
+        if added or updated:
+            console.print(f"[dim]Imported {added} new / {updated} changed records from {self.master_file} into {self.db_file}[/dim]")
+        return added + updated
+
+    def load(self):
+        # Own short-lived connection: safe to call from the export thread, and sees only committed rows
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        try:
+            return [json.loads(row[0]) for row in conn.execute("SELECT data FROM entities ORDER BY id")]
+        finally:
+            conn.close()
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM entities").fetchone()[0]
+
+    def find(self, domain, norm_name):
+        """Earliest record matching by domain, else by normalized name. Returns id or None."""
+        if domain:
+            row = self.conn.execute("SELECT id FROM entities WHERE domain = ? ORDER BY id LIMIT 1", (domain,)).fetchone()
+            if row:
+                return row[0]
+        if norm_name:
+            row = self.conn.execute("SELECT id FROM entities WHERE norm_name = ? ORDER BY id LIMIT 1", (norm_name,)).fetchone()
+            if row:
+                return row[0]
+        return None
+
+    def find_by_phone(self, phone):
+        return [row[0] for row in self.conn.execute("SELECT entity_id FROM phones WHERE phone = ?", (phone,))]
+
+    def get(self, entity_id):
+        row = self.conn.execute("SELECT data FROM entities WHERE id = ?", (entity_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def insert(self, entity, domain, norm_name):
+        cur = self.conn.execute(
+            "INSERT INTO entities (domain, norm_name, data) VALUES (?, ?, ?)",
+            (domain, norm_name or None, json.dumps(entity))
+        )
+        self.write_phones(cur.lastrowid, entity)
+        return cur.lastrowid
+
+    def update(self, entity_id, entity, domain, norm_name):
+        self.conn.execute(
+            "UPDATE entities SET domain = ?, norm_name = ?, data = ? WHERE id = ?",
+            (domain, norm_name or None, json.dumps(entity), entity_id)
+        )
+        self.write_phones(entity_id, entity)
+
+    def write_phones(self, entity_id, entity):
+        self.conn.execute("DELETE FROM phones WHERE entity_id = ?", (entity_id,))
+        phones = {p for p in entity.get("mobile", []) if p}
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO phones (entity_id, phone) VALUES (?, ?)",
+            [(entity_id, p) for p in phones]
+        )
+
+    def flush(self, data):
+        # Upserts are committed as they happen
+        return False
+
+    def compact(self, data):
+        """
+        Exports the database to the JSON file and checkpoints the WAL. The
+        journal is dropped: its entries are already in the database (import_json
+        runs first). Done under the journal lock, so no journal writer appends
+        in between.
+        """
+        journal = JournalStore(self.master_file)
+        try:
+            with journal.file_lock():
+                self.write_snapshot(self.load())
+                if os.path.exists(journal.journal_file):
+                    os.remove(journal.journal_file)
+                self.mark_synced(self.json_signature())
+        finally:
+            journal.close()
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return False
+
+    def close(self):
+        self.conn.close()
+
+
+STORES = {
+    "json": JsonStore,
+    "journal": JournalStore,
+    "sqlite": SqliteStore,
+}
+
+def open_store(master_file: str, storage: str = "journal"):
+    """Factory for the master list storage backend."""
+    if storage not in STORES:
+        raise ValueError(f"Unknown storage backend: {storage} (choose from {', '.join(STORES)})")
+    return STORES[storage](master_file)
@@ -1,3 +1,4 @@
+import asyncio
 import random
 import time
 from rich.console import Console
@@ -15,10 +16,20 @@ def random_delay(min_seconds: float = 2.0, max_seconds: float = 5.0):
     console.print(f"[dim]Sleeping for {delay:.2f}s...[/dim]")
     time.sleep(delay)
 
+async def async_random_delay(min_seconds: float = 2.0, max_seconds: float = 5.0):
+    """
+    Non-blocking twin of random_delay for coroutines.
+    Only the calling task waits; other crawls on the event loop keep running.
+    """
+    delay = random.uniform(min_seconds, max_seconds)
+    console.print(f"[dim]Sleeping for {delay:.2f}s...[/dim]")
+    await asyncio.sleep(delay)
+
 import json
 import os
 import urllib.parse
 from .config import USER_AGENTS
+from .processed import PROCESSED_FILE, get_processed_sites
 
 KNOWN_AGGREGATORS = {
     "magicbricks.com", "99acres.com", "justdial.com", 
@@ -173,16 +184,19 @@ def reset_crawler_state(query: str):
     except Exception as e:
         console.print(f"[red]Failed to reset state: {e}[/red]")
 
-PROCESSED_FILE = "data/processed_sites.txt"
-
 def load_processed_sites():
-    """Loads a set of processed domains to avoid re-scraping."""
-    if not os.path.exists(PROCESSED_FILE):
-        return set()
-    with open(PROCESSED_FILE, "r") as f:
-        return set(line.strip() for line in f if line.strip())
+    """
+    Domains already crawled (by any run). Returns the shared ProcessedSites,
+    which supports `domain in processed` without loading the log into a set.
+    """
+    processed = get_processed_sites()
+    processed.refresh()
+    return processed
 
 def mark_as_processed(domain):
-    """Appends a domain to the processed list."""
-    with open(PROCESSED_FILE, "a") as f:
-        f.write(f"{domain}\n")
+    """Buffers a domain for the processed log; written by flush_processed_sites() (or every 500)."""
+    get_processed_sites().add(domain)
+
+def flush_processed_sites():
+    """Appends buffered processed domains in one write (call once per batch)."""
+    get_processed_sites().flush()
@@ -0,0 +1,602 @@
+import json
+import os
+import select
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from rich.console import Console
+from .config import WORK_QUEUE_VISIBILITY, WORK_QUEUE_MAX_ATTEMPTS
+
+console = Console()
+
+
+def default_holder():
+    """Lease holder id of this process (host:pid)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Lease:
+    """One leased item; valid until `expires_at` unless heartbeated."""
+    __slots__ = ("item", "payload", "token", "attempts", "expires_at")
+
+    def __init__(self, item, payload, token, attempts, expires_at):
+        self.item = item
+        self.payload = payload
+        self.token = token
+        self.attempts = attempts
+        self.expires_at = expires_at
+
+
+class WorkQueue:
+    """
+    Shared queue of work items (queries, root domains) for several crawler boxes.
+
+    - put(): adds items; an item is only ever added once, so every box can seed
+      the same list and finished work is never queued again
+    - lease(): hands out visible items for `visibility` seconds; an item whose
+      lease runs out (box died) becomes visible again
+    - heartbeat(): extends a lease (see LeaseKeeper for long jobs)
+    - complete(): stores the result in the shared result store, see results()
+    - release(): gives an item back after a failure (failed for good after
+      `max_attempts` leases)
+    - claim(): put + lease of one item, for work found while running
+    """
+    def __init__(self, name: str, visibility: float = WORK_QUEUE_VISIBILITY,
+                 max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS):
+        self.name = name
+        self.visibility = visibility
+        self.max_attempts = max(1, max_attempts)
+
+    def put(self, items):
+        """Adds {item: payload} (or a list of items). Returns how many were new."""
+        raise NotImplementedError
+
+    def lease(self, holder: str, count: int = 1):
+        raise NotImplementedError
+
+    def claim(self, item, holder: str, payload=None):
+        """Adds `item` if unknown and leases it. None if finished or leased by someone else."""
+        raise NotImplementedError
+
+    def heartbeat(self, lease):
+        """True while the lease is still ours."""
+        raise NotImplementedError
+
+    def complete(self, lease, result=None):
+        raise NotImplementedError
+
+    def release(self, lease, error=None, retry_after: float = 0.0):
+        raise NotImplementedError
+
+    def results(self):
+        """{item: result} of every completed item."""
+        raise NotImplementedError
+
+    def counts(self):
+        """{"queued", "leased", "done", "failed"}: leased includes retries waiting out a delay."""
+        raise NotImplementedError
+
+    def next_visible(self):
+        """Time the next unfinished item can be leased (may be in the past); None once all are finished."""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def print_summary(self):
+        counts = self.counts()
+        console.print(
+            f"[dim]Work queue '{self.name}': {counts['done']} done, {counts['failed']} failed, "
+            f"{counts['leased']} leased, {counts['queued']} queued[/dim]"
+        )
+
+    @staticmethod
+    def as_items(items):
+        return items.items() if isinstance(items, dict) else ((item, None) for item in items)
+
+
+class SqliteWorkQueue(WorkQueue):
+    """
+    WorkQueue in a SQLite file (WAL): every process on the box, or boxes sharing a
+    filesystem with working locks. Leases are taken inside BEGIN IMMEDIATE.
+    """
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS jobs (queue TEXT NOT NULL, item TEXT NOT NULL, state TEXT NOT NULL, "
+        "payload TEXT, result TEXT, error TEXT, token TEXT, holder TEXT, visible_at REAL NOT NULL, "
+        "attempts INTEGER NOT NULL DEFAULT 0, updated_at REAL NOT NULL, PRIMARY KEY (queue, item))",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_visible ON jobs(queue, state, visible_at)",
+    ]
+
+    def __init__(self, path: str, name: str, **kwargs):
+        super().__init__(name, **kwargs)
+        self.path = path
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit mode; transactions are opened explicitly in transaction()
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        for statement in self.SCHEMA:
+            self.conn.execute(statement)
+
+    @contextmanager
+    def transaction(self):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def put(self, items):
+        now = time.time()
+        with self.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (queue, item, state, payload, visible_at, updated_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?)",
+                [(self.name, item, json.dumps(payload), now, now) for item, payload in self.as_items(items)]
+            )
+            return conn.total_changes - before
+
+    def take(self, conn, item, payload, attempts, holder, now):
+        token = uuid.uuid4().hex
+        conn.execute(
+            "UPDATE jobs SET state = 'leased', token = ?, holder = ?, visible_at = ?, attempts = attempts + 1, "
+            "updated_at = ? WHERE queue = ? AND item = ?",
+            (token, holder, now + self.visibility, now, self.name, item)
+        )
+        return Lease(item, json.loads(payload) if payload else None, token, attempts + 1, now + self.visibility)
+
+    def lease(self, holder: str, count: int = 1):
+        now = time.time()
+        with self.transaction() as conn:
+            rows = conn.execute(
+                "SELECT item, payload, attempts FROM jobs WHERE queue = ? AND state IN ('queued', 'leased') "
+                "AND visible_at <= ? ORDER BY visible_at LIMIT ?", (self.name, now, count)
+            ).fetchall()
+            return [self.take(conn, item, payload, attempts, holder, now) for item, payload, attempts in rows]
+
+    def claim(self, item, holder: str, payload=None):
+        now = time.time()
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO jobs (queue, item, state, payload, visible_at, updated_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?)", (self.name, item, json.dumps(payload), now, now)
+            )
+            row = conn.execute(
+                "SELECT payload, attempts FROM jobs WHERE queue = ? AND item = ? AND state IN ('queued', 'leased') "
+                "AND visible_at <= ?", (self.name, item, now)
+            ).fetchone()
+            return self.take(conn, item, row[0], row[1], holder, now) if row else None
+
+    def update_leased(self, lease, sql, params):
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {sql}, updated_at = ? WHERE queue = ? AND item = ? AND token = ? AND state = 'leased'",
+                (*params, time.time(), self.name, lease.item, lease.token)
+            )
+            return cursor.rowcount == 1
+
+    def heartbeat(self, lease):
+        expires_at = time.time() + self.visibility
+        if self.update_leased(lease, "visible_at = ?", (expires_at,)):
+            lease.expires_at = expires_at
+            return True
+        return False
+
+    def complete(self, lease, result=None):
+        return self.update_leased(lease, "state = 'done', result = ?, token = NULL", (json.dumps(result),))
+
+    def release(self, lease, error=None, retry_after: float = 0.0):
+        if lease.attempts >= self.max_attempts:
+            return self.update_leased(lease, "state = 'failed', error = ?, token = NULL", (str(error),))
+        return self.update_leased(lease, "state = 'queued', error = ?, token = NULL, visible_at = ?",
+                                  (str(error), time.time() + retry_after))
+
+    def results(self):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT item, result FROM jobs WHERE queue = ? AND state = 'done'", (self.name,)
+            ).fetchall()
+        return {item: json.loads(result) if result else None for item, result in rows}
+
+    def counts(self):
+        now = time.time()
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT CASE WHEN state IN ('queued', 'leased') THEN "
+                "CASE WHEN visible_at <= ? THEN 'queued' ELSE 'leased' END ELSE state END, COUNT(*) "
+                "FROM jobs WHERE queue = ? GROUP BY 1", (now, self.name)
+            ).fetchall()
+        return dict({"queued": 0, "leased": 0, "done": 0, "failed": 0}, **dict(rows))
+
+    def next_visible(self):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT MIN(visible_at) FROM jobs WHERE queue = ? AND state IN ('queued', 'leased')", (self.name,)
+            ).fetchone()
+        return row[0]
+
+    def clear(self):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM jobs WHERE queue = ?", (self.name,))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+# --- Redis protocol backend ---
+class RedisError(Exception):
+    pass
+
+
+class RespClient:
+    """
+    Minimal RESP2 client (one socket, one command at a time): enough for
+    RedisWorkQueue without the redis package.
+    """
+    # Safe to send again when the reply was lost: running them twice changes nothing
+    IDEMPOTENT = frozenset({"PING", "GET", "HGET", "HGETALL", "HLEN", "ZCARD", "ZCOUNT", "ZRANGE",
+                            "ZRANGEBYSCORE", "ZSCORE", "DEL"})
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, db: int = 0, password: str = None,
+                 timeout: float = 10):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.sock = None
+        self.reader = None
+
+    def connect(self):
+        self.sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self.reader = self.sock.makefile("rb")
+        if self.password:
+            self.call("AUTH", self.password)
+        if self.db:
+            self.call("SELECT", self.db)
+
+    def disconnect(self):
+        if self.sock is not None:
+            try:
+                self.reader.close()
+                self.sock.close()
+            except OSError:
+                pass
+        self.sock = self.reader = None
+
+    def call(self, *args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self.sock.sendall(b"".join(parts))
+        return self.read_reply()
+
+    def read_reply(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            size = int(rest)
+            if size < 0:
+                return None
+            data = self.reader.read(size + 2)[:-2]
+            return data.decode("utf-8")
+        if kind == b"*":
+            size = int(rest)
+            return None if size < 0 else [self.read_reply() for _ in range(size)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def stale(self):
+        """True when the server closed the idle connection (readable, but at EOF)."""
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+            return bool(readable) and not self.sock.recv(1, socket.MSG_PEEK)
+        except (ConnectionError, OSError):
+            return True
+
+    def execute(self, *args):
+        """
+        Runs one command. A connection found closed before sending is reopened;
+        one that drops after the command went out is only retried for
+        IDEMPOTENT commands. Anything else (EVAL in particular) may already
+        have run on the server, so the error is raised instead of running it twice.
+        """
+        retry = str(args[0]).upper() in self.IDEMPOTENT
+        with self.lock:
+            if self.sock is not None and self.stale():
+                self.disconnect()
+            for attempt in range(2):
+                try:
+                    if self.sock is None:
+                        self.connect()
+                    return self.call(*args)
+                except (ConnectionError, OSError):
+                    self.disconnect()
+                    if attempt or not retry:
+                        raise
+
+    def close(self):
+        with self.lock:
+            self.disconnect()
+
+
+class RedisWorkQueue(WorkQueue):
+    """
+    WorkQueue on any server speaking the Redis protocol, shared by boxes on the network.
+
+    Keys under <prefix>:<name>:
+        items     hash  item -> payload (every item ever added)
+        jobs      zset  unfinished items, scored by the time they become visible
+        lock:<i>  str   lease token of item i, expiring with the lease (SET NX PX)
+        attempts  hash  leases taken per item
+        done      hash  item -> result (the shared result store)
+        failed    hash  item -> last error
+
+    Every state change is one Lua script (EVAL), so a box never acts on a
+    candidate another box finished or took over in the meantime.
+    """
+    # KEYS: items, jobs. ARGV: now, item1, payload1, item2, payload2, ...
+    PUT_SCRIPT = """
+local added = 0
+for i = 2, #ARGV, 2 do
+    if redis.call('HSETNX', KEYS[1], ARGV[i], ARGV[i + 1]) == 1 then
+        redis.call('ZADD', KEYS[2], ARGV[1], ARGV[i])
+        added = added + 1
+    end
+end
+return added
+"""
+    # KEYS: jobs, lock, attempts, items. ARGV: item, token, visibility ms, now, expires_at
+    TAKE_SCRIPT = """
+local score = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if not score or tonumber(score) > tonumber(ARGV[4]) then
+    return false
+end
+if not redis.call('SET', KEYS[2], ARGV[2], 'NX', 'PX', ARGV[3]) then
+    return false
+end
+redis.call('ZADD', KEYS[1], 'XX', ARGV[5], ARGV[1])
+local attempts = redis.call('HINCRBY', KEYS[3], ARGV[1], 1)
+return {attempts, redis.call('HGET', KEYS[4], ARGV[1])}
+"""
+    # KEYS: lock, jobs. ARGV: token, item, visibility ms, expires_at
+    HEARTBEAT_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+redis.call('ZADD', KEYS[2], 'XX', ARGV[4], ARGV[2])
+return 1
+"""
+    # KEYS: lock, jobs, done/failed. ARGV: token, item, result/error
+    FINISH_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[3], ARGV[2], ARGV[3])
+redis.call('ZREM', KEYS[2], ARGV[2])
+redis.call('DEL', KEYS[1])
+return 1
+"""
+    # KEYS: lock, jobs. ARGV: token, item, visible_at
+    RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('ZADD', KEYS[2], 'XX', ARGV[3], ARGV[2])
+redis.call('DEL', KEYS[1])
+return 1
+"""
+    PUT_BATCH = 500
+
+    def __init__(self, client: RespClient, name: str, prefix: str = "pgscraper", **kwargs):
+        super().__init__(name, **kwargs)
+        self.client = client
+        self.key = f"{prefix}:{name}"
+
+    def eval(self, script, keys, *args):
+        return self.client.execute("EVAL", script, len(keys), *keys, *args)
+
+    def put(self, items):
+        added = 0
+        now = time.time()
+        pairs = [(item, json.dumps(payload)) for item, payload in self.as_items(items)]
+        for i in range(0, len(pairs), self.PUT_BATCH):
+            args = [x for pair in pairs[i:i + self.PUT_BATCH] for x in pair]
+            added += self.eval(self.PUT_SCRIPT, [f"{self.key}:items", f"{self.key}:jobs"], repr(now), *args)
+        return added
+
+    def take(self, item, holder, now):
+        """Lease on one item if it is still unfinished and visible, else None."""
+        token = f"{holder}:{uuid.uuid4().hex}"
+        expires_at = now + self.visibility
+        reply = self.eval(
+            self.TAKE_SCRIPT,
+            [f"{self.key}:jobs", f"{self.key}:lock:{item}", f"{self.key}:attempts", f"{self.key}:items"],
+            item, token, int(self.visibility * 1000), repr(now), repr(expires_at)
+        )
+        if not reply:
+            return None
+        attempts, payload = reply
+        return Lease(item, json.loads(payload) if payload else None, token, attempts, expires_at)
+
+    def lease(self, holder: str, count: int = 1):
+        now = time.time()
+        candidates = self.client.execute("ZRANGEBYSCORE", f"{self.key}:jobs", "-inf", now, "LIMIT", 0, count * 4)
+        leases = []
+        for item in candidates or []:
+            lease = self.take(item, holder, now)
+            if lease is not None:
+                leases.append(lease)
+                if len(leases) >= count:
+                    break
+        return leases
+
+    def claim(self, item, holder: str, payload=None):
+        self.put({item: payload})
+        return self.take(item, holder, time.time())
+
+    def heartbeat(self, lease):
+        expires_at = time.time() + self.visibility
+        if not self.eval(self.HEARTBEAT_SCRIPT, [f"{self.key}:lock:{lease.item}", f"{self.key}:jobs"],
+                         lease.token, lease.item, int(self.visibility * 1000), repr(expires_at)):
+            return False
+        lease.expires_at = expires_at
+        return True
+
+    def finish(self, lease, field, value):
+        return bool(self.eval(self.FINISH_SCRIPT,
+                              [f"{self.key}:lock:{lease.item}", f"{self.key}:jobs", f"{self.key}:{field}"],
+                              lease.token, lease.item, value))
+
+    def complete(self, lease, result=None):
+        return self.finish(lease, "done", json.dumps(result))
+
+    def release(self, lease, error=None, retry_after: float = 0.0):
+        if lease.attempts >= self.max_attempts:
+            return self.finish(lease, "failed", str(error))
+        return bool(self.eval(self.RELEASE_SCRIPT, [f"{self.key}:lock:{lease.item}", f"{self.key}:jobs"],
+                              lease.token, lease.item, repr(time.time() + retry_after)))
+
+    def results(self):
+        flat = self.client.execute("HGETALL", f"{self.key}:done") or []
+        return {flat[i]: json.loads(flat[i + 1]) for i in range(0, len(flat), 2)}
+
+    def counts(self):
+        now = time.time()
+        total = self.client.execute("ZCARD", f"{self.key}:jobs")
+        leased = self.client.execute("ZCOUNT", f"{self.key}:jobs", f"({now}", "+inf")
+        return {
+            "queued": total - leased, "leased": leased,
+            "done": self.client.execute("HLEN", f"{self.key}:done"),
+            "failed": self.client.execute("HLEN", f"{self.key}:failed"),
+        }
+
+    def next_visible(self):
+        first = self.client.execute("ZRANGE", f"{self.key}:jobs", 0, 0, "WITHSCORES")
+        return float(first[1]) if first else None
+
+    def clear(self):
+        # Leftover lock keys expire on their own
+        self.client.execute("DEL", *[f"{self.key}:{k}" for k in ("items", "jobs", "attempts", "done", "failed")])
+
+    def close(self):
+        self.client.close()
+
+
+class SharedResults:
+    """
+    Stand-in for MasterDataManager in shared runs: leads found outside the domain
+    crawl (Google Maps places) are stored in a work queue's result store, one
+    finished item per place, instead of a local master list. `collect` merges
+    them with the crawled domains.
+    """
+    def __init__(self, work_queue, holder: str = None):
+        self.work_queue = work_queue
+        self.holder = holder or default_holder()
+
+    @staticmethod
+    def place_key(entity):
+        return ((entity.get("name") or "") + "|" + (entity.get("address") or "")).strip().lower()
+
+    def upsert_entity(self, entity):
+        lease = self.work_queue.claim(self.place_key(entity), self.holder)
+        if lease is None:
+            # Stored by this or another box already
+            return "Skipped (Already exists)"
+        self.work_queue.complete(lease, entity)
+        return "Added"
+
+    def save_master(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def open_work_queue(url: str, name: str, **kwargs):
+    """
+    Factory for the work queue backend:
+        redis://[:password@]host[:port][/db]   RedisWorkQueue
+        sqlite:///path/to/queue.db, or a path  SqliteWorkQueue
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "redis":
+        db = int(parsed.path.strip("/") or 0)
+        client = RespClient(parsed.hostname or "127.0.0.1", parsed.port or 6379, db=db, password=parsed.password)
+        return RedisWorkQueue(client, name, **kwargs)
+    if parsed.scheme == "sqlite":
+        return SqliteWorkQueue(url[len("sqlite:///"):], name, **kwargs)
+    if parsed.scheme in ("", "file"):
+        return SqliteWorkQueue(parsed.path if parsed.scheme else url, name, **kwargs)
+    raise ValueError(f"Unknown work queue backend: {url} (use redis://... or sqlite:///...)")
+
+
+class LeaseKeeper:
+    """
+    Background heartbeats for leases held by long jobs (a whole query pipeline),
+    every visibility / 3 seconds. A lease that was lost (expired, taken over) is
+    dropped and flagged in `lost`.
+    """
+    def __init__(self, work_queue, interval: float = None):
+        self.work_queue = work_queue
+        self.interval = interval or max(1.0, work_queue.visibility / 3)
+        self.leases = {}
+        self.lost = set()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def add(self, lease):
+        with self.lock:
+            self.leases[lease.item] = lease
+
+    def discard(self, lease):
+        with self.lock:
+            self.leases.pop(lease.item, None)
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            with self.lock:
+                leases = list(self.leases.values())
+            for lease in leases:
+                try:
+                    alive = self.work_queue.heartbeat(lease)
+                except Exception as e:
+                    console.print(f"[dim red]Heartbeat failed for {lease.item}: {e}[/dim red]")
+                    continue
+                if not alive:
+                    self.lost.add(lease.item)
+                    self.discard(lease)
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.run, daemon=True, name="lease-keeper")
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop_event.set()
+        self.thread.join()
@@ -1,21 +1,28 @@
 import pandas as pd
+import atexit
 import json
 import os
+import threading
+import time
 from rich.console import Console
+from src.core.config import EXCEL_EXPORT_MIN_INTERVAL
 
 console = Console()
 
-def export_to_excel(input_file="data/master_pg_list.json", output_file="data/final_pg_leads.xlsx"):
+def export_to_excel(input_file="data/master_pg_list.json", output_file="data/final_pg_leads.xlsx", data=None):
     """
     Reads Master List JSON and exports to a formatted Excel file.
+    Pass `data` to export an in-memory list instead of re-reading input_file.
+    Returns False if the export failed.
     """
-    if not os.path.exists(input_file):
+    if data is None and not os.path.exists(input_file):
         console.print(f"[red]Input file {input_file} not found.[/red]")
-        return
+        return False
 
     try:
-        with open(input_file, "r") as f:
-            data = json.load(f)
+        if data is None:
+            with open(input_file, "r") as f:
+                data = json.load(f)
             
         console.print(f"[blue]Loaded {len(data)} records. Preparing export...[/blue]")
 
@@ -130,19 +137,24 @@ def export_to_excel(input_file="data/master_pg_list.json", output_file="data/fin
 
     except Exception as e:
         console.print(f"[red]Export failed: {e}[/red]")
+        return False
+    return True
 
-def export_to_excel_perfect(input_file="data/master_pg_list.json", output_file="data/perfect_pg_list.xlsx"):
+def export_to_excel_perfect(input_file="data/master_pg_list.json", output_file="data/perfect_pg_list.xlsx", data=None):
     """
     Exports PG data to a perfectly formatted Excel matching the user's reference.
     Columns: PG Name, Mobile number, Location
+    Pass `data` to export an in-memory list instead of re-reading input_file.
+    Returns False if the export failed.
     """
-    if not os.path.exists(input_file):
+    if data is None and not os.path.exists(input_file):
         console.print(f"[red]Input file {input_file} not found.[/red]")
-        return
+        return False
 
     try:
-        with open(input_file, "r") as f:
-            data = json.load(f)
+        if data is None:
+            with open(input_file, "r") as f:
+                data = json.load(f)
 
         AREAS = [
             "Navrangpura", "Vastrapur", "Thaltej", "Bopal", "Paldi", "Satellite", "Ambawadi",
@@ -232,6 +244,121 @@ def export_to_excel_perfect(input_file="data/master_pg_list.json", output_file="
 
     except Exception as e:
         console.print(f"[red]Perfect export failed: {e}[/red]")
+        return False
+    return True
+
+class BackgroundExporter:
+    """
+    Debounced Excel export running in a worker thread.
+
+    request() only marks the export dirty and returns immediately. The worker
+    writes at most one workbook per `min_interval` seconds using the newest data;
+    requests that arrive while one is already waiting are coalesced into it.
+    flush() forces the pending export out (used once at the end of a run).
+    """
+    def __init__(self, export_fn=export_to_excel_perfect, min_interval: float = EXCEL_EXPORT_MIN_INTERVAL):
+        self.export_fn = export_fn
+        self.min_interval = min_interval
+        self.cond = threading.Condition()
+        self.pending = None       # (input_file, output_file, data_fn) of the newest request
+        self.running = False
+        self.force = False
+        self.stopping = False
+        self.last_export = 0.0
+        self.stats = {"requested": 0, "exported": 0, "coalesced": 0, "failed": 0}
+        self.thread = None
+
+    def request(self, input_file, output_file=None, data_fn=None):
+        """
+        Schedules an export. data_fn() is called on the worker thread and should
+        return the list to export (None -> re-read input_file).
+        """
+        with self.cond:
+            self.stats["requested"] += 1
+            if self.pending is not None:
+                self.stats["coalesced"] += 1
+            self.pending = (input_file, output_file, data_fn)
+            if self.thread is None or not self.thread.is_alive():
+                self.stopping = False
+                self.thread = threading.Thread(target=self._worker, name="excel-export", daemon=True)
+                self.thread.start()
+            self.cond.notify_all()
+
+    def _worker(self):
+        while True:
+            with self.cond:
+                while self.pending is None and not self.stopping:
+                    self.cond.wait()
+                if self.pending is None:
+                    return
+                # Debounce: wait out the interval unless someone asked for a flush
+                while not (self.force or self.stopping):
+                    remaining = self.last_export + self.min_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                input_file, output_file, data_fn = self.pending
+                self.pending = None
+                self.force = False
+                self.running = True
+
+            try:
+                data = data_fn() if data_fn else None
+                if output_file:
+                    result = self.export_fn(input_file, output_file, data=data)
+                else:
+                    result = self.export_fn(input_file, data=data)
+                # The export functions report their own errors and return False
+                ok = result is not False
+            except Exception as e:
+                console.print(f"[red]Background export failed: {e}[/red]")
+                ok = False
+
+            with self.cond:
+                self.running = False
+                self.last_export = time.monotonic()
+                self.stats["exported" if ok else "failed"] += 1
+                self.cond.notify_all()
+
+    def flush(self, timeout: float = None):
+        """Runs any pending export now and waits for it to finish."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            if self.pending is not None:
+                self.force = True
+                self.cond.notify_all()
+            while self.pending is not None or self.running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
+
+    def close(self):
+        self.flush()
+        with self.cond:
+            self.stopping = True
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+        if self.stats["requested"]:
+            console.print(
+                f"[dim]Excel exports: {self.stats['exported']} written, "
+                f"{self.stats['coalesced']} coalesced out of {self.stats['requested']} requests[/dim]"
+            )
+
+_background_exporter = None
+_exporter_lock = threading.Lock()
+
+def get_background_exporter():
+    """Process-wide exporter so every MasterDataManager in a run shares one debounce window."""
+    global _background_exporter
+    with _exporter_lock:
+        if _background_exporter is None:
+            _background_exporter = BackgroundExporter()
+            # Guarantee the final export before the interpreter exits
+            atexit.register(_background_exporter.close)
+        return _background_exporter
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
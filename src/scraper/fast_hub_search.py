@@ -1,5 +1,3 @@
-import time
-import random
 import os
 from src.core.utils import console
 from src.scraper.engine import search_waterfall, process_deep_study
@@ -41,9 +39,7 @@ def run_fast_hub_discovery():
                 urls = search_waterfall(query, limit=10) # limit per hub query to keep it 'fast'
                 if urls:
                     all_hub_urls.extend(urls)
-                
-                # Anti-Block Sleep
-                time.sleep(random.uniform(1.0, 2.5))
+                # Anti-block pacing now lives in the per-engine rate limiter
                 
             except Exception as e:
                 console.print(f"[red]Error searching for {query}: {e}[/red]")
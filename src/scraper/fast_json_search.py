@@ -1,9 +1,7 @@
+import argparse
 import json
 import concurrent.futures
 import os
-import sys
-import time
-import random
 
 # Use bridge/real paths as per structure
 from src.scrapers.core.deep_crawler import deep_study_site
@@ -11,12 +9,17 @@ from src.exporters.excel import save_lead_to_excel
 from src.scrapers.search import search_waterfall
 from src.core.utils import console, load_processed_sites, mark_as_processed
 
-def process_location(location):
+def process_location(location, domains=None, storage="sqlite", places=None):
     """
     Processes a single location in parallel.
     - Generates queries
     - Finds URLs
     - Extracts data
+    With a shared `domains` queue the URLs are crawled through it and the
+    entities stay in its result store, Maps leads in `places` (SharedResults);
+    see `main.py collect`.
+    `storage` is the master list backend; it defaults to 'sqlite', the one
+    backend the worker threads (one manager each) can write to safely.
     """
     queries = [
         f'PG in {location} Ahmedabad', 
@@ -29,14 +32,19 @@ def process_location(location):
     
     for query in queries:
         try:
-            urls = search_waterfall(query, limit=10)
+            urls = search_waterfall(query, limit=10, storage=storage, manager=places)
             if urls:
                 hub_urls.extend(urls)
-            time.sleep(random.uniform(1.0, 2.0))
         except Exception as e:
             console.print(f"[red]Error in search for {query}: {e}[/red]")
             
-    if hub_urls:
+    if hub_urls and domains is not None:
+        unique_urls = list(set(hub_urls))
+        console.print(f"[green]{location}: Found {len(unique_urls)} URLs. Sharing them for Deep Study...[/green]")
+        from src.scrapers.core.browser_pool import get_browser_pool
+        from src.scrapers.core.deep_crawler import run_batch
+        get_browser_pool().run(run_batch(unique_urls, None, work_queue=domains))
+    elif hub_urls:
         unique_urls = list(set(hub_urls))
         console.print(f"[green]{location}: Found {len(unique_urls)} URLs. Starting Deep Study...[/green]")
         
@@ -49,7 +57,7 @@ def process_location(location):
             # deep_study_site (which is process_deep_study) handles validation internally 
             # as it uses MasterDataManager, which we updated with the City Guard logic.
             # However, the user specifically asked for a check here if valid leads.
-            deep_study_site(temp_file, "data/master_pg_list.json", city="ahmedabad")
+            deep_study_site(temp_file, "data/master_pg_list.json", city="ahmedabad", storage=storage)
             
             # Export to the requested Excel path
             save_lead_to_excel("data/master_pg_list.json", "data/final_pg_leads.xlsx")
@@ -62,9 +70,52 @@ def process_location(location):
     else:
         console.print(f"[yellow]{location}: No URLs found.[/yellow]")
 
-def run_parallel_json_search():
+def run_shared_locations(locations, queue_url, workers=5, storage="sqlite"):
     """
-    Main entry point for parallel search.
+    Shared run: every box seeds the same locations into the queue and its
+    `workers` threads lease them until none are left.
+    """
+    from src.core.work_queue import open_work_queue, LeaseKeeper, SharedResults, default_holder
+    location_queue = open_work_queue(queue_url, "locations")
+    domains = open_work_queue(queue_url, "domains")
+    place_queue = open_work_queue(queue_url, "places")
+    holder = default_holder()
+    places = SharedResults(place_queue, holder)
+    added = location_queue.put(locations)
+    console.print(f"[bold green]Shared search: {added} new locations queued, {workers} workers on this box...[/bold green]")
+
+    def worker(keeper):
+        while True:
+            leases = location_queue.lease(holder, 1)
+            if not leases:
+                return
+            lease = leases[0]
+            keeper.add(lease)
+            try:
+                process_location(lease.item, domains, storage, places)
+            except Exception as e:
+                keeper.discard(lease)
+                location_queue.release(lease, e)
+                continue
+            keeper.discard(lease)
+            location_queue.complete(lease)
+
+    try:
+        with LeaseKeeper(location_queue) as keeper:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(worker, [keeper] * workers))
+        location_queue.print_summary()
+        domains.print_summary()
+        place_queue.print_summary()
+    finally:
+        location_queue.close()
+        domains.close()
+        place_queue.close()
+
+def run_parallel_json_search(queue_url=None, storage="sqlite"):
+    """
+    Main entry point for parallel search. With `queue_url` (redis://... or
+    sqlite:///...) the locations are shared with other boxes.
     """
     loc_file = "data/ahmedabad_locations.json"
     if not os.path.exists(loc_file):
@@ -74,16 +125,24 @@ def run_parallel_json_search():
     with open(loc_file, "r") as f:
         locations = json.load(f)
         
+    if queue_url:
+        run_shared_locations(locations, queue_url, storage=storage)
+        return
+
     console.print(f"[bold green]Starting Parallel Search for {len(locations)} locations (5 workers)...[/bold green]")
     
     with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        executor.map(process_location, locations)
+        executor.map(lambda location: process_location(location, storage=storage), locations)
         
     console.print("\n[bold green]Parallel JSON Search completed![/bold green]")
 
 if __name__ == "__main__":
     try:
-        run_parallel_json_search()
+        parser = argparse.ArgumentParser(description="Parallel search over data/ahmedabad_locations.json")
+        parser.add_argument("queue", nargs="?", help="Shared work queue (redis://host:6379/0 or sqlite:///path.db)")
+        parser.add_argument("--storage", default="sqlite", help="Master list backend: 'sqlite' (default, safe across the worker threads), 'journal', 'json'")
+        args = parser.parse_args()
+        run_parallel_json_search(args.queue, storage=args.storage)
     except KeyboardInterrupt:
         console.print("\n[bold red]Cancelled by user.[/bold red]")
     except Exception as e:
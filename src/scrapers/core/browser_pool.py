@@ -0,0 +1,194 @@
+import asyncio
+import atexit
+import threading
+from rich.console import Console
+from src.core.utils import get_random_header
+
+console = Console()
+
+# Shared launch flags and resource blocking used by every engine/crawler
+LAUNCH_ARGS = ["--disable-gpu", "--disable-dev-shm-usage", "--no-sandbox"]
+BLOCKED_RESOURCES = "**/*.{png,jpg,jpeg,gif,svg,css,woff,woff2,ico}"
+
+async def _abort_route(route):
+    await route.abort()
+
+def _abort_route_sync(route):
+    route.abort()
+
+
+class BrowserPool:
+    """
+    Warm Chromium instances for the async engines (Brave, Bing, deep crawler).
+
+    One browser per headless mode is launched lazily and kept alive; callers get a
+    fresh, isolated context (random UA + optional resource blocking) and close only
+    the context. Playwright objects are bound to the event loop that created them,
+    so run entry points through pool.run() (a long-lived loop) instead of
+    asyncio.run(), otherwise the browsers are relaunched for every new loop.
+    """
+    def __init__(self):
+        self.loop = None          # loop the current browsers belong to
+        self.runner_loop = None   # loop used by run()
+        self.playwright = None
+        self.browsers = {}
+        self.lock = None
+        self.stats = {"launches": 0, "contexts": 0, "reused": 0}
+
+    def run(self, coro):
+        """Runs a coroutine on the pool's persistent loop (drop-in for asyncio.run)."""
+        if self.runner_loop is None or self.runner_loop.is_closed():
+            self.runner_loop = asyncio.new_event_loop()
+        return self.runner_loop.run_until_complete(coro)
+
+    async def get_browser(self, headless: bool = True):
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            # Browsers from a previous (closed) loop are unusable; start over
+            self.loop = loop
+            self.lock = asyncio.Lock()
+            self.playwright = None
+            self.browsers = {}
+
+        async with self.lock:
+            browser = self.browsers.get(headless)
+            if browser is not None and browser.is_connected():
+                self.stats["reused"] += 1
+                return browser
+
+            if self.playwright is None:
+                from playwright.async_api import async_playwright
+                self.playwright = await async_playwright().start()
+            browser = await self.playwright.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+            self.browsers[headless] = browser
+            self.stats["launches"] += 1
+            return browser
+
+    async def new_context(self, headless: bool = True, block_resources: bool = True, **kwargs):
+        """New isolated context on a warm browser. Caller must close it."""
+        browser = await self.get_browser(headless)
+        kwargs.setdefault("user_agent", get_random_header())
+        context = await browser.new_context(**kwargs)
+        if block_resources:
+            # --- Resource Blocking for Speed ---
+            await context.route(BLOCKED_RESOURCES, _abort_route)
+        self.stats["contexts"] += 1
+        return context
+
+    async def close(self):
+        for browser in self.browsers.values():
+            try: await browser.close()
+            except: pass
+        self.browsers = {}
+        if self.playwright is not None:
+            try: await self.playwright.stop()
+            except: pass
+            self.playwright = None
+
+    def shutdown(self):
+        if self.runner_loop is not None and not self.runner_loop.is_closed():
+            if self.loop is self.runner_loop:
+                try: self.run(self.close())
+                except: pass
+            self.runner_loop.close()
+
+
+class SyncBrowserPool:
+    """
+    Same idea for the sync-API scrapers (Google Maps, universal list extractor,
+    harvester): one warm browser per headless mode, fresh context per caller.
+    """
+    def __init__(self):
+        self.playwright = None
+        self.browsers = {}
+        self.stats = {"launches": 0, "contexts": 0, "reused": 0}
+
+    def get_browser(self, headless: bool = True):
+        browser = self.browsers.get(headless)
+        if browser is not None and browser.is_connected():
+            self.stats["reused"] += 1
+            return browser
+
+        if self.playwright is None:
+            from playwright.sync_api import sync_playwright
+            self.playwright = sync_playwright().start()
+        browser = self.playwright.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+        self.browsers[headless] = browser
+        self.stats["launches"] += 1
+        return browser
+
+    def new_context(self, headless: bool = True, block_resources: bool = False, **kwargs):
+        browser = self.get_browser(headless)
+        kwargs.setdefault("user_agent", get_random_header())
+        context = browser.new_context(**kwargs)
+        if block_resources:
+            context.route(BLOCKED_RESOURCES, _abort_route_sync)
+        self.stats["contexts"] += 1
+        return context
+
+    def shutdown(self):
+        for browser in self.browsers.values():
+            try: browser.close()
+            except: pass
+        self.browsers = {}
+        if self.playwright is not None:
+            try: self.playwright.stop()
+            except: pass
+            self.playwright = None
+
+
+# --- Process-wide access ---
+# Playwright is not thread-safe, so each thread gets its own pools.
+_local = threading.local()
+_all_pools = []
+_pools_lock = threading.Lock()
+
+def _register(pool):
+    with _pools_lock:
+        _all_pools.append(pool)
+    return pool
+
+def get_browser_pool() -> BrowserPool:
+    if not hasattr(_local, "async_pool"):
+        _local.async_pool = _register(BrowserPool())
+    return _local.async_pool
+
+def get_sync_browser_pool() -> SyncBrowserPool:
+    if not hasattr(_local, "sync_pool"):
+        _local.sync_pool = _register(SyncBrowserPool())
+    return _local.sync_pool
+
+def pool_stats():
+    """Aggregated launch/context counters across all pools."""
+    totals = {"launches": 0, "contexts": 0, "reused": 0}
+    with _pools_lock:
+        for pool in _all_pools:
+            for key in totals:
+                totals[key] += pool.stats[key]
+    # Every context after the first on a browser was served without a launch
+    totals["contexts_without_launch"] = max(0, totals["contexts"] - totals["launches"])
+    return totals
+
+def close_thread_pools():
+    """Shuts down the calling thread's browsers (call at the end of a worker thread)."""
+    for attr in ("async_pool", "sync_pool"):
+        pool = getattr(_local, attr, None)
+        if pool is not None:
+            pool.shutdown()
+            delattr(_local, attr)
+
+def shutdown_pools():
+    stats = pool_stats()
+    with _pools_lock:
+        pools = list(_all_pools)
+        _all_pools.clear()
+    for pool in pools:
+        try: pool.shutdown()
+        except: pass
+    if stats["contexts"]:
+        console.print(
+            f"[dim]Browser pool: {stats['launches']} launches, {stats['contexts']} contexts "
+            f"({stats['contexts_without_launch']} on warm browsers)[/dim]"
+        )
+
+atexit.register(shutdown_pools)
@@ -2,17 +2,21 @@ import re
 import asyncio
 import json
 import os
+import time
 from urllib.parse import urlparse, urljoin
-from playwright.async_api import async_playwright
 from rich.console import Console
 from tqdm.asyncio import tqdm
-from src.core.utils import get_random_header, random_delay, load_processed_sites, mark_as_processed
+from src.core.utils import load_processed_sites, mark_as_processed, flush_processed_sites
+from src.core.checkpoint import get_crawl_checkpoint
+from src.core.work_queue import LeaseKeeper, default_holder
+from src.core.config import CRAWL_RETRY_BACKOFF, CRAWL_RETRY_MAX_DELAY, WORK_QUEUE_POLL_INTERVAL
+from src.core.rate_limit import get_rate_limiter
 from src.core.data_manager import MasterDataManager
-from src.scrapers.core.listing import (
-    clean_phone, extract_emails, extract_tel_links, 
-    handle_blocking_elements, reveal_contacts, 
-    PHONE_REGEX, PINCODE_REGEX
-)
+from src.scrapers.core.browser_pool import get_browser_pool
+from src.scrapers.core.http_fetch import HttpFetcher, parse_html, looks_js_rendered
+from src.scrapers.core.snapshot import take_snapshot_async
+from src.scrapers.core.page_cache import get_page_cache
+from src.core.contacts import CONTACTS, ADDRESS_HINTS
 
 console = Console()
 
@@ -22,9 +26,35 @@ BLACKLIST_DOMAINS = ["quora.com", "reddit.com", "translate.google.com", "twitter
 SKIP_KEYWORDS = ["news", "article", "headline", "report", "blog"]
 REQUIRED_KEYWORDS = ["book", "room", "stay", "accommodation", "hostel", "pg", "paying guest", "residency", "living"]
 
+NAME_BAD_WORDS = ["best", "affordable", "cheap", "top", "list", "pg in", "hostel in"]
+LOGO_WORDS = ["logo", "brand", "header", "image"]
+PRIORITY_KEYWORDS = ["contact", "about", "reach", "location", "connect"]
+
+# Returned by the HTTP tier when the site needs a real browser
+ESCALATE = object()
+# Returned when the homepage is not in the page cache
+CACHE_MISS = object()
+# Queue marker: no more work for this worker
+_STOP = object()
+
+
+class CrawlFailed(Exception):
+    """The site could not be reached at all (worth retrying later)."""
+
 class AsyncDeepCrawler:
-    def __init__(self, headless: bool = True):
+    """
+    Two-tier crawler: static pages are fetched with a pooled HTTP client and only
+    JS-rendered or empty sites are escalated to a Playwright context.
+    Sites whose pages are in the page cache are not fetched at all.
+    """
+    def __init__(self, headless: bool = True, pool=None, limiter=None, fetcher=None, http_first: bool = True, cache=None):
         self.headless = headless
+        self.pool = pool or get_browser_pool()
+        self.limiter = limiter or get_rate_limiter()
+        self.fetcher = fetcher or HttpFetcher()
+        self.http_first = http_first and self.fetcher.available
+        self.cache = cache or get_page_cache()
+        self.stats = {"cache": 0, "http": 0, "browser": 0, "escalated": 0}
         
     def is_relevant_content(self, text, url):
         """
@@ -47,65 +77,14 @@ class AsyncDeepCrawler:
 
     def sanitize_address(self, address_text):
         if not address_text: return None
-        if re.search(PHONE_REGEX, address_text):
+        if CONTACTS.has_phone(address_text):
             return None
-        valid_indicators = ["pin", "zip", "road", "sector", "block", "opp", "near", "behind", "colony", "nagar", "street", "lane"]
-        if not any(ind in address_text.lower() for ind in valid_indicators):
+        if not any(ind in address_text.lower() for ind in ADDRESS_HINTS):
             return None
         return address_text
 
-    async def extract_smart_name(self, page):
-        try:
-            h1s = page.locator("h1").all()
-            for h1_handle in await h1s:
-                text = (await h1_handle.inner_text()).strip()
-                if len(text) > 3 and len(text) < 50:
-                    bad_words = ["best", "affordable", "cheap", "top", "list", "pg in", "hostel in"]
-                    if not any(w in text.lower() for w in bad_words):
-                        return text
-        except: pass
-        
-        try:
-            imgs = page.locator("img[alt*='logo'], img[class*='logo']").all()
-            for img in await imgs:
-                alt = await img.get_attribute("alt")
-                if alt and len(alt) > 3:
-                    bad_words = ["logo", "brand", "header", "image"]
-                    clean_alt = alt
-                    for w in bad_words:
-                        clean_alt = clean_alt.replace(w, "").replace(w.title(), "")
-                    clean_alt = clean_alt.strip()
-                    if len(clean_alt) > 3:
-                        return clean_alt
-        except: pass
-        
-        try:
-            title = await page.title()
-            clean_title = re.split(r"[|\-:]", title)[0].strip()
-            return clean_title
-        except: 
-            return "Unknown Entity"
-
-    async def get_priority_links(self, page, base_url):
-        priority_keywords = ["contact", "about", "reach", "location", "connect"]
-        links = []
-        try:
-            elements = await page.locator("a[href]").all()
-            domain = urlparse(base_url).netloc
-            for el in elements:
-                href = await el.get_attribute("href")
-                if not href or href.startswith("#") or "javascript" in href: continue
-                full_url = urljoin(base_url, href)
-                if urlparse(full_url).netloc != domain: continue
-                text = (await el.inner_text() or "").lower()
-                href_lower = href.lower()
-                if any(kw in href_lower or kw in text for kw in priority_keywords):
-                    links.append(full_url)
-        except: pass
-        return list(set(links))
-
-    async def sub_process_domain(self, browser, root_domain, sub_pages):
-        entity = {
+    def new_entity(self, root_domain, sub_pages):
+        return {
             "root_domain": root_domain,
             "name": "",
             "mobile": set(),
@@ -115,11 +94,135 @@ class AsyncDeepCrawler:
             "website": "https://" + root_domain, # Generic website for matching
             "source": "https://" + root_domain
         }
-        
-        context = await browser.new_context(user_agent=get_random_header())
-        
-        # --- Resource Blocking for Speed (70% Gain) ---
-        await context.route("**/*.{png,jpg,jpeg,gif,svg,css,woff,woff2,ico}", lambda route: route.abort())
+
+    def scan_text(self, entity, text):
+        """Phones, emails and the first plausible address line of one page (single pass)."""
+        found = CONTACTS.extract(text)
+        entity["mobile"].update(found.phones)
+        entity["email"].update(found.emails)
+        if not entity["address"]:
+            for line in found.address_lines:
+                sanitized = self.sanitize_address(line)
+                if sanitized:
+                    entity["address"] = sanitized
+                    break
+
+    def finish_entity(self, entity):
+        entity["mobile"] = list(entity["mobile"])
+        entity["email"] = list(entity["email"])
+        if not entity["mobile"] and not entity["email"] and not entity["address"]:
+             return None
+        return entity
+
+    def name_from_page(self, page_data):
+        """
+        Smart name from a page snapshot or parsed static HTML:
+        first clean <h1>, else logo alt text, else the <title> before any separator.
+        """
+        for text in page_data.h1s:
+            if len(text) > 3 and len(text) < 50 and not any(w in text.lower() for w in NAME_BAD_WORDS):
+                return text
+        for alt in page_data.img_alts:
+            if alt and len(alt) > 3:
+                clean_alt = alt
+                for w in LOGO_WORDS:
+                    clean_alt = clean_alt.replace(w, "").replace(w.title(), "")
+                clean_alt = clean_alt.strip()
+                if len(clean_alt) > 3:
+                    return clean_alt
+        return re.split(r"[|\-:]", page_data.title)[0].strip()
+
+    def links_from_page(self, page_data, base_url):
+        """Same-site contact/about/location links from a page snapshot or parsed static HTML."""
+        links = []
+        domain = urlparse(base_url).netloc
+        for href, text in page_data.links:
+            if href.startswith("#") or "javascript" in href: continue
+            full_url = urljoin(base_url, href)
+            if urlparse(full_url).netloc != domain: continue
+            if any(kw in href.lower() or kw in text.lower() for kw in PRIORITY_KEYWORDS):
+                links.append(full_url)
+        return list(set(links))
+
+    async def sub_process_domain(self, root_domain, sub_pages):
+        """
+        Page cache first, then the HTTP tier; Playwright only for JS-rendered sites
+        or when static HTML yields nothing. In cache-only mode uncached sites are skipped.
+        """
+        result = self.cache_process_domain(root_domain, sub_pages)
+        if result is not CACHE_MISS:
+            self.stats["cache"] += 1
+            return result
+        if self.cache.cache_only:
+            return None
+        if self.http_first:
+            result = await self.http_process_domain(root_domain, sub_pages)
+            if result is not ESCALATE:
+                self.stats["http"] += 1
+                return result
+            self.stats["escalated"] += 1
+        self.stats["browser"] += 1
+        return await self.browser_process_domain(root_domain, sub_pages)
+
+    def cache_process_domain(self, root_domain, sub_pages):
+        """Same steps as the live tiers, on the pages cached by an earlier crawl."""
+        start_url = "https://" + root_domain
+        home = self.cache.get(start_url)
+        if home is None:
+            return CACHE_MISS
+        entity = self.new_entity(root_domain, sub_pages)
+        if not self.is_relevant_content(home.text, start_url):
+            return None
+
+        entity["name"] = self.name_from_page(home)
+        self.scan_text(entity, home.text)
+        for link in self.links_from_page(home, start_url)[:4]:
+            sub = self.cache.get(link)
+            if sub is not None:
+                self.scan_text(entity, sub.text)
+        return self.finish_entity(entity)
+
+    async def http_fetch(self, url):
+        await self.limiter.wait(url)
+        return await self.fetcher.fetch(url)
+
+    async def http_process_domain(self, root_domain, sub_pages):
+        entity = self.new_entity(root_domain, sub_pages)
+        start_url = "https://" + root_domain
+        html = await self.http_fetch(start_url)
+        if html is None:
+            start_url = "http://" + root_domain
+            html = await self.http_fetch(start_url)
+        if html is None:
+            return ESCALATE
+
+        parsed = parse_html(html)
+        body_text = parsed.text
+        if looks_js_rendered(html, body_text):
+            return ESCALATE
+        self.cache.put(start_url, parsed)
+        if not self.is_relevant_content(body_text, start_url):
+            return None
+
+        entity["name"] = self.name_from_page(parsed)
+        self.scan_text(entity, body_text)
+
+        for link in self.links_from_page(parsed, start_url)[:4]:
+            sub_html = await self.http_fetch(link)
+            if sub_html:
+                sub_text = parse_html(sub_html).text
+                self.cache.put(link, sub_text)
+                self.scan_text(entity, sub_text)
+
+        entity = self.finish_entity(entity)
+        # Nothing in the static HTML: contacts may be injected by scripts
+        return ESCALATE if entity is None else entity
+
+    async def browser_process_domain(self, root_domain, sub_pages):
+        entity = self.new_entity(root_domain, sub_pages)
+
+        # Fresh context on the shared warm browser (UA rotation + resource blocking, 70% gain)
+        context = await self.pool.new_context(headless=self.headless)
         
         page = await context.new_page()
         start_url = "https://" + root_domain
@@ -128,91 +231,140 @@ class AsyncDeepCrawler:
         try:
             try:
                 # Reduced timeout to 15s as requested
+                await self.limiter.wait(start_url)
                 await page.goto(start_url, timeout=15000)
             except:
                 try: await page.goto(start_url.replace("https", "http"), timeout=10000)
-                except: 
-                    await context.close()
-                    return None
+                except Exception as e:
+                    raise CrawlFailed(f"{root_domain} unreachable: {e}")
             
             # Smart Wait instead of strict load state
             try:
                 await page.wait_for_selector("body", timeout=5000)
             except: pass
 
-            body_text = await page.locator("body").inner_text()
+            # Whole page in one round trip; heuristics run on the snapshot
+            snapshot = await take_snapshot_async(page)
+            body_text = snapshot.text
+            self.cache.put(start_url, snapshot)
             if not self.is_relevant_content(body_text, start_url):
                 await context.close()
                 return None
             
             # Name
-            entity["name"] = await self.extract_smart_name(page)
+            entity["name"] = self.name_from_page(snapshot)
             
             # Data
-            phones = set()
-            for match in re.finditer(PHONE_REGEX, body_text):
-                p = clean_phone(match.group(0))
-                if p: phones.add(p)
-            entity["mobile"].update(phones)
-            entity["email"].update(extract_emails(body_text))
-            
-            lines = body_text.split('\n')
-            for line in lines:
-                if len(line) < 150:
-                    sanitized = self.sanitize_address(line)
-                    if sanitized:
-                        entity["address"] = sanitized
-                        break
+            self.scan_text(entity, body_text)
             
-            priority = await self.get_priority_links(page, start_url)
+            priority = self.links_from_page(snapshot, start_url)
             targets.extend(priority[:4])
             
             for link in targets[1:]:
                 try:
+                    # Per-host token bucket instead of a blind sleep per subpage
+                    await self.limiter.wait(link)
                     await page.goto(link, timeout=15000)
                     try: await page.wait_for_selector("body", timeout=5000)
                     except: pass
                     
-                    random_delay(0.5, 1.5)
                     sub_text = await page.locator("body").inner_text()
-                    
-                    for match in re.finditer(PHONE_REGEX, sub_text):
-                        p = clean_phone(match.group(0))
-                        if p: entity["mobile"].update([p])
-                    entity["email"].update(extract_emails(sub_text))
-                    
-                    if not entity["address"]:
-                        for line in sub_text.split('\n'):
-                             if len(line) < 150:
-                                sanitized = self.sanitize_address(line)
-                                if sanitized:
-                                    entity["address"] = sanitized
-                                    break
+                    self.cache.put(link, sub_text)
+                    self.scan_text(entity, sub_text)
                 except: pass
                 
+        except CrawlFailed:
+            raise
         except Exception as e:
             pass
         finally:
             await context.close()
             
-        entity["mobile"] = list(entity["mobile"])
-        entity["email"] = list(entity["email"])
-        
-        if not entity["mobile"] and not entity["email"] and not entity["address"]:
-             return None
-             
-        return entity
+        return self.finish_entity(entity)
 
+    def tier_stats(self):
+        """Share of domains answered by each tier."""
+        total = self.stats["http"] + self.stats["browser"]
+        stats = dict(self.stats)
+        stats["http_hit_rate"] = self.stats["http"] / total if total else 0.0
+        return stats
 
+    def print_tier_stats(self):
+        stats = self.tier_stats()
+        if stats["cache"] or stats["http"] or stats["browser"]:
+            console.print(
+                f"[dim]Fetch tiers: {stats['cache']} from cache, {stats['http']} via HTTP ({stats['http_hit_rate']:.0%}), "
+                f"{stats['browser']} via browser ({stats['escalated']} escalated)[/dim]"
+            )
+        self.cache.print_summary()
 
-async def run_batch(urls, output_file, city=None):
-    # Initialize Manager
-    manager = MasterDataManager(output_file, city=city)
-    
-    # Load processed state
-    processed_domains = load_processed_sites()
-    
+    async def close(self):
+        await self.fetcher.close()
+
+
+
+class BatchWriter:
+    """
+    The one writer of a crawl: upserts each result into the master list, marks the
+    domain processed and saves every `save_every` results, after which the
+    checkpoint can forget them.
+    """
+    def __init__(self, manager, track_processed: bool = True, checkpoint=None, save_every: int = 10):
+        self.manager = manager
+        self.track_processed = track_processed
+        self.checkpoint = checkpoint
+        self.save_every = max(1, save_every)
+        self.finished = []
+
+    def add(self, root, entity):
+        if entity:
+            self.manager.upsert_entity(entity)
+        # Mark as processed regardless of result (we tried)
+        if self.track_processed:
+            mark_as_processed(root)
+        self.finished.append(root)
+        if len(self.finished) >= self.save_every:
+            self.save()
+
+    def save(self):
+        # Master list + processed log (one append), then the checkpoint
+        self.manager.save_master()
+        if self.track_processed:
+            flush_processed_sites()
+        if self.checkpoint is not None and self.finished:
+            self.checkpoint.mark_saved(self.finished)
+        self.finished = []
+
+
+def replay_unsaved(checkpoint, writer):
+    """Writes results a dead run had crawled but not saved. Returns how many."""
+    unsaved = checkpoint.unsaved()
+    for root, entity in unsaved:
+        writer.add(root, entity)
+    writer.save()
+    if unsaved:
+        console.print(f"[yellow]Checkpoint: saved {len(unsaved)} results of the interrupted run.[/yellow]")
+    return len(unsaved)
+
+
+def plan_domains(urls, processed_domains, checkpoint=None):
+    """
+    {root domain: [urls]} still to crawl: unfinished domains of the checkpoint
+    first, then the new roots behind `urls`. Queues them in the checkpoint.
+    """
     domain_map = {}
+    if checkpoint is not None:
+        recovered = checkpoint.recover()
+        resumed = checkpoint.unfinished()
+        done_elsewhere = [root for root in resumed if root in processed_domains]
+        for root in done_elsewhere:
+            checkpoint.finish(root, None)
+        checkpoint.mark_saved(done_elsewhere)
+        domain_map = {root: pages for root, pages in resumed.items() if root not in processed_domains}
+        if domain_map:
+            console.print(f"[yellow]Resuming {len(domain_map)} unfinished domains ({recovered} were in flight).[/yellow]")
+    resumed_count = len(domain_map)
+
     for u in urls:
         if not u.startswith("http"): u = "https://" + u
         parsed = urlparse(u)
@@ -225,74 +377,296 @@ async def run_batch(urls, output_file, city=None):
             
         if root not in domain_map:
             domain_map[root] = []
-        domain_map[root].append(u)
+        if u not in domain_map[root]:
+            domain_map[root].append(u)
         
-    console.print(f"[bold]Identified {len(domain_map)} unique entities to process (Skipped {len(urls) - len(domain_map)}).[/bold]")
+    new_count = len(domain_map) - resumed_count
+    console.print(f"[bold]Identified {len(domain_map)} unique entities to process (Skipped {len(urls) - new_count}).[/bold]")
+    if checkpoint is not None and domain_map:
+        checkpoint.enqueue(domain_map)
+    return domain_map
+
+
+async def crawl_pool(domain_map, crawler, emit, concurrency: int = 5, checkpoint=None, politeness=None):
+    """
+    Crawls every domain of `domain_map` with `concurrency` workers pulling from one
+    queue (a slow site only holds its own worker) and awaits emit(root, entity)
+    as soon as a domain is finished; entity is None for skipped or failed sites.
+    Unreachable sites are requeued after the checkpoint's backoff.
+    """
+    if not domain_map:
+        return
+    queue = asyncio.Queue()
+    for root in domain_map:
+        queue.put_nowait(root)
+    remaining = len(domain_map)
+    retries = []
+    workers = []
+
+    async def visit(root):
+        if politeness is None:
+            # Each domain gets its own context on the pool's warm browser
+            return await crawler.sub_process_domain(root, domain_map[root])
+        if not politeness.claim(root):
+            # Another concurrent query is already crawling this site
+            return None
+        async with politeness.slot(root):
+            return await crawler.sub_process_domain(root, domain_map[root])
+
+    async def crawl(root):
+        """(entity, retry_delay); retry_delay is only set when the domain is due for a retry."""
+        if checkpoint is not None:
+            # Backoff of a failed attempt from an earlier run
+            await asyncio.sleep(checkpoint.wait_time(root))
+            checkpoint.start(root)
+        try:
+            entity = await visit(root)
+        except Exception as e:
+            delay = checkpoint.fail(root, e) if checkpoint is not None else None
+            if delay is None:
+                console.print(f"[dim red]Crawl failed for {root}: {e}[/dim red]")
+                return (None, None)
+            console.print(f"[dim yellow]Crawl failed for {root} ({e}), retrying in {delay:.0f}s[/dim yellow]")
+            return (None, delay)
+        if checkpoint is not None:
+            checkpoint.finish(root, entity)
+        return (entity, None)
+
+    async def requeue(root, delay):
+        # Waits out the backoff without holding a worker
+        await asyncio.sleep(delay)
+        await queue.put(root)
+
+    async def work():
+        nonlocal remaining
+        while True:
+            root = await queue.get()
+            if root is _STOP:
+                return
+            entity, delay = await crawl(root)
+            if delay is not None:
+                retries.append(asyncio.create_task(requeue(root, delay)))
+                continue
+            await emit(root, entity)
+            remaining -= 1
+            if remaining == 0:
+                for _ in workers:
+                    queue.put_nowait(_STOP)
+
+    workers = [asyncio.create_task(work()) for _ in range(max(1, concurrency))]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers + retries:
+            task.cancel()
+        await asyncio.gather(*workers, *retries, return_exceptions=True)
+
+
+async def crawl_shared(work_queue, crawler, concurrency: int = 5, holder: str = None,
+                       poll_interval: float = WORK_QUEUE_POLL_INTERVAL):
+    """
+    Crawls root domains leased from a shared WorkQueue until every domain is
+    finished, completing each lease with the entity (the queue's result store).
+    Failed sites are released with backoff for whichever box leases them next;
+    idle workers keep polling (at most `poll_interval` apart) while domains are
+    leased or waiting out a delay.
+    Returns the number of domains completed.
+    """
+    holder = holder or default_holder()
+    crawled = 0
+
+    async def work(keeper):
+        nonlocal crawled
+        while True:
+            leases = await asyncio.to_thread(work_queue.lease, holder, 1)
+            if not leases:
+                wake_at = await asyncio.to_thread(work_queue.next_visible)
+                if wake_at is None:
+                    return
+                # A retry waiting out its backoff, or a lease that may still expire (box died)
+                await asyncio.sleep(min(poll_interval, max(0.05, wake_at - time.time())))
+                continue
+            lease = leases[0]
+            keeper.add(lease)
+            try:
+                entity = await crawler.sub_process_domain(lease.item, lease.payload or [])
+            except Exception as e:
+                console.print(f"[dim red]Crawl failed for {lease.item}: {e}[/dim red]")
+                delay = min(CRAWL_RETRY_MAX_DELAY, CRAWL_RETRY_BACKOFF * 2 ** (lease.attempts - 1))
+                await asyncio.to_thread(work_queue.release, lease, e, delay)
+            else:
+                if await asyncio.to_thread(work_queue.complete, lease, entity):
+                    crawled += 1
+            finally:
+                keeper.discard(lease)
+
+    with LeaseKeeper(work_queue) as keeper:
+        await asyncio.gather(*[work(keeper) for _ in range(max(1, concurrency))])
+    return crawled
+
+
+async def run_shared_batch(urls, work_queue, concurrency: int = 5, crawler=None):
+    """
+    run_batch for several boxes: the roots behind `urls` are added to the shared
+    domain queue (each only once across all boxes), then this box crawls whatever
+    is queued. Entities stay in the queue's result store until `collect`.
+    """
+    added = await asyncio.to_thread(work_queue.put, plan_domains(urls, set()))
+    console.print(f"[bold]Added {added} new domains to the shared queue '{work_queue.name}'.[/bold]")
+    owns_crawler = crawler is None
+    if owns_crawler:
+        crawler = AsyncDeepCrawler(headless=True)
+    try:
+        crawled = await crawl_shared(work_queue, crawler, concurrency)
+    finally:
+        if owns_crawler:
+            await crawler.close()
+    console.print(f"[bold green]Crawled {crawled} domains from the shared queue.[/bold green]")
+    crawler.print_tier_stats()
+    work_queue.print_summary()
+    return crawled
+
+
+def collect_shared(work_queues, output_file: str, city: str = None, storage: str = "journal"):
+    """
+    Upserts every entity in the shared result stores (crawled domains, Maps
+    places) into the local master list (the one writer).
+    """
+    manager = MasterDataManager(output_file, city=city, storage=storage)
+    leads = 0
+    try:
+        for work_queue in work_queues:
+            for item, entity in work_queue.results().items():
+                if entity and "Skipped" not in manager.upsert_entity(entity):
+                    leads += 1
+    finally:
+        manager.close()
+    return leads
+
+
+async def run_batch(urls, output_file, city=None, storage="journal", manager=None, politeness=None,
+                    track_processed: bool = True, checkpoint=None, concurrency: int = 5, save_every: int = 10,
+                    crawler=None, work_queue=None):
+    """
+    Deep-crawls the root domains behind `urls` and upserts them into the master list.
+
+    `concurrency` workers pull domains from a queue, so that many crawls are in
+    flight at all times; results are upserted as they finish and saved every
+    `save_every` domains. `manager` / `politeness` / `crawler` can be shared with
+    the caller, who then owns closing them.
+
+    Every domain is checkpointed on its own (core/checkpoint.py): a rerun after a
+    crash saves the results the dead run had not written yet, crawls the domains it
+    left queued or in flight, and unreachable sites are retried with backoff.
+    With track_processed=False neither the processed-sites log nor the checkpoint
+    is used (cache-only replays re-parse every site).
+
+    With a shared `work_queue` (core/work_queue.py) the domains are crawled by
+    every box pulling from it instead, see run_shared_batch.
+    """
+    if work_queue is not None:
+        return await run_shared_batch(urls, work_queue, concurrency, crawler)
+    # Initialize Manager
+    owns_manager = manager is None
+    if owns_manager:
+        manager = MasterDataManager(output_file, city=city, storage=storage)
+    checkpoint = (checkpoint or get_crawl_checkpoint()) if track_processed else None
+    writer = BatchWriter(manager, track_processed, checkpoint, save_every)
+    
+    # Load processed state
+    processed_domains = load_processed_sites() if track_processed else set()
+    if checkpoint is not None:
+        replay_unsaved(checkpoint, writer)
+    domain_map = plan_domains(urls, processed_domains, checkpoint)
     
     if not domain_map:
         console.print("[green]All entities already processed![/green]")
         return
 
-    crawler = AsyncDeepCrawler(headless=True)
-    roots_to_process = list(domain_map.keys())
-    
-    async with async_playwright() as p:
-        # Launch options for speed
-        browser = await p.chromium.launch(
-            headless=True,
-            args=["--disable-gpu", "--disable-dev-shm-usage", "--no-sandbox"]
-        )
-        
-        # User requested Semaphore limit = 5 for 5x speed
-        sem = asyncio.Semaphore(5)
-        
-        async def sem_task(root):
-            async with sem:
-                # Add resource blocking at context level within sub_process_domain?
-                # Actually sub_process_domain creates its own context.
-                # We should update sub_process_domain to block resources.
-                result = await crawler.sub_process_domain(browser, root, domain_map[root])
-                return (root, result)
-        
-        batch_size = 10
-        total = len(roots_to_process)
-        
-        try:
-            with tqdm(total=total, desc="Analyzing Entities (Parallel)") as pbar:
-                for i in range(0, total, batch_size):
-                    batch_roots = roots_to_process[i:i+batch_size]
-                    coroutines = [sem_task(r) for r in batch_roots]
-                    batch_results = await asyncio.gather(*coroutines)
-                    
-                    # Upsert Results
-                    valid_count = 0
-                    for root, entity in batch_results:
-                        if entity:
-                            status = manager.upsert_entity(entity)
-                            if "Skipped" not in status:
-                                valid_count += 1
-                        
-                        # Mark as processed regardless of result (we tried)
-                        mark_as_processed(root)
-                    
-                    # Save
-                    manager.save_master()
-                    pbar.update(len(batch_roots))
-        except KeyboardInterrupt:
-            console.print("\n[bold red]Interrupted! Saving progress...[/bold red]")
-        finally:
+    owns_crawler = crawler is None
+    if owns_crawler:
+        crawler = AsyncDeepCrawler(headless=True)
+    results = asyncio.Queue(maxsize=max(1, concurrency) * 2)
+
+    async def emit(root, entity):
+        await results.put((root, entity))
+
+    async def write(pbar):
+        for _ in range(len(domain_map)):
+            root, entity = await results.get()
+            writer.add(root, entity)
+            pbar.update(1)
+        writer.save()
+
+    tasks = []
+    try:
+        with tqdm(total=len(domain_map), desc="Analyzing Entities (Parallel)") as pbar:
+            tasks = [
+                asyncio.create_task(crawl_pool(domain_map, crawler, emit, concurrency, checkpoint, politeness)),
+                asyncio.create_task(write(pbar)),
+            ]
+            await asyncio.gather(*tasks)
+    except KeyboardInterrupt:
+        console.print("\n[bold red]Interrupted! Saving progress...[/bold red]")
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if owns_crawler:
+            await crawler.close()
+        if track_processed:
+            flush_processed_sites()
+        if checkpoint is not None:
+            # Domains still in flight are picked up by the next run
+            checkpoint.release()
+        if owns_manager:
+            manager.close()
+        else:
             manager.save_master()
-            await browser.close()
             
     console.print(f"[bold green]Entity Analysis Complete. Master List Updated.[/bold green]")
+    crawler.print_tier_stats()
+    if checkpoint is not None:
+        checkpoint.print_summary()
+    if owns_manager:
+        get_rate_limiter().print_summary()
 
-def process_deep_study(input_file: str, output_file: str, city: str = None):
+def process_deep_study(input_file: str, output_file: str, city: str = None, storage: str = "journal",
+                       cache_only: bool = False, concurrency: int = 5, shards: int = 1, work_queue: str = None):
+    """
+    Deep Study of the URLs in `input_file`. With shards > 1 the domains are split
+    across that many crawler processes (see sharding.py), `concurrency` each.
+    With a `work_queue` URL the domains are shared with other boxes; a box without
+    the input file just helps with the queued domains.
+    """
+    if work_queue:
+        from src.core.work_queue import open_work_queue
+        urls = []
+        if input_file and os.path.exists(input_file):
+            with open(input_file, "r") as f:
+                urls = json.load(f)
+        domains = open_work_queue(work_queue, "domains")
+        try:
+            get_browser_pool().run(run_batch(urls, output_file, concurrency=concurrency, work_queue=domains))
+        finally:
+            domains.close()
+        return
     if not os.path.exists(input_file):
         print("Input not found")
         return
     with open(input_file, "r") as f:
         urls = json.load(f)
-    asyncio.run(run_batch(urls, output_file, city=city))
+    if shards > 1:
+        from src.scrapers.core.sharding import run_sharded
+        run_sharded(urls, output_file, city=city, storage=storage, shards=shards, concurrency=concurrency,
+                    track_processed=not cache_only, cache_only=cache_only)
+        return
+    if cache_only:
+        # Offline replay: pages come from the page cache, nothing is fetched
+        get_page_cache().cache_only = True
+    # Pool loop instead of asyncio.run(): keeps the browser warm across calls
+    get_browser_pool().run(run_batch(urls, output_file, city=city, storage=storage, track_processed=not cache_only,
+                                     concurrency=concurrency))
 
 # Bridge Alias
 deep_study_site = process_deep_study
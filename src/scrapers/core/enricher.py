@@ -8,7 +8,9 @@ from src.core.utils import get_random_header, random_delay, normalize_url
 from src.scrapers.engines.google_maps import search_google_maps
 from src.scrapers.engines.brave import search_brave
 from src.scrapers.engines.bing import search_bing
-from src.scrapers.core.listing import extract_pg_data, clean_phone, PHONE_REGEX
+from src.scrapers.core.listing import extract_pg_data
+from src.core.contacts import clean_phone
+from src.scrapers.core.browser_pool import get_browser_pool
 
 console = Console()
 
@@ -106,10 +108,12 @@ def enrich_data(input_file: str, output_file: str = None):
         
         try:
             search_q = f"{query} contact number"
-            urls = search_brave(search_q, limit=3, headless=True)
+            # Async engines run on the pool loop so the browser stays warm across rows
+            pool = get_browser_pool()
+            urls = pool.run(search_brave(search_q, limit=3, headless=True))
             if not urls:
                  # Fallback to Bing
-                 urls = search_bing(search_q, limit=3, headless=True)
+                 urls = pool.run(search_bing(search_q, limit=3, headless=True))
             
             if urls:
                 # Visit top result
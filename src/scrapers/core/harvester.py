@@ -3,9 +3,9 @@ import json
 import os
 import re
 import time
-from playwright.sync_api import sync_playwright
 from rich.console import Console
-from src.core.utils import get_random_header, random_delay
+from src.core.utils import random_delay
+from src.scrapers.core.browser_pool import get_sync_browser_pool
 
 console = Console()
 
@@ -115,9 +115,8 @@ class LocationHarvester:
             "Industrial Estates"
         ]
         
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(user_agent=get_random_header())
+        context = get_sync_browser_pool().new_context(headless=True)
+        try:
             page = context.new_page()
             
             for cat in categories:
@@ -125,8 +124,8 @@ class LocationHarvester:
                     self._scrape_category(page, cat)
                 except Exception as e:
                     console.print(f"[red]Error scraping {cat}: {e}[/red]")
-                    
-            browser.close()
+        finally:
+            context.close()
             
         self.save()
         
@@ -0,0 +1,163 @@
+import asyncio
+from html.parser import HTMLParser
+from rich.console import Console
+from src.core.utils import get_random_header
+from src.core.config import HTTP_FETCH_TIMEOUT, HTTP_MAX_CONNECTIONS
+
+console = Console()
+
+# Markers of client-side rendered shells (React/Vue/Next/Angular, Wix, "enable JavaScript" notices)
+JS_SHELL_MARKERS = [
+    'id="root"></div>', 'id="app"></div>', 'id="__next"', "ng-version", "enable javascript",
+    "javascript is required", "wix.com", "window.__nuxt__",
+]
+# Below this much visible text a page is treated as not rendered yet
+MIN_STATIC_TEXT = 200
+
+BLOCK_TAGS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article",
+              "header", "footer", "address", "td", "th", "ul", "ol", "table", "form", "nav"}
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg"}
+
+
+class PageParser(HTMLParser):
+    """
+    Stdlib HTML parser collecting what the deep crawler reads from a rendered page:
+    visible text (one line per block), <h1> texts, <title>, logo alts and links.
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.h1s = []
+        self.title = ""
+        self.img_alts = []
+        self.links = []        # (href, anchor text)
+        self.skip_depth = 0
+        self.in_title = False
+        self.h1_buf = None
+        self.link_stack = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == "title":
+            self.in_title = True
+        elif tag == "h1":
+            self.h1_buf = []
+        elif tag == "a":
+            self.link_stack.append([attrs.get("href"), []])
+        elif tag == "img":
+            alt = attrs.get("alt") or ""
+            if "logo" in alt.lower() or "logo" in (attrs.get("class") or "").lower():
+                self.img_alts.append(alt)
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag == "title":
+            self.in_title = False
+        elif tag == "h1" and self.h1_buf is not None:
+            self.h1s.append(" ".join("".join(self.h1_buf).split()))
+            self.h1_buf = None
+        elif tag == "a" and self.link_stack:
+            href, text = self.link_stack.pop()
+            if href:
+                self.links.append((href, "".join(text).strip()))
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if self.in_title:
+            self.title += data
+            return
+        if self.skip_depth:
+            return
+        self.parts.append(data)
+        if self.h1_buf is not None:
+            self.h1_buf.append(data)
+        for _, text in self.link_stack:
+            text.append(data)
+
+    @property
+    def text(self):
+        lines = (" ".join(line.split()) for line in "".join(self.parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+
+def parse_html(html):
+    parser = PageParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass
+    return parser
+
+
+def looks_js_rendered(html, text):
+    """True when the static HTML is an app shell the browser has to render first."""
+    if len(text) < MIN_STATIC_TEXT:
+        return True
+    lower = html.lower()
+    return any(marker in lower for marker in JS_SHELL_MARKERS)
+
+
+class HttpFetcher:
+    """
+    Pooled async HTTP client for the crawler's fast tier (keep-alive, connection reuse).
+
+    Without httpx installed `available` is False and every page goes straight
+    to Playwright (warned about once per process). One client per event loop,
+    created lazily.
+    """
+    warned_unavailable = False
+
+    def __init__(self, timeout: float = HTTP_FETCH_TIMEOUT, max_connections: int = HTTP_MAX_CONNECTIONS):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.client = None
+        self.loop = None
+        try:
+            import httpx
+            self.httpx = httpx
+        except ImportError:
+            self.httpx = None
+            if not HttpFetcher.warned_unavailable:
+                HttpFetcher.warned_unavailable = True
+                console.print("[yellow]httpx is not installed: the HTTP-first tier is off and every page is loaded in Chromium (pip install httpx).[/yellow]")
+
+    @property
+    def available(self):
+        return self.httpx is not None
+
+    def get_client(self):
+        loop = asyncio.get_running_loop()
+        if self.client is None or self.loop is not loop:
+            self.loop = loop
+            self.client = self.httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": get_random_header(), "Accept": "text/html,application/xhtml+xml"},
+                limits=self.httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            )
+        return self.client
+
+    async def fetch(self, url):
+        """Returns the HTML of an OK text/html response, else None."""
+        try:
+            response = await self.get_client().get(url)
+        except Exception:
+            return None
+        if response.status_code >= 400:
+            return None
+        if "html" not in response.headers.get("content-type", "html"):
+            return None
+        return response.text
+
+    async def close(self):
+        if self.client is not None:
+            try: await self.client.aclose()
+            except: pass
+            self.client = None
@@ -1,39 +1,34 @@
-import re
+import asyncio
 import json
 import time
 import os
-from playwright.sync_api import sync_playwright
 from rich.console import Console
-from src.core.utils import get_random_header, random_delay
+from src.core.utils import random_delay
+from src.core.rate_limit import get_rate_limiter
+from src.core.contacts import CONTACTS, PINCODE_RE, clean_phone
+from src.core.config import LISTING_DETAIL_CONCURRENCY
+from src.core.processed import ProcessedSites
+from src.core.storage import JsonStore
+from src.scrapers.core.browser_pool import get_browser_pool, get_sync_browser_pool
+from src.scrapers.core.snapshot import take_snapshot, take_snapshot_async
+from src.scrapers.core.page_cache import get_page_cache
 
 console = Console()
 
-# Regex Patterns
-# regex for 10-13 digit numbers, likely mobiles
-# Matches: +91 9999999999, 99999 99999, 09999999999, 999-999-9999
-PHONE_REGEX = r"(?:\+91|91|0)?\s?[\-]?\s?([6-9][0-9\s\-]{8,13})"
-PINCODE_REGEX = r"\b\d{6}\b"
-EMAIL_REGEX = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+# Regex Patterns (phone/pincode/email now live in src/core/contacts.py, compiled once)
 PRICE_REGEX = r"(₹|Rs\.?)\s?(\d{1,2}(,\d{2})*(,\d{3})*)"
-
-def clean_phone(phone_str):
-    """Normalize phone string to 10 digits"""
-    if not phone_str: return None
-    # Remove all non-digits
-    digits = re.sub(r"\D", "", phone_str)
-    
-    # Handle country codes
-    if len(digits) > 10:
-        if digits.startswith("91"):
-            digits = digits[2:]
-        elif digits.startswith("0") and len(digits) == 11:
-             digits = digits[1:]
-             
-    return digits if len(digits) == 10 else None
+# Card lines mentioning one of these (case-sensitive) count as an address
+CARD_ADDRESS_WORDS = ["Sector", "Road", "Opp", "Near"]
+# Repeating elements that look like property cards
+CARD_SELECTORS = [
+    "div[class*='card']", "div[class*='listing']", "div[class*='property']", 
+    "div[class*='result']", "article", "div[shadow]", "li.list-item",
+    ".srpTuple__tuple" # 99acres specific
+]
 
 def extract_emails(text):
     """Extracts unique emails from text"""
-    return set(re.findall(EMAIL_REGEX, text))
+    return CONTACTS.emails(text)
 
 def extract_meta_data(page):
     """Extracts description and other meta tags"""
@@ -45,19 +40,21 @@ def extract_meta_data(page):
     except: pass
     return text
 
+def tel_link_phones(hrefs):
+    """Numbers from tel: hrefs collected by a page snapshot"""
+    phones = set()
+    for href in hrefs:
+        p = clean_phone(href.replace("tel:", ""))
+        if p: phones.add(p)
+    return phones
+
 def extract_tel_links(container):
     """Extracts numbers from href='tel:...' attributes"""
-    phones = set()
     try:
-        links = container.locator("a[href^='tel:']").all()
-        for link in links:
-            href = link.get_attribute("href")
-            if href:
-                p = clean_phone(href.replace("tel:", ""))
-                if p: phones.add(p)
+        hrefs = [link.get_attribute("href") for link in container.locator("a[href^='tel:']").all()]
+        return tel_link_phones(h for h in hrefs if h)
     except:
-        pass
-    return phones
+        return set()
 
 def reveal_contacts(page):
     """Try to click 'Show Number' or similar buttons"""
@@ -132,296 +129,683 @@ def handle_blocking_elements(page):
         
     return interacted, captcha_found
 
+def page_contacts(snapshot, extra_text=""):
+    """Phones (body text + tel: links) and emails of one page snapshot"""
+    found = CONTACTS.extract(snapshot.text + " " + extra_text + " " + snapshot.meta_description)
+    phones = set(found.phones)
+    phones.update(tel_link_phones(snapshot.tel_links))
+    return phones, set(found.emails)
+
+def contact_page_link(snapshot):
+    """First link to a Contact/About page, in page order"""
+    for href, text in snapshot.links:
+        if "contact" in href or "about" in href or "contact us" in text.lower():
+            return href
+    return None
+
+def parse_card(url, card):
+    """Name, contacts, address and absolute detail URL of one listing card"""
+    card_text = card["text"]
+    
+    name = "Unknown Listing"
+    detail_url = None
+    
+    if card["heading"] is not None:
+        name = card["heading"]
+        # Link in heading, else the card's first link
+        detail_url = card["heading_href"] or card["first_href"]
+    
+    # Normalize URL
+    if detail_url and not detail_url.startswith("http"):
+        # Handle relative URLs
+        base_domain = "/".join(url.split("/")[:3]) # https://example.com
+        if detail_url.startswith("/"):
+            detail_url = base_domain + detail_url
+        else:
+            detail_url = base_domain + "/" + detail_url
+
+    # Phones, emails and address candidates in one pass
+    card_contacts = CONTACTS.extract(card_text)
+    phones = set(card_contacts.phones)
+    phones.update(tel_link_phones(card["tel_links"]))
+    
+    emails = set(card_contacts.emails)
+        
+    address = "Not Found"
+    for line in card_contacts.address_lines:
+        if PINCODE_RE.search(line) or any(w in line for w in CARD_ADDRESS_WORDS):
+            if len(line) > 15:
+                address = line.strip()
+                break
+    return {"name": name, "phones": phones, "emails": emails, "address": address, "detail_url": detail_url}
+
+def needs_detail(parsed):
+    """DEEP CRAWL LOGIC: no contact info but a link to visit"""
+    return not parsed["phones"] and not parsed["emails"] and parsed["detail_url"]
+
+def card_record(url, parsed, detail=None):
+    """Listing record of a parsed card (completed from its detail snapshot), or None if it has nothing"""
+    phones, emails = parsed["phones"], parsed["emails"]
+    if detail is not None:
+        detail_phones, detail_emails = page_contacts(detail)
+        phones.update(detail_phones)
+        emails.update(detail_emails)
+    name, address, detail_url = parsed["name"], parsed["address"], parsed["detail_url"]
+    if phones or emails or (address != "Not Found" and name != "Unknown Listing"):
+        return {
+            "name": name,
+            "mobile": list(phones),
+            "email": list(emails),
+            "address": address,
+            "source": detail_url if detail_url else url,
+            "type": "Aggregator Listing"
+        }
+    return None
+
+def detail_urls(parsed_cards):
+    """Detail pages the cards need, each once, in card order"""
+    return list(dict.fromkeys(p["detail_url"] for p in parsed_cards if needs_detail(p)))
+
+def card_records(url, parsed_cards, details):
+    """Records of the parsed cards, completed from `details` ({detail_url: snapshot or None})"""
+    results = []
+    for parsed in parsed_cards:
+        detail = details.get(parsed["detail_url"]) if needs_detail(parsed) else None
+        record = card_record(url, parsed, detail)
+        if record is not None:
+            results.append(record)
+    return results
+
+def card_results(url, snapshot, fetch_details):
+    """
+    Strategy 1: one record per listing card of the snapshot.
+    Cards without contacts are completed from their detail page: the detail URLs are
+    collected first and fetched together via fetch_details(urls) -> {url: snapshot or None}.
+    """
+    parsed_cards = [parse_card(url, card) for card in snapshot.cards]
+    return card_records(url, parsed_cards, fetch_details(detail_urls(parsed_cards)))
+
+def direct_site_result(url, snapshot, phones, emails):
+    """Strategy 2 record: the whole page is one entity"""
+    address = "Not Found"
+    for line in snapshot.text.split('\n'):
+        if PINCODE_RE.search(line):
+            address = line.strip()
+            break
+    return {
+        "name": snapshot.title.strip(),
+        "mobile": list(phones),
+        "email": list(emails),
+        "address": address,
+        "source": url,
+        "type": "Direct Site"
+    }
+
+def extract_from_cache(url, cache):
+    """
+    extract_pg_data on cached pages only. None when the page is not cached
+    (or was cached by the deep crawler, which does not look for cards).
+    """
+    snapshot = cache.get(url)
+    if snapshot is None or not snapshot.scanned_cards:
+        return None
+    if snapshot.cards:
+        return card_results(url, snapshot, lambda urls: {u: cache.get(u) for u in urls})
+
+    phones, emails = page_contacts(snapshot, snapshot.title.strip())
+    if not phones and not emails:
+        contact = cache.get(contact_page_link(snapshot))
+        if contact is not None:
+            contact_phones, contact_emails = page_contacts(contact)
+            phones.update(contact_phones)
+            emails.update(contact_emails)
+    return [direct_site_result(url, snapshot, phones, emails)]
+
 def extract_pg_data(url: str, headless: bool = True):
     """
     Universal List Scraper.
     Attempts to find 'cards' or 'listings' on a page and extract data from each.
     """
+    # Pages fetched on an earlier run are replayed from the page cache
+    cache = get_page_cache()
+    cached = extract_from_cache(url, cache)
+    if cached is not None:
+        return cached
+    if cache.cache_only:
+        return []
+
     results = []
     
-    with sync_playwright() as p:
-        try:
-            browser = p.chromium.launch(headless=headless)
-            context = browser.new_context(user_agent=get_random_header())
-            page = context.new_page()
+    context = None
+
+    def fetch_details(detail_urls):
+        """
+        Snapshots of a listing's detail pages: cache first, then LISTING_DETAIL_CONCURRENCY
+        tabs of the same context at a time. Navigations are started with wait_until="commit"
+        and only then awaited, so the tabs load side by side on the sync API.
+        """
+        details = {u: cache.get(u) for u in detail_urls}
+        missing = [u for u in detail_urls if details[u] is None]
+        for start in range(0, len(missing), LISTING_DETAIL_CONCURRENCY):
+            tabs = []
+            for detail_url in missing[start:start + LISTING_DETAIL_CONCURRENCY]:
+                new_page = None
+                try:
+                    new_page = context.new_page()
+                    # Be nice: per-host budget instead of a fixed pause
+                    get_rate_limiter().acquire(detail_url)
+                    new_page.goto(detail_url, timeout=30000, wait_until="commit")
+                    tabs.append((detail_url, new_page))
+                except:
+                    if new_page is not None:
+                        try: new_page.close()
+                        except: pass
+            for detail_url, new_page in tabs:
+                try:
+                    new_page.wait_for_load_state("load", timeout=30000)
+                    # Handle blocks/clicks on detail page
+                    handle_blocking_elements(new_page)
+                    reveal_contacts(new_page)
+                    details[detail_url] = take_snapshot(new_page)
+                    cache.put(detail_url, details[detail_url])
+                except:
+                    pass
+                finally:
+                    try: new_page.close()
+                    except: pass
+        return details
+
+    try:
+        # Warm shared browser, fresh context (UA rotation)
+        context = get_sync_browser_pool().new_context(headless=headless)
+        page = context.new_page()
+        
+        # --- 3-Try Logic ---
+        for attempt in range(1, 4):
+            if attempt > 1:
+                 console.print(f"   [yellow]Attempt {attempt}: Retrying extraction...[/yellow]")
+
+            try:
+                # Navigate if first attempt OR if page is blank/failed previous load
+                if attempt == 1 or page.url == "about:blank":
+                     page.goto(url, timeout=45000)
+                
+                # Wait for load
+                random_delay(1, 2)
+
+                # Handle Blocks/Overlays BEFORE extraction
+                interacted, captcha = handle_blocking_elements(page)
+                if captcha:
+                    return []
+                if interacted:
+                    # If we closed something, maybe wait a bit/scroll again
+                    time.sleep(1)
+
+                # Scroll to load dynamic lists
+                for _ in range(3):
+                    page.evaluate("window.scrollBy(0, 1000)")
+                    time.sleep(0.5)
+
+                # Post-Scroll Block Check (Some popups appear on scroll)
+                interacted, captcha = handle_blocking_elements(page)
+                if captcha:
+                    return []
+                if interacted:
+                    time.sleep(1)
+
+            except:
+                if attempt == 3:
+                    return []
+                continue
+            
+            # Double check before clicking reveal
+            interacted, captcha = handle_blocking_elements(page)
+            if captcha:
+                return []
+            
+            # CLICK TO REVEAL
+            reveal_contacts(page)
+            
+            # Body, title, meta, tel: links and cards in a single evaluate()
+            snapshot = take_snapshot(page, CARD_SELECTORS)
+            cache.put(url, snapshot)
+
+            # --- Strategy 1: Smart Card Detection ---
+            results = card_results(url, snapshot, fetch_details)
+            
+            # --- Strategy 2: Whole Page Fallback (Direct Site) ---
+            if not results and not snapshot.cards:
+                unique_phones, unique_emails = page_contacts(snapshot, snapshot.title.strip())
+
+                # If no phones, try Contact button then retry scraping phones
+                if not unique_phones:
+                    try:
+                        # 1. Click Reveal Buttons on current page
+                        contact_btn = page.locator("a:has-text('Contact'), a:has-text('Call'), a:has-text('Reach Us')").first
+                        if contact_btn.is_visible():
+                             contact_btn.click(timeout=3000)
+                             time.sleep(2)
+                             # Re-grab content (and cache the revealed page instead)
+                             snapshot = take_snapshot(page, CARD_SELECTORS)
+                             cache.put(url, snapshot)
+                             revealed_phones, revealed_emails = page_contacts(snapshot)
+                             unique_phones.update(revealed_phones)
+                             unique_emails.update(revealed_emails)
+                        
+                        # 2. DEEP CRAWL: Visit "Contact Us" page if still no data
+                        if not unique_phones and not unique_emails:
+                            href = contact_page_link(snapshot)
+                            if href:
+                                # console.print(f"   [dim]Visiting Contact Page: {href}...[/dim]")
+                                page.goto(href, timeout=30000) # Navigate main page
+                                time.sleep(2)
+                                
+                                c_page = take_snapshot(page)
+                                cache.put(href, c_page)
+                                contact_phones, contact_emails = page_contacts(c_page)
+                                unique_phones.update(contact_phones)
+                                unique_emails.update(contact_emails)
+
+                    except: pass
+                
+                results.append(direct_site_result(url, snapshot, unique_phones, unique_emails))
+
+            # If we found data, break the retry loop
+            # Check validation: at least 1 valid result with some data?
+            valid_data_found = False
+            if len(results) > 0:
+                for r in results:
+                    if r['mobile'] or r['address'] != "Not Found":
+                        valid_data_found = True
+                        break
             
+            if valid_data_found:
+                break
+            else:
+                # If we are on the last attempt, don't clear results, just return what we have (even if empty/poor)
+                if attempt < 3:
+                    interacted, captcha = handle_blocking_elements(page) # Try harder to clear blocks
+                    if captcha:
+                        return []
+                    time.sleep(2)
+
+        return results
+        
+    except Exception as e:
+        # console.print(f"[red]Error {url}: {e}[/red]")
+        return []
+    finally:
+        if context is not None:
+            try: context.close()
+            except: pass
+
+# --- Async port: many URLs on one warm browser ---
+# extract_pg_data opens one page at a time and sleeps between every step, so a
+# URL list is processed strictly one after the other. The coroutines below keep
+# the same card detection / whole-page fallback and 3-try logic, but wait with
+# asyncio (and on the page's load state) so `concurrency` URLs share one browser.
+
+async def reveal_contacts_async(page):
+    """Async twin of reveal_contacts"""
+    try:
+        keywords = ["Show Number", "View Phone", "View Contact", "Call Now", "Show Contact"]
+        for kw in keywords:
+            buttons = await page.locator(f"button:has-text('{kw}'), a:has-text('{kw}'), span:has-text('{kw}')").all()
+            for btn in buttons[:5]: # Click max 5 to save time/avoid bans
+                if await btn.is_visible():
+                    try:
+                        await btn.click(timeout=1000)
+                        await asyncio.sleep(0.5)
+                    except:
+                        pass
+    except:
+        pass
+
+async def handle_blocking_elements_async(page):
+    """Async twin of handle_blocking_elements: (interacted, captcha_found)"""
+    interacted = False
+    captcha_found = False
+    try:
+        blocking_selectors = [
+            "button:has-text('Ok, understood')",
+            "button:has-text('Accept')",
+            "button:has-text('Allow')",
+            "button:has-text('Continue')",
+            "div[class*='overlay'] button",
+            "div[id*='modal'] button",
+            ".close-btn",
+            "span:has-text('Close')"
+        ]
+        for selector in blocking_selectors:
+            element = page.locator(selector).first
+            if await element.is_visible():
+                await element.click(timeout=1000)
+                await asyncio.sleep(1) # Wait for dismissal
+                interacted = True
+
+        content = (await page.content()).lower()
+        captcha_phrases = [
+            "verify you are human",
+            "access denied",
+            "security challenge",
+            "unusual traffic from your computer",
+            "confirm you are not a robot",
+            "please complete the security check",
+            "attention required! | cloudflare"
+        ]
+        for phrase in captcha_phrases:
+            if phrase in content:
+                console.print(f"   [bold red]Blocking detected ({phrase})! Aborting use of this URL...[/bold red]")
+                captcha_found = True
+                break
+    except:
+        pass
+    return interacted, captcha_found
+
+async def card_results_async(url, snapshot, fetch_details):
+    """card_results with an async fetch_details(urls) -> {url: snapshot or None}"""
+    parsed_cards = [parse_card(url, card) for card in snapshot.cards]
+    return card_records(url, parsed_cards, await fetch_details(detail_urls(parsed_cards)))
+
+def has_valid_data(results):
+    """At least one record with a phone or an address"""
+    return any(r['mobile'] or r['address'] != "Not Found" for r in results)
+
+
+class AsyncListingExtractor:
+    """
+    Universal List Scraper on the async API. Every extract() call gets its own
+    context on the pool's warm browser, so calls can run side by side.
+    """
+    def __init__(self, headless: bool = True, pool=None, limiter=None, cache=None,
+                 detail_concurrency: int = LISTING_DETAIL_CONCURRENCY):
+        self.headless = headless
+        self.detail_concurrency = detail_concurrency
+        self.pool = pool or get_browser_pool()
+        self.limiter = limiter or get_rate_limiter()
+        self.cache = cache or get_page_cache()
+
+    async def settle(self, page, timeout=2000):
+        """Waits for the page to go quiet (at most `timeout` ms) instead of a fixed pause"""
+        try: await page.wait_for_load_state("networkidle", timeout=timeout)
+        except: pass
+
+    async def fetch_detail(self, context, detail_url):
+        """Snapshot of a listing's detail page (cache first, then a new tab)."""
+        detail = self.cache.get(detail_url)
+        if detail is not None:
+            return detail
+        new_page = None
+        try:
+            new_page = await context.new_page()
+            await self.limiter.wait(detail_url)
+            await new_page.goto(detail_url, timeout=30000)
+            await handle_blocking_elements_async(new_page)
+            await reveal_contacts_async(new_page)
+            detail = await take_snapshot_async(new_page)
+            self.cache.put(detail_url, detail)
+            return detail
+        except:
+            return None
+        finally:
+            if new_page is not None:
+                try: await new_page.close()
+                except: pass
+
+    async def fetch_details(self, context, detail_urls):
+        """fetch_detail for every URL, `detail_concurrency` tabs of the context at a time"""
+        slots = asyncio.Semaphore(self.detail_concurrency)
+
+        async def fetch(detail_url):
+            async with slots:
+                return await self.fetch_detail(context, detail_url)
+
+        snapshots = await asyncio.gather(*(fetch(u) for u in detail_urls))
+        return dict(zip(detail_urls, snapshots))
+
+    async def clear_blocks(self, page):
+        """handle_blocking_elements_async + a pause after a dismissal; True if a CAPTCHA was hit"""
+        interacted, captcha = await handle_blocking_elements_async(page)
+        if interacted and not captcha:
+            await asyncio.sleep(1)
+        return captcha
+
+    async def direct_site(self, url, page, snapshot):
+        """Strategy 2: the whole page is one entity (Contact button / Contact Us page if no phones)"""
+        unique_phones, unique_emails = page_contacts(snapshot, snapshot.title.strip())
+        if not unique_phones:
+            try:
+                contact_btn = page.locator("a:has-text('Contact'), a:has-text('Call'), a:has-text('Reach Us')").first
+                if await contact_btn.is_visible():
+                    await contact_btn.click(timeout=3000)
+                    await self.settle(page)
+                    snapshot = await take_snapshot_async(page, CARD_SELECTORS)
+                    self.cache.put(url, snapshot)
+                    revealed_phones, revealed_emails = page_contacts(snapshot)
+                    unique_phones.update(revealed_phones)
+                    unique_emails.update(revealed_emails)
+
+                if not unique_phones and not unique_emails:
+                    href = contact_page_link(snapshot)
+                    if href:
+                        await page.goto(href, timeout=30000)
+                        await self.settle(page)
+                        c_page = await take_snapshot_async(page)
+                        self.cache.put(href, c_page)
+                        contact_phones, contact_emails = page_contacts(c_page)
+                        unique_phones.update(contact_phones)
+                        unique_emails.update(contact_emails)
+            except: pass
+        return direct_site_result(url, snapshot, unique_phones, unique_emails)
+
+    async def extract(self, url):
+        """Same result as extract_pg_data(url)."""
+        cached = extract_from_cache(url, self.cache)
+        if cached is not None:
+            return cached
+        if self.cache.cache_only:
+            return []
+
+        results = []
+        context = None
+        try:
+            context = await self.pool.new_context(headless=self.headless, block_resources=False)
+            page = await context.new_page()
+
             # --- 3-Try Logic ---
             for attempt in range(1, 4):
                 if attempt > 1:
-                     console.print(f"   [yellow]Attempt {attempt}: Retrying extraction...[/yellow]")
-
+                    console.print(f"   [yellow]Attempt {attempt}: Retrying extraction of {url}...[/yellow]")
                 try:
-                    # Navigate if first attempt OR if page is blank/failed previous load
                     if attempt == 1 or page.url == "about:blank":
-                         page.goto(url, timeout=45000)
-                    
-                    # Wait for load
-                    random_delay(1, 2)
+                        await self.limiter.wait(url)
+                        await page.goto(url, timeout=45000)
+                    await self.settle(page)
 
-                    # Handle Blocks/Overlays BEFORE extraction
-                    interacted, captcha = handle_blocking_elements(page)
-                    if captcha:
-                        browser.close()
+                    if await self.clear_blocks(page):
                         return []
-                    if interacted:
-                        # If we closed something, maybe wait a bit/scroll again
-                        time.sleep(1)
-
                     # Scroll to load dynamic lists
                     for _ in range(3):
-                        page.evaluate("window.scrollBy(0, 1000)")
-                        time.sleep(0.5)
-
+                        await page.evaluate("window.scrollBy(0, 1000)")
+                        await asyncio.sleep(0.5)
                     # Post-Scroll Block Check (Some popups appear on scroll)
-                    interacted, captcha = handle_blocking_elements(page)
-                    if captcha:
-                        browser.close()
+                    if await self.clear_blocks(page):
                         return []
-                    if interacted:
-                        time.sleep(1)
-
                 except:
                     if attempt == 3:
-                        browser.close()
                         return []
                     continue
-                
-                # Double check before clicking reveal
-                interacted, captcha = handle_blocking_elements(page)
+
+                _, captcha = await handle_blocking_elements_async(page)
                 if captcha:
-                    browser.close()
                     return []
-                
-                # CLICK TO REVEAL
-                reveal_contacts(page)
-                
-                content_text = page.locator("body").inner_text()
-                page_title = page.title().strip()
+                await reveal_contacts_async(page)
+
+                snapshot = await take_snapshot_async(page, CARD_SELECTORS)
+                self.cache.put(url, snapshot)
 
                 # --- Strategy 1: Smart Card Detection ---
-                # Look for repeating elements that look like property cards
-                card_selectors = [
-                    "div[class*='card']", "div[class*='listing']", "div[class*='property']", 
-                    "div[class*='result']", "article", "div[shadow]", "li.list-item",
-                    ".srpTuple__tuple" # 99acres specific
-                ]
-                
-                found_cards = False
-                results = [] # Reset results for this attempt
-                
-                for selector in card_selectors:
-                    elements = page.locator(selector).all()
-                    valid_cards = [el for el in elements if len(el.inner_text()) > 100]
-                    
-                    if len(valid_cards) >= 2: # Lower threshold slightly
-                        found_cards = True
-                        for card in valid_cards:
-                            card_text = card.inner_text()
-                            
-                            name = "Unknown Listing"
-                            detail_url = None
-                            
-                            try:
-                                heading = card.locator("h2, h3, h4, .title, .name, .store-name").first
-                                if heading.is_visible():
-                                    name = heading.inner_text().strip()
-                                    # Try to find link in heading
-                                    link = heading.locator("a").first
-                                    if link.count() > 0:
-                                        href = link.get_attribute("href")
-                                        if href: detail_url = href
-                                    else:
-                                        # Try parent if heading itself isn't a link
-                                        parent_link = card.locator("a").first
-                                        if parent_link.count() > 0:
-                                             href = parent_link.get_attribute("href")
-                                             if href: detail_url = href
-                            except: pass
-                            
-                            # Normalize URL
-                            if detail_url and not detail_url.startswith("http"):
-                                # Handle relative URLs
-                                base_domain = "/".join(url.split("/")[:3]) # https://example.com
-                                if detail_url.startswith("/"):
-                                    detail_url = base_domain + detail_url
-                                else:
-                                    detail_url = base_domain + "/" + detail_url
-
-                            phones = set()
-                            for match in re.finditer(PHONE_REGEX, card_text):
-                                p = clean_phone(match.group(0))
-                                if p: phones.add(p)
-                            phones.update(extract_tel_links(card))
-                            
-                            emails = extract_emails(card_text)
-                                
-                            address = "Not Found"
-                            lines = card_text.split('\n')
-                            for line in lines:
-                                if re.search(PINCODE_REGEX, line) or "Sector" in line or "Road" in line or "Opp" in line or "Near" in line:
-                                    if len(line) > 15 and len(line) < 150:
-                                        address = line.strip()
-                                        break
-                            
-                            # DEEP CRAWL LOGIC: If no contact info but we have a link, visit it!
-                            if not phones and not emails and detail_url:
-                                try:
-                                    # console.print(f"   [dim]Deep Crawling: {detail_url}...[/dim]")
-                                    new_page = context.new_page()
-                                    new_page.goto(detail_url, timeout=30000)
-                                    
-                                    # Handle blocks/clicks on detail page
-                                    handle_blocking_elements(new_page)
-                                    reveal_contacts(new_page)
-                                    
-                                    detail_text = new_page.locator("body").inner_text()
-                                    detail_meta = extract_meta_data(new_page)
-                                    detail_full_scan = detail_text + " " + detail_meta
-                                    
-                                    # Extract from detail page
-                                    for match in re.finditer(PHONE_REGEX, detail_full_scan):
-                                        p = clean_phone(match.group(0))
-                                        if p: phones.add(p)
-                                    phones.update(extract_tel_links(new_page))
-                                    emails.update(extract_emails(detail_full_scan))
-                                    
-                                    new_page.close()
-                                    time.sleep(1) # Be nice
-                                except:
-                                    try: new_page.close() 
-                                    except: pass
-                            
-                            if phones or emails or (address != "Not Found" and name != "Unknown Listing"):
-                                results.append({
-                                    "name": name,
-                                    "mobile": list(phones),
-                                    "email": list(emails),
-                                    "address": address,
-                                    "source": detail_url if detail_url else url,
-                                    "type": "Aggregator Listing"
-                                })
-                        break 
-                
+                results = await card_results_async(url, snapshot, lambda urls: self.fetch_details(context, urls))
                 # --- Strategy 2: Whole Page Fallback (Direct Site) ---
-                if not results and not found_cards:
-                    # Combined content source: Body + Title + Meta Description
-                    meta_desc = extract_meta_data(page)
-                    full_text_scan = content_text + " " + page_title + " " + meta_desc
-                    
-                    unique_phones = set([clean_phone(p[0]) for p in re.finditer(PHONE_REGEX, full_text_scan) if clean_phone(p[0])])
-                    unique_phones.update(extract_tel_links(page))
-                    
-                    unique_emails = extract_emails(full_text_scan)
-
-                    # If no phones, try Contact button then retry scraping phones
-                    if not unique_phones:
-                        try:
-                            # 1. Click Reveal Buttons on current page
-                            contact_btn = page.locator("a:has-text('Contact'), a:has-text('Call'), a:has-text('Reach Us')").first
-                            if contact_btn.is_visible():
-                                 contact_btn.click(timeout=3000)
-                                 time.sleep(2)
-                                 # Re-grab content
-                                 content_text = page.locator("body").inner_text()
-                                 for match in re.finditer(PHONE_REGEX, content_text):
-                                    p = clean_phone(match.group(0))
-                                    if p: unique_phones.add(p)
-                                 unique_phones.update(extract_tel_links(page))
-                                 unique_emails.update(extract_emails(content_text))
-                            
-                            # 2. DEEP CRAWL: Visit "Contact Us" page if still no data
-                            if not unique_phones and not unique_emails:
-                                contact_link = page.locator("a[href*='contact'], a[href*='about'], a:has-text('Contact Us')").first
-                                if contact_link.count() > 0:
-                                    href = contact_link.get_attribute("href")
-                                    if href:
-                                        # console.print(f"   [dim]Visiting Contact Page: {href}...[/dim]")
-                                        page.goto(href, timeout=30000) # Navigate main page
-                                        time.sleep(2)
-                                        
-                                        c_text = page.locator("body").inner_text()
-                                        c_meta = extract_meta_data(page)
-                                        c_scan = c_text + " " + c_meta
-                                        
-                                        for match in re.finditer(PHONE_REGEX, c_scan):
-                                            p = clean_phone(match.group(0))
-                                            if p: unique_phones.add(p)
-                                        unique_phones.update(extract_tel_links(page))
-                                        unique_emails.update(extract_emails(c_scan))
+                if not results and not snapshot.cards:
+                    results.append(await self.direct_site(url, page, snapshot))
 
-                        except: pass
-                    
-                    address = "Not Found"
-                    lines = content_text.split('\n')
-                    for line in lines:
-                        if re.search(PINCODE_REGEX, line):
-                            address = line.strip()
-                            break
-                            
-                    results.append({
-                        "name": page_title,
-                        "mobile": list(unique_phones),
-                        "email": list(unique_emails),
-                        "address": address,
-                        "source": url,
-                        "type": "Direct Site"
-                    })
-
-                # If we found data, break the retry loop
-                # Check validation: at least 1 valid result with some data?
-                valid_data_found = False
-                if len(results) > 0:
-                    for r in results:
-                        if r['mobile'] or r['address'] != "Not Found":
-                            valid_data_found = True
-                            break
-                
-                if valid_data_found:
+                if has_valid_data(results):
                     break
-                else:
-                    # If we are on the last attempt, don't clear results, just return what we have (even if empty/poor)
-                    if attempt < 3:
-                        interacted, captcha = handle_blocking_elements(page) # Try harder to clear blocks
-                        if captcha:
-                            browser.close()
-                            return []
-                        time.sleep(2)
-
-            browser.close()
+                if attempt < 3:
+                    _, captcha = await handle_blocking_elements_async(page) # Try harder to clear blocks
+                    if captcha:
+                        return []
+                    await asyncio.sleep(2)
             return results
-            
-        except Exception as e:
-            # console.print(f"[red]Error {url}: {e}[/red]")
+        except Exception:
             return []
+        finally:
+            if context is not None:
+                try: await context.close()
+                except: pass
+
 
-def process_websites_list(input_file: str = "data/websites.json", output_file: str = "data/pg.json"):
+async def extract_many(urls, emit, concurrency: int = 5, extractor=None):
     """
-    Reads websites.json and runs extraction on each.
+    Runs extractor.extract() over `urls` with `concurrency` workers pulling from one
+    queue and awaits emit(url, results) as soon as each URL is done.
     """
-    if not os.path.exists(input_file):
-        console.print(f"[red]Input file {input_file} not found.[/red]")
-        return
-        
-    with open(input_file, "r") as f:
-        urls = json.load(f)
-        
-    console.print(f"[bold blue]Starting Universal List Extraction on {len(urls)} URLs...[/bold blue]")
-    
-    all_pgs = []
-    # Load existing to append? Or overwrite? 
-    # Usually safer to append or merge unique
-    if os.path.exists(output_file):
-        try:
-            with open(output_file, "r") as f:
-                all_pgs = json.load(f)
-        except:
-            pass
-            
-    # Simple dedupe by source+name
-    seen_entries = set()
-    for pg in all_pgs:
-        seen_entries.add(pg.get("source", "") + pg.get("name", ""))
-    
+    extractor = extractor or AsyncListingExtractor()
+    queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+
+    async def work():
+        while True:
+            try:
+                url = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                results = await extractor.extract(url)
+            except Exception:
+                results = []
+            await emit(url, results)
+
+    await asyncio.gather(*(work() for _ in range(max(1, min(concurrency, len(urls))))))
+
+
+def listing_key(pg):
+    """source+name dedupe key of a record, JSON-quoted so it is always one line of the key log"""
+    return json.dumps(pg.get("source", "") + pg.get("name", ""))
+
+
+class ListingOutput:
+    """
+    Output of process_websites_list, written incrementally.
+
+    New records are appended to <output>.jsonl and their source+name keys to
+    <output>.keys, a ProcessedSites log with its sorted hash index, so one URL
+    costs the same however large the output has grown. The legacy JSON list
+    (<output>, e.g. pg.json) is only written by compact(), which folds the
+    JSONL into it; folding dedupes again, so it can be rerun after a crash.
+    """
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.store = JsonStore(output_file)
+        base, _ = os.path.splitext(output_file)
+        self.journal_file = base + ".jsonl"
+        keys_file = base + ".keys"
+        if not os.path.exists(output_file) and not os.path.exists(self.journal_file):
+            # Output deleted by hand: its keys must not hold back the new run
+            for f_path in (keys_file, keys_file + ".idx"):
+                if os.path.exists(f_path):
+                    os.remove(f_path)
+        self.keys = ProcessedSites(keys_file)
+        if not len(self.keys) and os.path.exists(output_file):
+            # First run on a legacy pg.json: index its keys once
+            for pg in self.store.read_snapshot():
+                self.keys.add(listing_key(pg))
+            self.keys.flush()
+        self.journal = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def append(self, records):
+        if self.journal is None:
+            directory = os.path.dirname(self.journal_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.journal = open(self.journal_file, "a")
+        self.journal.write("".join(json.dumps(pg) + "\n" for pg in records))
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+
+    def add(self, pg_data_list):
+        """Appends the new entries, saves and reports; returns how many were new."""
+        new = []
+        if pg_data_list:
+            for pg in pg_data_list:
+                key = listing_key(pg)
+                if key not in self.keys:
+                    self.keys.add(key)
+                    new.append(pg)
+
+            if new:
+                # Records first: a crash before the keys are flushed only risks a duplicate line
+                self.append(new)
+                self.keys.flush()
+                console.print(f"   [green]Found {len(new)} listings![/green]")
+                # Sample output
+                if pg_data_list[0]['mobile']:
+                    console.print(f"   Sample Mobile: {pg_data_list[0]['mobile']}")
+        else:
+            console.print("   [dim]No data found.[/dim]")
+        return len(new)
+
+    def compact(self):
+        """Folds the JSONL into the JSON list and removes it. Returns the number of records."""
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        if not os.path.exists(self.journal_file):
+            # Nothing appended since the last compaction
+            return len(self.keys)
+        data = self.store.read_snapshot()
+        seen = {listing_key(pg) for pg in data}
+        with open(self.journal_file, "r") as f:
+            for line in f:
+                try:
+                    pg = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn last line from a crash mid-append
+                    continue
+                key = listing_key(pg)
+                if key not in seen:
+                    seen.add(key)
+                    data.append(pg)
+        self.store.write_snapshot(data)
+        os.remove(self.journal_file)
+        return len(data)
+
+    def close(self):
+        """Writes the JSON list and the key index at the end of a run."""
+        total = self.compact()
+        self.keys.close()
+        return total
+
+
+async def extract_websites(urls, output, concurrency: int = 5, extractor=None):
+    """Async path of process_websites_list: results are saved as each URL finishes."""
+    done = 0
+
+    async def emit(url, results):
+        nonlocal done
+        done += 1
+        console.print(f"[{done}/{len(urls)}] Scanned: {url}")
+        output.add(results)
+
+    await extract_many(urls, emit, concurrency=concurrency, extractor=extractor)
+
+def extract_websites_sync(urls, output):
+    """Sequential path of process_websites_list (one extract_pg_data call per URL)."""
     for i, url in enumerate(urls):
         console.print(f"[{i+1}/{len(urls)}] Scanning: {url}...")
         
@@ -436,27 +820,29 @@ def process_websites_list(input_file: str = "data/websites.json", output_file: s
              # but keeping headless=True is cleaner for now. If it fails, we can prompt. 
              # Actually, let's keep it robust.
         
-        pg_data_list = extract_pg_data(url, headless=headless)
+        output.add(extract_pg_data(url, headless=headless))
+
+def process_websites_list(input_file: str = "data/websites.json", output_file: str = "data/pg.json",
+                          concurrency: int = 5):
+    """
+    Reads websites.json and runs extraction on each, `concurrency` URLs at a time
+    on the async extractor (concurrency=1 keeps the sequential sync path).
+    """
+    if not os.path.exists(input_file):
+        console.print(f"[red]Input file {input_file} not found.[/red]")
+        return
+        
+    with open(input_file, "r") as f:
+        urls = json.load(f)
         
-        new_count = 0
-        if pg_data_list:
-            for pg in pg_data_list:
-                key = pg["source"] + pg["name"]
-                if key not in seen_entries:
-                    seen_entries.add(key)
-                    all_pgs.append(pg)
-                    new_count += 1
-                    
-            if new_count > 0:
-                console.print(f"   [green]Found {new_count} listings![/green]")
-                # Sample output
-                if pg_data_list[0]['mobile']:
-                     console.print(f"   Sample Mobile: {pg_data_list[0]['mobile']}")
+    console.print(f"[bold blue]Starting Universal List Extraction on {len(urls)} URLs...[/bold blue]")
+    output = ListingOutput(output_file)
+    try:
+        if concurrency > 1:
+            get_browser_pool().run(extract_websites(urls, output, concurrency=concurrency))
         else:
-            console.print("   [dim]No data found.[/dim]")
-            
-        # Incremental Save
-        with open(output_file, "w") as f:
-            json.dump(all_pgs, f, indent=2)
-
-    console.print(f"\n[bold green]Extraction Complete! Total PGs: {len(all_pgs)}[/bold green]")
+            extract_websites_sync(urls, output)
+    finally:
+        # pg.json is written once, by folding this run's JSONL into it
+        total = output.close()
+    console.print(f"\n[bold green]Extraction Complete! Total PGs: {total}[/bold green]")
@@ -0,0 +1,151 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from rich.console import Console
+from src.core.utils import normalize_url
+from src.core.config import PAGE_CACHE_FILE, PAGE_CACHE_TTL, PAGE_CACHE_MAX_BYTES
+from src.scrapers.core.snapshot import PageSnapshot, EMPTY_SNAPSHOT
+
+console = Console()
+
+
+class PageCache:
+    """
+    On-disk cache of fetched pages (SQLite), keyed by normalized URL.
+
+    Each row holds the final body text, the page snapshot (title, h1s, links, cards...)
+    and the fetch time. Entries older than `ttl` seconds count as misses, and the
+    least recently used rows are evicted once the cache grows past `max_bytes`.
+    With `cache_only` the network is never touched: expired entries are served
+    too and uncached pages are simply skipped.
+    """
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, fetched_at REAL NOT NULL, used_at REAL NOT NULL, "
+        "size INTEGER NOT NULL, text TEXT NOT NULL, snapshot TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_pages_used ON pages(used_at)",
+    ]
+
+    def __init__(self, path: str = PAGE_CACHE_FILE, ttl: float = PAGE_CACHE_TTL,
+                 max_bytes: int = PAGE_CACHE_MAX_BYTES, cache_only: bool = False):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.cache_only = cache_only
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stored": 0, "evicted": 0}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def key(self, url):
+        return normalize_url(url)
+
+    def get(self, url):
+        """PageSnapshot of a cached page, or None on a miss / expired entry."""
+        if not url:
+            return None
+        key = self.key(url)
+        with self.lock:
+            row = self.conn.execute("SELECT fetched_at, text, snapshot FROM pages WHERE url = ?", (key,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            fetched_at, text, snapshot = row
+            now = time.time()
+            if not self.cache_only and now - fetched_at > self.ttl:
+                self.stats["expired"] += 1
+                return None
+            self.conn.execute("UPDATE pages SET used_at = ? WHERE url = ?", (now, key))
+            self.conn.commit()
+            self.stats["hits"] += 1
+        data = json.loads(snapshot)
+        data["text"] = text
+        return PageSnapshot(data)
+
+    def put(self, url, page):
+        """
+        Stores a page. `page` is a PageSnapshot, an http_fetch.PageParser or a plain
+        body string (sub pages, where only the text is read).
+        """
+        if not url or page is None:
+            return
+        if isinstance(page, str):
+            page = PageSnapshot({"text": page})
+        data = {field: getattr(page, field, default) for field, default in EMPTY_SNAPSHOT.items()}
+        text = data.pop("text") or ""
+        data["links"] = [list(link) for link in data["links"]]
+        snapshot = json.dumps(data)
+        size = len(text.encode("utf-8")) + len(snapshot.encode("utf-8"))
+        key = self.key(url)
+        now = time.time()
+        with self.lock:
+            old = self.conn.execute("SELECT size FROM pages WHERE url = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url, fetched_at, used_at, size, text, snapshot) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, now, now, size, text, snapshot)
+            )
+            self.total_bytes += size - (old[0] if old else 0)
+            self.stats["stored"] += 1
+            self.evict()
+            self.conn.commit()
+
+    def evict(self):
+        """Drops least recently used pages until the cache fits in max_bytes (lock held)."""
+        while self.total_bytes > self.max_bytes:
+            rows = self.conn.execute("SELECT url, size FROM pages ORDER BY used_at LIMIT 100").fetchall()
+            if not rows:
+                self.total_bytes = 0
+                return
+            for url, size in rows:
+                self.conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+                self.total_bytes -= size
+                self.stats["evicted"] += 1
+                if self.total_bytes <= self.max_bytes:
+                    return
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM pages")
+            self.conn.commit()
+            self.total_bytes = 0
+
+    def summary(self):
+        with self.lock:
+            entries, oldest = self.conn.execute("SELECT COUNT(*), MIN(fetched_at) FROM pages").fetchone()
+            stats = dict(self.stats)
+        stats.update(entries=entries, bytes=self.total_bytes, oldest=oldest)
+        return stats
+
+    def print_summary(self):
+        stats = self.summary()
+        if stats["hits"] or stats["misses"] or stats["stored"]:
+            console.print(
+                f"[dim]Page cache: {stats['hits']} hits, {stats['misses'] + stats['expired']} misses "
+                f"({stats['expired']} expired), {stats['stored']} stored, {stats['evicted']} evicted, "
+                f"{stats['entries']} pages / {stats['bytes'] / 1e6:.1f} MB on disk[/dim]"
+            )
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+_page_cache = None
+_cache_lock = threading.Lock()
+
+def get_page_cache():
+    """Process-wide page cache shared by the deep crawler and the listing extractor."""
+    global _page_cache
+    with _cache_lock:
+        if _page_cache is None:
+            _page_cache = PageCache()
+        return _page_cache
@@ -0,0 +1,195 @@
+import asyncio
+import time
+from urllib.parse import urlparse
+from rich.console import Console
+from src.core.utils import load_processed_sites, mark_as_processed, flush_processed_sites
+from src.core.data_manager import MasterDataManager
+from src.core.rate_limit import get_rate_limiter
+from src.core.work_queue import LeaseKeeper, default_holder
+from src.scrapers.core.serp_cache import get_serp_cache
+from src.scrapers.core.browser_pool import get_browser_pool
+from src.scrapers.core.search_coordinator import stream_waterfall, WATERFALL_ENGINES
+from src.scrapers.core.deep_crawler import AsyncDeepCrawler
+
+console = Console()
+
+# Queue marker: no more work for this stage
+_STOP = object()
+
+def root_of(url):
+    if not url.startswith("http"): url = "https://" + url
+    return urlparse(url).netloc.replace("www.", "")
+
+
+class DiscoveryPipeline:
+    """
+    Streaming Discovery -> Deep Study for one query.
+
+        engines --> stream_waterfall --> url queue --> N crawler workers --> result queue --> writer
+
+    Each root domain is handed to a crawler the moment any engine finds it, so the
+    first leads land while the search is still running. Both queues are bounded:
+    when the crawlers fall behind, the producer stops pulling from the waterfall,
+    and when the writer falls behind, the crawlers wait before starting new sites.
+    The writer is the only task touching the master list.
+
+    With a shared domain queue (`shared`, see core/work_queue.py) several boxes run
+    pipelines at once: a root is only crawled by the box whose claim() wins, and
+    its entity goes to the queue's result store instead of the local master list.
+    """
+    def __init__(self, query: str, limit: int = 50, headless: bool = False, city: str = None,
+                 storage: str = "journal", output_file: str = "data/master_pg_list.json",
+                 workers: int = 5, url_queue_size: int = 20, result_queue_size: int = 20,
+                 engines=WATERFALL_ENGINES, engine_limits: dict = None, manager=None, politeness=None,
+                 save_every: int = 10, shared=None):
+        self.query = query
+        self.limit = limit
+        self.headless = headless
+        self.city = city
+        self.storage = storage
+        self.output_file = output_file
+        self.workers = max(1, workers)
+        self.url_queue_size = url_queue_size
+        self.result_queue_size = result_queue_size
+        self.engines = engines
+        self.engine_limits = engine_limits
+        self.manager = manager
+        self.politeness = politeness
+        self.save_every = save_every
+        self.shared = shared
+        self.holder = default_holder()
+        self.keeper = None
+        self.stats = {"urls": 0, "domains": 0, "skipped": 0, "crawled": 0, "leads": 0, "first_lead_after": None}
+
+    async def produce(self, url_queue, processed_domains):
+        queued = set()
+        async for url in stream_waterfall(self.query, self.limit, self.headless, city=self.city,
+                                          storage=self.storage, engines=self.engines,
+                                          engine_limits=self.engine_limits, manager=self.manager):
+            self.stats["urls"] += 1
+            root = root_of(url)
+            if not root or root in queued:
+                continue
+            queued.add(root)
+            if root in processed_domains:
+                self.stats["skipped"] += 1
+                continue
+            lease = None
+            if self.shared is not None:
+                # Another box has it (or had it already)
+                lease = await asyncio.to_thread(self.shared.claim, root, self.holder, [url])
+                if lease is None:
+                    self.stats["skipped"] += 1
+                    continue
+                self.keeper.add(lease)
+            self.stats["domains"] += 1
+            # Blocks while the crawlers are busy (backpressure)
+            await url_queue.put((root, [url], lease))
+
+    async def crawl(self, crawler, url_queue, result_queue):
+        while True:
+            item = await url_queue.get()
+            if item is _STOP:
+                return
+            root, pages, lease = item
+            entity = None
+            try:
+                if self.politeness is None:
+                    entity = await crawler.sub_process_domain(root, pages)
+                elif self.politeness.claim(root):
+                    async with self.politeness.slot(root):
+                        entity = await crawler.sub_process_domain(root, pages)
+            except Exception as e:
+                console.print(f"[dim red]Crawl failed for {root}: {e}[/dim red]")
+            await result_queue.put((root, entity, lease))
+
+    async def write(self, result_queue, started):
+        since_save = 0
+        while True:
+            item = await result_queue.get()
+            if item is _STOP:
+                break
+            root, entity, lease = item
+            self.stats["crawled"] += 1
+            if lease is not None:
+                # Shared run: the entity goes to the queue's result store
+                self.keeper.discard(lease)
+                await asyncio.to_thread(self.shared.complete, lease, entity)
+                if entity:
+                    self.stats["leads"] += 1
+                    if self.stats["first_lead_after"] is None:
+                        self.stats["first_lead_after"] = time.monotonic() - started
+                continue
+            if entity:
+                status = self.manager.upsert_entity(entity)
+                if "Skipped" not in status:
+                    self.stats["leads"] += 1
+                    if self.stats["first_lead_after"] is None:
+                        self.stats["first_lead_after"] = time.monotonic() - started
+                    console.print(f"   [green]{status}:[/green] {entity.get('name')} ({root})")
+            # Mark as processed regardless of result (we tried)
+            mark_as_processed(root)
+            since_save += 1
+            if since_save >= self.save_every:
+                self.manager.save_master()
+                flush_processed_sites()
+                since_save = 0
+        flush_processed_sites()
+
+    async def run(self):
+        started = time.monotonic()
+        owns_manager = self.manager is None and self.shared is None
+        if owns_manager:
+            self.manager = MasterDataManager(self.output_file, city=self.city, storage=self.storage)
+        if self.shared is not None:
+            # Claimed domains stay leased while they wait for a crawler
+            self.keeper = LeaseKeeper(self.shared).__enter__()
+
+        url_queue = asyncio.Queue(maxsize=self.url_queue_size)
+        result_queue = asyncio.Queue(maxsize=self.result_queue_size)
+        crawler = AsyncDeepCrawler(headless=True)
+
+        console.print(f"[bold magenta]Streaming pipeline for: {self.query} ({self.workers} crawlers)[/bold magenta]")
+        writer = asyncio.create_task(self.write(result_queue, started))
+        workers = [asyncio.create_task(self.crawl(crawler, url_queue, result_queue)) for _ in range(self.workers)]
+        try:
+            try:
+                await self.produce(url_queue, load_processed_sites())
+            except Exception as e:
+                console.print(f"[red]Discovery failed ({self.query}): {e}[/red]")
+            # Drain: every crawler gets a stop marker after the real work
+            for _ in workers:
+                await url_queue.put(_STOP)
+            await asyncio.gather(*workers)
+            await result_queue.put(_STOP)
+            await writer
+        finally:
+            for task in workers + [writer]:
+                task.cancel()
+            await asyncio.gather(*workers, writer, return_exceptions=True)
+            await crawler.close()
+            if self.keeper is not None:
+                self.keeper.__exit__(None, None, None)
+            if owns_manager:
+                self.manager.close()
+            elif self.manager is not None:
+                self.manager.save_master()
+
+        elapsed = time.monotonic() - started
+        first = self.stats["first_lead_after"]
+        first_text = f", first lead after {first:.1f}s" if first is not None else ""
+        console.print(
+            f"[bold green]Pipeline done in {elapsed:.1f}s: {self.stats['domains']} new domains, "
+            f"{self.stats['leads']} leads{first_text}.[/bold green]"
+        )
+        self.stats["tiers"] = crawler.tier_stats()
+        crawler.print_tier_stats()
+        if owns_manager:
+            get_rate_limiter().print_summary()
+            get_serp_cache().print_summary()
+        return self.stats
+
+
+def run_pipeline(query: str, **kwargs):
+    """Sync entry point (runs on the browser pool's loop)."""
+    return get_browser_pool().run(DiscoveryPipeline(query, **kwargs).run())
@@ -0,0 +1,195 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from rich.console import Console
+from src.core.data_manager import MasterDataManager
+from src.core.rate_limit import get_rate_limiter
+from src.core.work_queue import LeaseKeeper, SharedResults, default_holder
+from src.scrapers.core.serp_cache import get_serp_cache
+from src.exporters.excel import BackgroundExporter, export_to_excel
+from src.scrapers.core.browser_pool import get_browser_pool
+from src.scrapers.core.search_coordinator import WATERFALL_ENGINES
+from src.scrapers.core.pipeline import DiscoveryPipeline
+
+console = Console()
+
+class DomainPoliteness:
+    """
+    Per-domain politeness shared by all concurrent queries:
+    - claim(): each root domain is crawled by only one query per run
+    - slot(): at most `max_per_domain` concurrent visits and `min_interval` seconds between them
+    """
+    def __init__(self, max_per_domain: int = 1, min_interval: float = 2.0):
+        self.max_per_domain = max_per_domain
+        self.min_interval = min_interval
+        self.claimed = set()
+        self.slots = {}
+        self.last_visit = {}
+
+    def claim(self, domain):
+        if domain in self.claimed:
+            return False
+        self.claimed.add(domain)
+        return True
+
+    @asynccontextmanager
+    async def slot(self, domain):
+        sem = self.slots.setdefault(domain, asyncio.Semaphore(self.max_per_domain))
+        async with sem:
+            loop = asyncio.get_running_loop()
+            wait = self.last_visit.get(domain, 0) + self.min_interval - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                yield
+            finally:
+                self.last_visit[domain] = loop.time()
+
+
+class QueryScheduler:
+    """
+    Runs run_all queries N at a time on one event loop, so discovery of one query
+    overlaps the deep crawl of another. Each query is a streaming DiscoveryPipeline.
+
+    - `concurrency` queries are in flight at once
+    - each search engine is capped at `engine_concurrency` simultaneous searches
+    - domains are crawled politely (DomainPoliteness)
+    - one shared MasterDataManager owns the master list
+    - a query is appended to `status_file` only after its crawl finished, so an
+      interrupted run resumes exactly like the sequential one did
+
+    With shared queues (`query_queue` / `domain_queue`, see core/work_queue.py)
+    several boxes split one run: queries are leased instead of read from the list
+    (heartbeated while their pipeline runs), domains are claimed across boxes and
+    entities go to the shared result store; Maps places go to `place_queue`'s
+    result store (SharedResults). Nothing is written to the local master list.
+    """
+    def __init__(self, queries, completed_queries: set, status_file: str = "data/run_all_status.json",
+                 limit: int = 50, city: str = None, storage: str = "journal", headless: bool = False,
+                 concurrency: int = 3, engine_concurrency: int = 2, domain_interval: float = 2.0, workers: int = 5,
+                 master_file: str = "data/master_pg_list.json", excel_file: str = "data/verified_pg_database.xlsx",
+                 query_queue=None, domain_queue=None, place_queue=None):
+        self.queries = list(queries)
+        self.completed_queries = completed_queries
+        self.status_file = status_file
+        self.limit = limit
+        self.city = city
+        self.storage = storage
+        self.headless = headless
+        self.concurrency = max(1, concurrency)
+        self.engine_concurrency = max(1, engine_concurrency)
+        self.domain_interval = domain_interval
+        self.workers = workers
+        self.master_file = master_file
+        self.excel_file = excel_file
+        self.query_queue = query_queue
+        self.domain_queue = domain_queue
+        self.place_queue = place_queue
+        if query_queue is not None and place_queue is None:
+            raise ValueError("A shared run needs a place_queue: Maps leads go to its result store")
+        self.stats = {"done": 0, "failed": 0, "urls": 0}
+
+    def record_completed(self, query):
+        self.completed_queries.add(query)
+        with open(self.status_file, "w") as f:
+            json.dump(list(self.completed_queries), f)
+
+    async def run_query(self, index, query, manager, engine_limits, politeness, exporter):
+        total = len(self.queries)
+        console.print(f"\n[bold cyan]Processing Batch {index + 1}/{total}: {query}[/bold cyan]")
+
+        # Step 1+2: Discovery streamed straight into Deep Study
+        pipeline = DiscoveryPipeline(
+            query, limit=self.limit, headless=self.headless, city=self.city, storage=self.storage,
+            output_file=self.master_file, workers=self.workers, engine_limits=engine_limits,
+            manager=manager, politeness=politeness, shared=self.domain_queue
+        )
+        try:
+            stats = await pipeline.run()
+        except Exception as e:
+            console.print(f"[red]Pipeline Failed ({query}): {e}[/red]")
+            self.stats["failed"] += 1
+            return None
+        self.stats["urls"] += stats["urls"]
+        if self.query_queue is not None:
+            # Shared run: the query queue records completion
+            self.stats["done"] += 1
+            return stats
+
+        # Step 3: Incremental Export (debounced, off the event loop) + record success
+        exporter.request(self.master_file, self.excel_file, data_fn=manager.export_snapshot)
+        self.record_completed(query)
+        self.stats["done"] += 1
+        return stats
+
+    async def run_shared(self, engine_limits, politeness):
+        """`concurrency` workers lease queries from the shared queue until it is drained."""
+        holder = default_holder()
+        # Maps upserts land in the shared place store, not a local master list
+        places = SharedResults(self.place_queue, holder)
+        added = await asyncio.to_thread(self.query_queue.put, self.queries)
+        console.print(f"[bold magenta]Shared run: {added} new queries queued, {self.concurrency} workers on this box...[/bold magenta]")
+
+        async def worker(keeper):
+            while True:
+                leases = await asyncio.to_thread(self.query_queue.lease, holder, 1)
+                if not leases:
+                    return
+                lease = leases[0]
+                keeper.add(lease)
+                try:
+                    stats = await self.run_query(self.stats["done"] + self.stats["failed"], lease.item, places,
+                                                 engine_limits, politeness, None)
+                finally:
+                    keeper.discard(lease)
+                if stats is None:
+                    await asyncio.to_thread(self.query_queue.release, lease, "pipeline failed")
+                else:
+                    summary = {"urls": stats["urls"], "domains": stats["domains"], "leads": stats["leads"]}
+                    await asyncio.to_thread(self.query_queue.complete, lease, summary)
+
+        with LeaseKeeper(self.query_queue) as keeper:
+            await asyncio.gather(*[worker(keeper) for _ in range(self.concurrency)])
+        self.query_queue.print_summary()
+        self.domain_queue.print_summary()
+        self.place_queue.print_summary()
+
+    async def run(self):
+        engine_limits = {name: asyncio.Semaphore(self.engine_concurrency) for name in WATERFALL_ENGINES}
+        politeness = DomainPoliteness(min_interval=self.domain_interval)
+        if self.query_queue is not None:
+            await self.run_shared(engine_limits, politeness)
+            return self.finish()
+        manager = MasterDataManager(self.master_file, city=self.city, storage=self.storage)
+        exporter = BackgroundExporter(export_fn=export_to_excel)
+        query_slots = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(index, query):
+            async with query_slots:
+                await self.run_query(index, query, manager, engine_limits, politeness, exporter)
+
+        console.print(f"[bold magenta]Scheduling {len(self.queries)} queries ({self.concurrency} concurrent, {self.engine_concurrency} per engine)...[/bold magenta]")
+        try:
+            await asyncio.gather(*[bounded(i, q) for i, q in enumerate(self.queries)])
+        finally:
+            manager.close()
+            # Final workbook, written once all queries are through
+            exporter.request(self.master_file, self.excel_file, data_fn=manager.export_snapshot)
+            await asyncio.to_thread(exporter.close)
+        return self.finish()
+
+    def finish(self):
+        console.print(f"[bold green]Scheduler finished: {self.stats['done']} queries done, {self.stats['failed']} failed, {self.stats['urls']} URLs discovered.[/bold green]")
+        # Time spent waiting on politeness budgets, per group (engines / sites)
+        self.stats["rate_limit"] = get_rate_limiter().summary()
+        get_rate_limiter().print_summary()
+        # Searches answered from the SERP cache, per engine
+        self.stats["serp_cache"] = get_serp_cache().summary()
+        get_serp_cache().print_summary()
+        return self.stats
+
+
+def run_scheduled(queries, completed_queries: set, **kwargs):
+    """Sync entry point for the CLI."""
+    scheduler = QueryScheduler(queries, completed_queries, **kwargs)
+    return get_browser_pool().run(scheduler.run())
@@ -1,10 +1,17 @@
-
 import asyncio
 from src.core.utils import console
-from src.scrapers.engines.google_maps import search_google_maps
+from src.core.config import ENGINE_TIMEOUTS
+from src.scrapers.engines.google_maps import search_google_maps, search_google_maps_async
 from src.scrapers.engines.brave import search_brave
 from src.scrapers.engines.bing import search_bing
 from src.scrapers.engines.duckduckgo import search_ddg
+from src.scrapers.core.browser_pool import get_browser_pool
+from src.scrapers.core.serp_cache import get_serp_cache
+
+WATERFALL_ENGINES = ("maps", "brave", "bing", "ddg")
+
+# Queue marker: one engine finished (successfully, failed or timed out)
+_ENGINE_DONE = object()
 
 async def run_parallel_searches(query: str, limit: int, headless: bool, output_file: str):
     """
@@ -27,40 +34,97 @@ async def run_parallel_searches(query: str, limit: int, headless: bool, output_f
         
     return flat_results
 
-def search_waterfall(query: str, limit: int = 50, headless: bool = False, output_file: str = "data/websites.json", city: str = None):
+def _engine_call(name, query, limit, headless, output_file, city, storage, emit, manager=None):
+    """Coroutine for one engine, reporting each URL through emit()."""
+    if name == "maps":
+        return search_google_maps_async(query, limit, headless, city=city, storage=storage, on_url=emit, manager=manager)
+    if name == "brave":
+        return search_brave(query, limit, headless, output_file, on_url=emit)
+    if name == "bing":
+        return search_bing(query, limit, headless, on_url=emit)
+    if name == "ddg":
+        # DDGS is synchronous; run it in a worker thread and hop URLs back onto the loop
+        loop = asyncio.get_running_loop()
+        threadsafe_emit = lambda url: loop.call_soon_threadsafe(emit, url)
+        return asyncio.to_thread(search_ddg, query, limit, headless, threadsafe_emit)
+    raise ValueError(f"Unknown engine: {name}")
+
+async def stream_waterfall(query: str, limit: int = 50, headless: bool = False, output_file: str = "data/websites.json", city: str = None, storage: str = "journal", engines=WATERFALL_ENGINES, timeouts: dict = None, engine_limits: dict = None, manager=None):
     """
-    Robust Discovery: Aggregates results from Google Maps (Local) AND Brave+Bing (Organic Parallel).
+    Async-native discovery: Maps, Brave, Bing and DDG run concurrently and every
+    new normalized URL is yielded the moment any engine finds it.
+
+    Each engine has its own time budget (ENGINE_TIMEOUTS); an engine that runs
+    over is cancelled without affecting the others. Stopping iteration early
+    (break / aclose) cancels the engines that are still running.
+
+    engine_limits maps engine name -> asyncio.Semaphore shared between concurrent
+    queries, capping how many searches hit one engine at a time. `manager` is a
+    shared MasterDataManager for the Maps upserts. Every engine answers from the
+    SERP cache first (see serp_cache.py), so repeated queries return instantly.
     """
-    console.print(f"[bold magenta]Starting Multi-Source Discovery for: {query}[/bold magenta]")
-    
-    all_results = []
-    
-    # 1. Google Maps (Sync, Best for Local)
-    try:
-        console.print("[bold yellow]1. Google Maps (Local)[/bold yellow]")
-        maps_results = search_google_maps(query, limit, headless, city=city)
-        if maps_results:
-            console.print(f"[green]Maps found {len(maps_results)} links.[/green]")
-            all_results.extend(maps_results)
-    except Exception as e:
-        console.print(f"[dim]Google Maps failed: {e}[/dim]")
+    timeouts = {**ENGINE_TIMEOUTS, **(timeouts or {})}
+    queue = asyncio.Queue()
+    seen = set()
+
+    async def run_engine(name):
+        slot = (engine_limits or {}).get(name)
+        acquired = False
+        try:
+            if slot is not None:
+                await slot.acquire()
+                acquired = True
+            coro = _engine_call(name, query, limit, headless, output_file, city, storage, queue.put_nowait, manager)
+            results = await asyncio.wait_for(coro, timeouts.get(name))
+            # Anything the engine returned but did not stream (deduped below)
+            for url in results or []:
+                queue.put_nowait(url)
+        except asyncio.TimeoutError:
+            console.print(f"[yellow]{name} timed out after {timeouts.get(name)}s; keeping partial results.[/yellow]")
+        except Exception as e:
+            console.print(f"[dim]{name} failed: {e}[/dim]")
+        finally:
+            if acquired:
+                slot.release()
+            queue.put_nowait(_ENGINE_DONE)
 
-    # 2. Parallel Web Search (Brave + Bing)
+    console.print(f"[bold cyan]Running {', '.join(engines)} concurrently...[/bold cyan]")
+    tasks = [asyncio.create_task(run_engine(name)) for name in engines]
+    running = len(tasks)
     try:
-        console.print("[bold yellow]2. Organic Web Search (Brave + Bing Parallel)[/bold yellow]")
-        web_results = asyncio.run(run_parallel_searches(query, limit, headless, output_file))
-        if web_results:
-            console.print(f"[green]Web Search found {len(web_results)} links.[/green]")
-            all_results.extend(web_results)
-    except Exception as e:
-        console.print(f"[dim]Web Search failed: {e}[/dim]")
-        
-    # Deduplicate
-    unique_results = list(set(all_results))
+        while running:
+            item = await queue.get()
+            if item is _ENGINE_DONE:
+                running -= 1
+                continue
+            if item and item not in seen:
+                seen.add(item)
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+async def search_waterfall_async(query: str, limit: int = 50, headless: bool = False, output_file: str = "data/websites.json", city: str = None, storage: str = "journal", engines=WATERFALL_ENGINES, timeouts: dict = None, engine_limits: dict = None, manager=None):
+    """Collects stream_waterfall into a list."""
+    console.print(f"[bold magenta]Starting Multi-Source Discovery for: {query}[/bold magenta]")
+    unique_results = []
+    async for url in stream_waterfall(query, limit, headless, output_file, city, storage, engines, timeouts, engine_limits, manager):
+        unique_results.append(url)
     console.print(f"[bold]Total Combined Unique URLs: {len(unique_results)}[/bold]")
-        
+    get_serp_cache().print_summary()
     return unique_results
 
+def search_waterfall(query: str, limit: int = 50, headless: bool = False, output_file: str = "data/websites.json", city: str = None, storage: str = "journal", manager=None):
+    """
+    Robust Discovery: Aggregates results from Google Maps (Local) AND Brave+Bing+DDG (Organic),
+    all running concurrently. Per-query latency is the slowest engine, not the sum.
+    `manager` receives the Maps upserts (default: a MasterDataManager on the master list).
+    """
+    # Pool loop keeps the browser warm across queries
+    return get_browser_pool().run(search_waterfall_async(query, limit, headless, output_file, city, storage,
+                                                         manager=manager))
+
 # Backwards compatibility
 def search_google_fallback(query: str, limit: int = 50, headless: bool = False):
    return search_google_maps(query, limit, headless)
@@ -0,0 +1,159 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from rich.console import Console
+from src.core.config import SERP_CACHE_FILE, SERP_CACHE_TTL, SERP_QUERY_STOPWORDS
+
+console = Console()
+
+NON_WORD_RE = re.compile(r"[^\w\s]")
+
+
+def normalize_query(query):
+    """
+    Cache key for a search query: lowercase, punctuation and filler words dropped,
+    so "PG near Gota, Ahmedabad" and "pg in gota ahmedabad" share one entry.
+    """
+    words = NON_WORD_RE.sub(" ", (query or "").lower()).split()
+    return " ".join(w for w in words if w not in SERP_QUERY_STOPWORDS)
+
+
+class SerpEntry:
+    """One cached result page of one engine."""
+    __slots__ = ("urls", "records", "complete", "limit", "elapsed", "fetched_at")
+
+    def __init__(self, urls, records, complete, limit, elapsed, fetched_at):
+        self.urls = urls
+        self.records = records      # engine specific payload (Maps side panels), or None
+        self.complete = complete    # the engine ran out of results before `limit`
+        self.limit = limit
+        self.elapsed = elapsed      # seconds the live search took
+        self.fetched_at = fetched_at
+
+    def emit(self, limit: int = 0, on_url=None):
+        """Cached URLs (up to `limit`), reported through on_url like a live search."""
+        urls = self.urls[:limit] if limit > 0 else list(self.urls)
+        if on_url:
+            for url in urls:
+                on_url(url)
+        return urls
+
+    def covers(self, limit):
+        """True when this entry answers a search asking for `limit` results (0 = all)."""
+        if self.complete or self.limit <= 0:
+            return True
+        return limit > 0 and self.limit >= limit
+
+
+class SerpCache:
+    """
+    On-disk cache of search engine result pages, keyed by
+    (engine, normalized query, page offset), with a TTL.
+
+    Entries remember the limit they were fetched with, so a cached 10-result search
+    does not answer a later 50-result one (unless the engine had no more results).
+    Hits are counted per engine together with the time the live search took, which
+    is the time the hit saved. The database is opened on first use.
+    """
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS serps (engine TEXT NOT NULL, query TEXT NOT NULL, page INTEGER NOT NULL, "
+        "fetched_at REAL NOT NULL, result_limit INTEGER NOT NULL, complete INTEGER NOT NULL, elapsed REAL NOT NULL, "
+        "urls TEXT NOT NULL, records TEXT, PRIMARY KEY (engine, query, page))",
+    ]
+
+    def __init__(self, path: str = SERP_CACHE_FILE, ttl: float = SERP_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.conn = None
+        self.stats = {}
+
+    def connect(self):
+        if self.conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            for statement in self.SCHEMA:
+                self.conn.execute(statement)
+            self.conn.commit()
+        return self.conn
+
+    def engine_stats(self, engine):
+        return self.stats.setdefault(engine, {"hits": 0, "misses": 0, "saved_seconds": 0.0})
+
+    def get(self, engine, query, page: int = 0, limit: int = 0):
+        """Fresh SerpEntry covering `limit`, else None."""
+        with self.lock:
+            row = self.connect().execute(
+                "SELECT urls, records, complete, result_limit, elapsed, fetched_at FROM serps "
+                "WHERE engine = ? AND query = ? AND page = ?",
+                (engine, normalize_query(query), page)
+            ).fetchone()
+            stats = self.engine_stats(engine)
+            entry = None
+            if row is not None and time.time() - row[5] <= self.ttl:
+                urls, records, complete, result_limit, elapsed, fetched_at = row
+                entry = SerpEntry(json.loads(urls), json.loads(records) if records else None,
+                                  bool(complete), result_limit, elapsed, fetched_at)
+                if not entry.covers(limit):
+                    entry = None
+            if entry is None:
+                stats["misses"] += 1
+                return None
+            stats["hits"] += 1
+            stats["saved_seconds"] += entry.elapsed
+        return entry
+
+    def put(self, engine, query, urls, page: int = 0, limit: int = 0, complete: bool = True,
+            elapsed: float = 0.0, records=None):
+        with self.lock:
+            conn = self.connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO serps (engine, query, page, fetched_at, result_limit, complete, elapsed, urls, records) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (engine, normalize_query(query), page, time.time(), limit, int(complete), elapsed,
+                 json.dumps(list(urls)), json.dumps(records) if records is not None else None)
+            )
+            conn.commit()
+
+    def count(self):
+        with self.lock:
+            return self.connect().execute("SELECT COUNT(*) FROM serps").fetchone()[0]
+
+    def clear(self):
+        with self.lock:
+            self.connect().execute("DELETE FROM serps")
+            self.conn.commit()
+
+    def summary(self):
+        """Per engine: hits, misses, hit_ratio, saved_seconds."""
+        with self.lock:
+            totals = {}
+            for engine, entry in self.stats.items():
+                lookups = entry["hits"] + entry["misses"]
+                totals[engine] = dict(entry, hit_ratio=entry["hits"] / lookups if lookups else 0.0)
+            return totals
+
+    def print_summary(self):
+        for engine, entry in sorted(self.summary().items()):
+            console.print(
+                f"[dim]SERP cache ({engine}): {entry['hits']}/{entry['hits'] + entry['misses']} hits "
+                f"({entry['hit_ratio']:.0%}), ~{entry['saved_seconds']:.0f}s of searching saved[/dim]"
+            )
+
+
+_serp_cache = None
+_serp_lock = threading.Lock()
+
+def get_serp_cache():
+    """Process-wide SERP cache shared by every engine and thread."""
+    global _serp_cache
+    with _serp_lock:
+        if _serp_cache is None:
+            _serp_cache = SerpCache()
+        return _serp_cache
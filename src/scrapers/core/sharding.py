@@ -0,0 +1,149 @@
+import multiprocessing
+import queue
+from rich.console import Console
+from tqdm import tqdm
+from src.core.processed import domain_hash
+from src.core.checkpoint import get_crawl_checkpoint
+from src.core.utils import load_processed_sites, flush_processed_sites
+from src.core.data_manager import MasterDataManager
+from src.scrapers.core.browser_pool import get_browser_pool, close_thread_pools
+from src.scrapers.core.page_cache import get_page_cache
+from src.scrapers.core.deep_crawler import AsyncDeepCrawler, BatchWriter, crawl_pool, plan_domains, replay_unsaved
+
+console = Console()
+
+
+def shard_of(root, shards):
+    """Stable shard of a root domain (same in every process and run)."""
+    return domain_hash(root) % shards
+
+
+def partition(domain_map, shards):
+    parts = [{} for _ in range(shards)]
+    for root, pages in domain_map.items():
+        parts[shard_of(root, shards)][root] = pages
+    return parts
+
+
+def crawl_shard(shard, domain_map, results, concurrency, use_checkpoint, cache_only, crawler_factory=None):
+    """
+    Entry point of one crawler process: its own event loop, browser and crawler.
+    Results go back to the parent as ("result", root, entity); the last message
+    is ("done", shard, tier stats) or ("error", shard, message).
+    """
+    if cache_only:
+        get_page_cache().cache_only = True
+    checkpoint = get_crawl_checkpoint() if use_checkpoint else None
+
+    async def main():
+        crawler = crawler_factory() if crawler_factory else AsyncDeepCrawler(headless=True)
+
+        async def emit(root, entity):
+            results.put(("result", root, entity))
+
+        try:
+            await crawl_pool(domain_map, crawler, emit, concurrency, checkpoint)
+        finally:
+            await crawler.close()
+        return crawler.tier_stats()
+
+    try:
+        results.put(("done", shard, get_browser_pool().run(main())))
+    except BaseException as e:
+        results.put(("error", shard, repr(e)))
+    finally:
+        if checkpoint is not None:
+            checkpoint.release()
+        close_thread_pools()
+
+
+def run_sharded(urls, output_file, city=None, storage="journal", shards: int = 2, concurrency: int = 5,
+                track_processed: bool = True, cache_only: bool = False, manager=None, save_every: int = 10,
+                crawler_factory=None):
+    """
+    Deep Study split across `shards` processes, for when one event loop driving one
+    Chromium runs out of CPU (regex extraction, Playwright IPC).
+
+    Root domains are partitioned by hash, so a site (and its politeness budget)
+    always belongs to one process. Each process runs the same crawl pool as
+    run_batch with `concurrency` workers; this process is the only writer: it
+    upserts every result into the master list, the processed log and the
+    checkpoint. `crawler_factory` must be picklable (a module-level function).
+    """
+    owns_manager = manager is None
+    if owns_manager:
+        manager = MasterDataManager(output_file, city=city, storage=storage)
+    checkpoint = get_crawl_checkpoint() if track_processed else None
+    writer = BatchWriter(manager, track_processed, checkpoint, save_every)
+
+    processed_domains = load_processed_sites() if track_processed else set()
+    if checkpoint is not None:
+        replay_unsaved(checkpoint, writer)
+    domain_map = plan_domains(urls, processed_domains, checkpoint)
+    if not domain_map:
+        console.print("[green]All entities already processed![/green]")
+        if owns_manager:
+            manager.close()
+        return {}
+
+    # Spawn, not fork: the parent may already run threads (browser pool, exporters)
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    parts = [part for part in partition(domain_map, max(1, shards)) if part]
+    processes = [
+        context.Process(target=crawl_shard, daemon=True,
+                        args=(i, part, results, concurrency, checkpoint is not None, cache_only, crawler_factory))
+        for i, part in enumerate(parts)
+    ]
+    for process in processes:
+        process.start()
+    console.print(f"[bold magenta]Crawling {len(domain_map)} domains in {len(processes)} processes "
+                  f"({concurrency} concurrent each)...[/bold magenta]")
+
+    tiers = {}
+    running = set(range(len(processes)))
+    try:
+        with tqdm(total=len(domain_map), desc="Analyzing Entities (Sharded)") as pbar:
+            while running:
+                try:
+                    kind, key, payload = results.get(timeout=1)
+                except queue.Empty:
+                    for i in list(running):
+                        if not processes[i].is_alive():
+                            # Died without reporting: its domains stay in the checkpoint
+                            console.print(f"[red]Shard {i} exited with code {processes[i].exitcode}[/red]")
+                            running.discard(i)
+                    continue
+                if kind == "result":
+                    writer.add(key, payload)
+                    pbar.update(1)
+                elif kind == "done":
+                    running.discard(key)
+                    for name, value in payload.items():
+                        if isinstance(value, int):
+                            tiers[name] = tiers.get(name, 0) + value
+                else:
+                    console.print(f"[red]Shard {key} failed: {payload}[/red]")
+                    running.discard(key)
+    except KeyboardInterrupt:
+        console.print("\n[bold red]Interrupted! Saving progress...[/bold red]")
+    finally:
+        writer.save()
+        for process in processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        if track_processed:
+            flush_processed_sites()
+        if owns_manager:
+            manager.close()
+
+    console.print(f"[bold green]Entity Analysis Complete ({len(processes)} shards). Master List Updated.[/bold green]")
+    if tiers:
+        console.print(
+            f"[dim]Fetch tiers: {tiers.get('cache', 0)} from cache, {tiers.get('http', 0)} via HTTP, "
+            f"{tiers.get('browser', 0)} via browser ({tiers.get('escalated', 0)} escalated)[/dim]"
+        )
+    if checkpoint is not None:
+        checkpoint.print_summary()
+    return tiers
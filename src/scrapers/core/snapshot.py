@@ -0,0 +1,100 @@
+# --- One-round-trip DOM snapshots ---
+# Reading a page element by element (locator.all() + get_attribute / inner_text /
+# is_visible per anchor, heading and card) costs one Playwright call each, hundreds
+# per page. SNAPSHOT_JS collects everything the extractors read in a single
+# page.evaluate(); the heuristics in deep_crawler and listing then run locally.
+
+SNAPSHOT_JS = """
+(cardSelectors) => {
+    const visible = (el) => {
+        if (!el) return false;
+        const style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.display === 'none') return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    const text = (el) => (el && el.innerText) || '';
+    const telLinks = (root) => Array.from(root.querySelectorAll("a[href^='tel:']"))
+        .map((a) => a.getAttribute('href')).filter(Boolean);
+
+    const meta = document.querySelector("meta[name='description'], meta[property='og:description']");
+    const snapshot = {
+        title: document.title || '',
+        text: text(document.body),
+        meta_description: meta ? (meta.getAttribute('content') || '') : '',
+        h1s: Array.from(document.querySelectorAll('h1')).map((h) => text(h).trim()),
+        img_alts: Array.from(document.querySelectorAll("img[alt*='logo'], img[class*='logo']"))
+            .map((img) => img.getAttribute('alt')).filter(Boolean),
+        links: Array.from(document.querySelectorAll('a[href]'))
+            .map((a) => [a.getAttribute('href'), text(a)]),
+        tel_links: document.body ? telLinks(document.body) : [],
+        scanned_cards: (cardSelectors || []).length > 0,
+        card_selector: null,
+        cards: [],
+    };
+
+    // First selector with at least two substantial cards (same rule as the old locator loop)
+    for (const selector of (cardSelectors || [])) {
+        let elements;
+        try { elements = Array.from(document.querySelectorAll(selector)); } catch (e) { continue; }
+        const valid = elements.filter((el) => text(el).length > 100);
+        if (valid.length < 2) continue;
+        snapshot.card_selector = selector;
+        snapshot.cards = valid.map((card) => {
+            const heading = card.querySelector('h2, h3, h4, .title, .name, .store-name');
+            const headingVisible = visible(heading);
+            const headingLink = headingVisible ? heading.querySelector('a') : null;
+            const firstLink = card.querySelector('a');
+            return {
+                text: text(card),
+                heading: headingVisible ? text(heading).trim() : null,
+                heading_href: headingLink ? headingLink.getAttribute('href') : null,
+                first_href: firstLink ? firstLink.getAttribute('href') : null,
+                tel_links: telLinks(card),
+            };
+        });
+        break;
+    }
+    return snapshot;
+}
+"""
+
+EMPTY_SNAPSHOT = {
+    "title": "", "text": "", "meta_description": "", "h1s": [], "img_alts": [],
+    "links": [], "tel_links": [], "scanned_cards": False, "card_selector": None, "cards": [],
+}
+
+
+class PageSnapshot:
+    """
+    Plain-data view of a page. Attribute names match http_fetch.PageParser, so the
+    same name/link heuristics run on browser snapshots and on static HTML.
+    """
+    def __init__(self, data=None):
+        data = {**EMPTY_SNAPSHOT, **(data or {})}
+        self.title = data["title"] or ""
+        self.text = data["text"] or ""
+        self.meta_description = data["meta_description"] or ""
+        self.h1s = list(data["h1s"])
+        self.img_alts = list(data["img_alts"])
+        self.links = [(href, link_text or "") for href, link_text in data["links"] if href]
+        self.tel_links = list(data["tel_links"])
+        self.scanned_cards = bool(data["scanned_cards"])
+        self.card_selector = data["card_selector"]
+        self.cards = list(data["cards"])
+
+
+def take_snapshot(page, card_selectors=None):
+    """Sync API: one evaluate() for the whole page."""
+    try:
+        return PageSnapshot(page.evaluate(SNAPSHOT_JS, list(card_selectors or [])))
+    except Exception:
+        return PageSnapshot()
+
+
+async def take_snapshot_async(page, card_selectors=None):
+    """Async API twin of take_snapshot."""
+    try:
+        return PageSnapshot(await page.evaluate(SNAPSHOT_JS, list(card_selectors or [])))
+    except Exception:
+        return PageSnapshot()
@@ -1,109 +1,121 @@
 import asyncio
+import time
 import urllib.parse
 import base64
 import os
-from playwright.async_api import async_playwright
-from src.core.utils import console, get_random_header, random_delay, normalize_url
+from src.core.utils import console, async_random_delay, normalize_url
 from src.scrapers.utils import extract_local_pack
+from src.scrapers.core.browser_pool import get_browser_pool
+from src.core.rate_limit import get_rate_limiter
+from src.scrapers.core.serp_cache import get_serp_cache
 
-async def search_bing(query: str, limit: int = 50, headless: bool = False):
+async def search_bing(query: str, limit: int = 50, headless: bool = False, on_url=None):
     """
     Searches Bing.com (Async).
     Optimized: Resource blocking, Smart Waits.
+    on_url(url) is called for every new link as soon as it is found.
+    Recent results for the same (normalized) query come from the SERP cache.
     """
+    serp_cache = get_serp_cache()
+    cached = serp_cache.get("bing", query, limit=limit)
+    if cached is not None:
+        console.print(f"[dim]Bing: {len(cached.urls)} cached results for: {query}[/dim]")
+        return cached.emit(limit, on_url)
+
     console.print(f"[bold blue]Starting Bing Search (Async) for:[/bold blue] {query}")
     unique_links = set()
+    started = time.monotonic()
     
     # Bing is strict, default to visible if not specified, 
     # but for "Fast-Headless" request we should try headless=True with stealth if possible?
     # The user asked for "Fast-Headless Mode: Ensure... headless=True".
     # Let's try headless=True but be ready to fail or use stealth args.
     
-    async with async_playwright() as p:
+    context = None
+    try:
+        # Warm shared browser; fresh context with UA rotation + resource blocking
+        context = await get_browser_pool().new_context(
+            headless=headless,
+            viewport={"width": 1366, "height": 768}
+        )
+        
+        page = await context.new_page()
+        
+        console.print("Navigating to Bing...")
+        await get_rate_limiter().wait("https://www.bing.com")
         try:
-            browser = await p.chromium.launch(
-                headless=headless,
-                args=["--disable-gpu", "--disable-dev-shm-usage", "--no-sandbox"]
-            )
-            context = await browser.new_context(
-                viewport={"width": 1366, "height": 768},
-                user_agent=get_random_header()
-            )
-            
-            # --- Resource Blocking ---
-            await context.route("**/*.{png,jpg,jpeg,gif,svg,css,woff,woff2,ico}", lambda route: route.abort())
+            await page.goto(f"https://www.bing.com/search?q={query}&count=50", timeout=15000)
+        except:
+            console.print("[red]Bing navigation timed out.[/red]")
+            return []
             
-            page = await context.new_page()
-            
-            console.print("Navigating to Bing...")
-            try:
-                await page.goto(f"https://www.bing.com/search?q={query}&count=50", timeout=15000)
-            except:
-                console.print("[red]Bing navigation timed out.[/red]")
-                await browser.close()
+        await async_random_delay(1, 2)
+        
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        
+        # CAPTCHA / Challenge Check
+        try:
+            content = await page.content()
+            if "challenge" in content.lower() or "captcha" in content.lower():
+                console.print("[bold red]Bing requires manual interaction![/bold red]")
+                # Async/Headless -> Abort
                 return []
-                
-            random_delay(1, 2)
+        except: pass
             
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            
-            # CAPTCHA / Challenge Check
+        # Local Links (Simplified async check)
+        # Reimplementing basic extraction to avoid sync utils issue
+        try:
+            # Bing Maps often in separate block or distinct class
+            # Just simplified check for now as Bing structure varies
+            pass
+        except: pass
+
+        # Extract links
+        results = await page.locator(".b_algo h2 a").all()
+        
+        if not results:
+            results = await page.locator("li.b_algo h2 a").all()
+        
+        if not results:
+            # console.print("[red]No Bing results found.[/red]")
+            pass
+
+        for r in results:
             try:
-                content = await page.content()
-                if "challenge" in content.lower() or "captcha" in content.lower():
-                    console.print("[bold red]Bing requires manual interaction![/bold red]")
-                    # Async/Headless -> Abort
-                    await browser.close()
-                    return []
-            except: pass
+                href = await r.get_attribute("href")
                 
-            # Local Links (Simplified async check)
-            # Reimplementing basic extraction to avoid sync utils issue
-            try:
-                # Bing Maps often in separate block or distinct class
-                # Just simplified check for now as Bing structure varies
-                pass
-            except: pass
+                if href and "bing.com/ck/" in href:
+                     # Decode logic (same as before)
+                     try:
+                        parsed = urllib.parse.urlparse(href)
+                        qs = urllib.parse.parse_qs(parsed.query)
+                        if "u" in qs:
+                            u_val = qs["u"][0]
+                            if u_val.startswith("a1"): u_val = u_val[2:]
+                            u_val += "=" * ((4 - len(u_val) % 4) % 4)
+                            decoded_bytes = base64.urlsafe_b64decode(u_val)
+                            href = decoded_bytes.decode("utf-8")
+                     except: pass
 
-            # Extract links
-            results = await page.locator(".b_algo h2 a").all()
-            
-            if not results:
-                results = await page.locator("li.b_algo h2 a").all()
-            
-            if not results:
-                # console.print("[red]No Bing results found.[/red]")
-                pass
-
-            for r in results:
-                try:
-                    href = await r.get_attribute("href")
-                    
-                    if href and "bing.com/ck/" in href:
-                         # Decode logic (same as before)
-                         try:
-                            parsed = urllib.parse.urlparse(href)
-                            qs = urllib.parse.parse_qs(parsed.query)
-                            if "u" in qs:
-                                u_val = qs["u"][0]
-                                if u_val.startswith("a1"): u_val = u_val[2:]
-                                u_val += "=" * ((4 - len(u_val) % 4) % 4)
-                                decoded_bytes = base64.urlsafe_b64decode(u_val)
-                                href = decoded_bytes.decode("utf-8")
-                         except: pass
+                if href and href.startswith("http") and "microsoft.com" not in href and "bing.com" not in href:
+                    norm = normalize_url(href)
+                    if norm and norm not in unique_links:
+                        unique_links.add(norm)
+                        console.print(f"Found (Bing): {norm}")
+                        if on_url: on_url(norm)
+                        if limit > 0 and len(unique_links) >= limit:
+                            break
+            except: continue
 
-                    if href and href.startswith("http") and "microsoft.com" not in href and "bing.com" not in href:
-                        norm = normalize_url(href)
-                        if norm and norm not in unique_links:
-                            unique_links.add(norm)
-                            console.print(f"Found (Bing): {norm}")
-                            if limit > 0 and len(unique_links) >= limit:
-                                break
-                except: continue
-                            
-            await browser.close()
-            
-        except Exception as e:
-            console.print(f"[bold red]Bing Async Error:[/bold red] {e}")
+        serp_cache.put(
+            "bing", query, unique_links, limit=limit,
+            complete=limit <= 0 or len(unique_links) < limit, elapsed=time.monotonic() - started
+        )
+        
+    except Exception as e:
+        console.print(f"[bold red]Bing Async Error:[/bold red] {e}")
+    finally:
+        if context is not None:
+            await context.close()
             
     return list(unique_links)
@@ -1,11 +1,23 @@
+import time
 from src.core.utils import console, normalize_url
+from src.core.rate_limit import get_rate_limiter
+from src.scrapers.core.serp_cache import get_serp_cache
 
-def search_ddg(query: str, limit: int = 50, headless: bool = True):
+def search_ddg(query: str, limit: int = 50, headless: bool = True, on_url=None):
     """
     Searches DuckDuckGo using the DDGS library.
+    on_url(url) is called for every new link as soon as it is found.
+    Recent results for the same (normalized) query come from the SERP cache.
     """
+    serp_cache = get_serp_cache()
+    cached = serp_cache.get("ddg", query, limit=limit)
+    if cached is not None:
+        console.print(f"[dim]DDG: {len(cached.urls)} cached results for: {query}[/dim]")
+        return cached.emit(limit, on_url)
+
     console.print(f"[bold yellow]Starting DuckDuckGo Search for:[/bold yellow] {query}")
     unique_links = set()
+    started = time.monotonic()
     
     try:
         from duckduckgo_search import DDGS
@@ -13,6 +25,7 @@ def search_ddg(query: str, limit: int = 50, headless: bool = True):
         # DDGS is synchronous
         max_results = 100 if limit <= 0 else min(limit, 100)
         
+        get_rate_limiter().acquire("https://duckduckgo.com")
         with DDGS() as ddgs:
             results = ddgs.text(query, max_results=max_results)
             
@@ -24,10 +37,16 @@ def search_ddg(query: str, limit: int = 50, headless: bool = True):
                         if norm and norm not in unique_links:
                             unique_links.add(norm)
                             console.print(f"Found (DDG): {norm}")
+                            if on_url: on_url(norm)
                             if limit > 0 and len(unique_links) >= limit:
                                 break
             else:
                 console.print("[red]DDG returned no results.[/red]")
+
+        serp_cache.put(
+            "ddg", query, unique_links, limit=limit,
+            complete=limit <= 0 or len(unique_links) < limit, elapsed=time.monotonic() - started
+        )
                 
     except Exception as e:
         console.print(f"[bold red]DDG Error:[/bold red] {e}")
@@ -1,209 +1,460 @@
+import asyncio
 import time
+from collections import deque
 import re
 import json
 import os
-from playwright.sync_api import sync_playwright
 from rich.console import Console
-from src.core.utils import get_random_header, random_delay, normalize_url, save_unique_urls
+from src.core.utils import random_delay, normalize_url, save_unique_urls
 from src.core.data_manager import MasterDataManager
+from src.scrapers.core.browser_pool import get_sync_browser_pool, get_browser_pool
+from src.core.rate_limit import get_rate_limiter
+from src.scrapers.core.serp_cache import get_serp_cache
+from src.core.config import MAPS_PLACE_TABS
 
 console = Console()
 
-def search_google_maps(query: str, limit: int = 50, headless: bool = False, output_file: str = "data/master_pg_list.json", city: str = None):
+class MapsCollector:
+    """
+    Per-query bookkeeping shared by the sync and async Maps scrapers:
+    session dedupe, master list upsert, website collection and early exit.
+    """
+    MAX_CONSECUTIVE_DUPLICATES = 5 # Exit early if we hit 5 existing PGs in a row
+
+    def __init__(self, manager, limit: int, on_url=None, owns_manager: bool = True):
+        self.manager = manager
+        self.owns_manager = owns_manager
+        self.limit = limit
+        self.on_url = on_url
+        self.found_websites = set()
+        self.records = []   # side panels seen, kept for the SERP cache
+        self.count = 0
+        self.unique_ids = set()
+        # --- Velocity Optimization ---
+        self.consecutive_duplicates = 0
+
+    def limit_reached(self):
+        return self.limit > 0 and self.count >= self.limit
+
+    def should_exit_early(self):
+        if self.consecutive_duplicates >= self.MAX_CONSECUTIVE_DUPLICATES:
+            console.print(f"[bold yellow]Early Exit: Hit {self.MAX_CONSECUTIVE_DUPLICATES} consecutive existing records. Moving to next search.[/bold yellow]")
+            return True
+        return False
+
+    def ingest(self, data):
+        """Handles one extracted side panel."""
+        # Session Dedupe
+        key = (data["name"] + "|" + data["address"]).lower()
+        if key in self.unique_ids:
+            return
+        self.unique_ids.add(key)
+        self.records.append(data)
+
+        entity = {
+            "name": data["name"],
+            "address": data["address"],
+            "mobile": [data["phone"]] if data["phone"] else [],
+            "website": data["website"],
+            "source": "google.com/maps",
+            "rating": data["rating"],
+            "reviews": data["reviews"]
+        }
+
+        # UPSERT to Master List
+        status = self.manager.upsert_entity(entity)
+
+        if "Matched" in status or "Updated" in status or "Added" in status:
+            # This is "New" or "Useful" data
+            if "Skipped" not in status:
+                self.count += 1
+                self.consecutive_duplicates = 0 # Reset duplicate counter
+                console.print(f"   [green]{status}:[/green] {data['name']} | :phone: {data['phone']}")
+            else:
+                # It matched but was skipped (blacklist/wrong city)
+                self.consecutive_duplicates += 1
+        else:
+            if "Skipped (Already exists)" in status:
+                self.consecutive_duplicates += 1
+                console.print(f"   [dim yellow]Duplicate:[/dim yellow] {data['name']}")
+            else:
+                console.print(f"   [dim red]{status}:[/dim red] {data['name']}")
+
+        if data.get("website"):
+            norm_url = normalize_url(data["website"])
+            if norm_url and norm_url not in self.found_websites:
+                self.found_websites.add(norm_url)
+                if self.on_url:
+                    self.on_url(norm_url)
+
+        if self.count % 5 == 0:
+            self.manager.save_master()
+
+    def replay(self, entry):
+        """Feeds side panels cached by an earlier search through ingest() (upserts + websites)."""
+        console.print(f"[dim]Maps: replaying {len(entry.records or [])} cached places[/dim]")
+        for data in entry.records or []:
+            self.ingest(data)
+            if self.limit_reached():
+                break
+        return self.finish()
+
+    def cache_results(self, query, websites, started):
+        """Stores a finished feed walk in the SERP cache."""
+        get_serp_cache().put(
+            "maps", query, websites, limit=self.limit, complete=not self.limit_reached(),
+            elapsed=time.monotonic() - started, records=self.records
+        )
+
+    def finish(self):
+        # Final Save (also folds the journal into the JSON snapshot)
+        if self.owns_manager:
+            self.manager.close()
+        else:
+            self.manager.save_master()
+        if self.found_websites:
+            save_unique_urls(list(self.found_websites), "data/websites.json")
+        console.print(f"[bold green]Scraping Complete. Processed {self.count} useful records.[/bold green]")
+        return list(self.found_websites)
+
+
+def search_google_maps(query: str, limit: int = 50, headless: bool = False, output_file: str = "data/master_pg_list.json", city: str = None, storage: str = "journal"):
     """
     Scrapes Google Maps and upserts data into the Master List.
     Returns: List of unique website URLs found.
     """
     console.print(f"[bold blue]Starting Google Maps Data Scraper for:[/bold blue] {query}")
-    
+
     # Initialize Data Manager
-    manager = MasterDataManager(output_file, city=city)
-    
+    manager = MasterDataManager(output_file, city=city, storage=storage)
+    collector = MapsCollector(manager, limit)
+
+    cached = get_serp_cache().get("maps", query, limit=limit)
+    if cached is not None:
+        return collector.replay(cached)
+    started = time.monotonic()
+
     url = f"https://www.google.com/maps/search/{query.replace(' ', '+')}"
-    
-    found_websites = set()
-    count = 0
-    unique_ids = set() 
-    
-    # --- Velocity Optimization ---
-    consecutive_duplicates = 0
-    MAX_CONSECUTIVE_DUPLICATES = 5 # Exit early if we hit 5 existing PGs in a row
     consecutive_no_new_data = 0
-    
-    with sync_playwright() as p:
+
+    context = None
+    try:
+        # Warm shared browser, fresh context (UA rotation)
+        context = get_sync_browser_pool().new_context(
+            headless=headless,
+            viewport={"width": 1366, "height": 768},
+            locale="en-US"
+        )
+        page = context.new_page()
+
+        console.print(f"Navigating to: {url}")
+        get_rate_limiter().acquire(url)
+        page.goto(url, timeout=60000)
+
         try:
-            browser = p.chromium.launch(headless=headless)
-            context = browser.new_context(
-                viewport={"width": 1366, "height": 768},
-                user_agent=get_random_header(),
-                locale="en-US"
-            )
-            page = context.new_page()
-            
-            console.print(f"Navigating to: {url}")
-            page.goto(url, timeout=60000)
-            
-            try:
-                page.wait_for_selector('div[role="feed"]', timeout=20000)
-            except:
-                console.print("[yellow]Feed not found. Checking for results...[/yellow]")
-                time.sleep(2)
-            
-            feed = page.locator('div[role="feed"]')
-            
-            processed_indices = set()
-            end_of_list = False
-            
-            while count < limit or (limit <= 0 and not end_of_list):
-                items = feed.locator("div[role='article']").all()
-                if not items:
-                     items = feed.locator("a[href*='/maps/place/']").all()
-
-                new_items_in_loop = 0
-                
-                for i, item in enumerate(items):
-                    if i in processed_indices:
-                        continue
-                        
-                    processed_indices.add(i)
-                    new_items_in_loop += 1
-                    
+            page.wait_for_selector('div[role="feed"]', timeout=20000)
+        except:
+            console.print("[yellow]Feed not found. Checking for results...[/yellow]")
+            time.sleep(2)
+
+        feed = page.locator('div[role="feed"]')
+
+        processed_indices = set()
+        end_of_list = False
+
+        while collector.count < limit or (limit <= 0 and not end_of_list):
+            items = feed.locator("div[role='article']").all()
+            if not items:
+                 items = feed.locator("a[href*='/maps/place/']").all()
+
+            new_items_in_loop = 0
+
+            for i, item in enumerate(items):
+                if i in processed_indices:
+                    continue
+
+                processed_indices.add(i)
+                new_items_in_loop += 1
+
+                try:
+                    item.scroll_into_view_if_needed()
+                    item.click()
+                    # snappier delay
+                    random_delay(0.8, 1.5)
+
                     try:
-                        item.scroll_into_view_if_needed()
-                        item.click() 
-                        # snappier delay
-                        random_delay(0.8, 1.5)
-                        
-                        try:
-                            # Short timeout for panel load
-                            page.wait_for_selector("div[role='main'] h1", timeout=2000)
-                        except: pass
-                            
-                        # EXTRACT DATA
-                        data = extract_panel_data(page)
-                        
-                        # Session Dedupe
-                        key = (data["name"] + "|" + data["address"]).lower()
-                        
-                        if key not in unique_ids:
-                            unique_ids.add(key)
-                            
-                            entity = {
-                                "name": data["name"],
-                                "address": data["address"],
-                                "mobile": [data["phone"]] if data["phone"] else [],
-                                "website": data["website"],
-                                "source": "google.com/maps",
-                                "rating": data["rating"],
-                                "reviews": data["reviews"]
-                            }
-                            
-                            # UPSERT to Master List
-                            status = manager.upsert_entity(entity)
-                            
-                            if "Matched" in status or "Updated" in status or "Added" in status:
-                                # This is "New" or "Useful" data
-                                if "Skipped" not in status:
-                                    count += 1
-                                    consecutive_duplicates = 0 # Reset duplicate counter
-                                    console.print(f"   [green]{status}:[/green] {data['name']} | :phone: {data['phone']}")
-                                else:
-                                    # It matched but was skipped (blacklist/wrong city)
-                                    consecutive_duplicates += 1
-                            else:
-                                if "Skipped (Already exists)" in status:
-                                    consecutive_duplicates += 1
-                                    console.print(f"   [dim yellow]Duplicate:[/dim yellow] {data['name']}")
-                                else:
-                                    console.print(f"   [dim red]{status}:[/dim red] {data['name']}")
-                            
-                            if data.get("website"):
-                                norm_url = normalize_url(data["website"])
-                                if norm_url: found_websites.add(norm_url)
-  
-                            if count % 5 == 0:
-                                manager.save_master()
-                                    
-                        if limit > 0 and count >= limit:
-                            break
-                        
-                        # --- EARLY EXIT LOGIC ---
-                        if consecutive_duplicates >= MAX_CONSECUTIVE_DUPLICATES:
-                            console.print(f"[bold yellow]Early Exit: Hit {MAX_CONSECUTIVE_DUPLICATES} consecutive existing records. Moving to next search.[/bold yellow]")
-                            end_of_list = True
-                            break
-                            
-                    except Exception as e:
-                        pass
-                
-                if end_of_list or (limit > 0 and count >= limit):
-                    break
+                        # Short timeout for panel load
+                        page.wait_for_selector("div[role='main'] h1", timeout=2000)
+                    except: pass
 
-                # Scroll
-                feed.focus()
-                page.mouse.wheel(0, 3000)
-                time.sleep(1.5)
-                
-                if page.locator("text=You've reached the end of the list").is_visible():
-                    break
-                    
-                if new_items_in_loop == 0:
-                    consecutive_no_new_data += 1
-                    if consecutive_no_new_data > 3: # Faster bail out if scrolling isn't working
+                    # EXTRACT DATA
+                    collector.ingest(extract_panel_data(page))
+
+                    if collector.limit_reached():
                         break
-                else:
-                    consecutive_no_new_data = 0
-
-            # Final Save
-            manager.save_master()
-            if found_websites:
-                save_unique_urls(list(found_websites), "data/websites.json")
-                
-            console.print(f"[bold green]Scraping Complete. Processed {count} useful records.[/bold green]")
-            browser.close()
-            return list(found_websites)
-            
-        except Exception as e:
-            console.print(f"[bold red]Critical Error Maps:[/bold red] {e}")
-            return []
 
-def extract_panel_data(page):
+                    # --- EARLY EXIT LOGIC ---
+                    if collector.should_exit_early():
+                        end_of_list = True
+                        break
+
+                except Exception as e:
+                    pass
+
+            if end_of_list or collector.limit_reached():
+                break
+
+            # Scroll
+            feed.focus()
+            page.mouse.wheel(0, 3000)
+            time.sleep(1.5)
+
+            if page.locator("text=You've reached the end of the list").is_visible():
+                break
+
+            if new_items_in_loop == 0:
+                consecutive_no_new_data += 1
+                if consecutive_no_new_data > 3: # Faster bail out if scrolling isn't working
+                    break
+            else:
+                consecutive_no_new_data = 0
+
+        websites = collector.finish()
+        collector.cache_results(query, websites, started)
+        return websites
+
+    except Exception as e:
+        console.print(f"[bold red]Critical Error Maps:[/bold red] {e}")
+        return []
+    finally:
+        if context is not None:
+            try: context.close()
+            except: pass
+
+# --- Async engine: harvest place URLs, then open them in parallel tabs ---
+# Every place in the feed links to its own /maps/place/ page. Instead of clicking
+# the entries one by one (and waiting for each side panel), the feed is scrolled
+# in the background while up to MAPS_PLACE_TABS place pages load side by side.
+
+# Seconds for the feed to load more entries after a scroll
+FEED_SCROLL_PAUSE = 1.5
+# Place links of the feed in feed order, in one evaluate()
+PLACE_LINKS_JS = """
+() => Array.from(document.querySelectorAll("div[role='feed'] a[href*='/maps/place/']")).map((a) => a.href)
+"""
+
+async def walk_feed(page, found: asyncio.Queue):
     """
-    Extracts details from the currently open side panel.
+    Scrolls the results feed and puts every new place URL on `found` (the queue's
+    maxsize holds the scrolling back until the tabs catch up), then None at the end.
     """
-    data = {"name": "", "phone": "", "address": "", "website": "", "rating": "", "reviews": ""}
-    
+    feed = page.locator('div[role="feed"]')
+    seen = set()
+    consecutive_no_new_data = 0
+    end_of_list = False
     try:
-        h1 = page.locator("div[role='main'] h1").first
-        if h1.is_visible():
-            data["name"] = h1.inner_text()
-            
-        try:
-            stars = page.locator("div[role='main'] span[aria-label*='stars']").first
-            if stars.is_visible():
-                 aria = stars.get_attribute("aria-label")
-                 data["rating"] = aria
-        except: pass
+        while True:
+            new_items = 0
+            for href in await page.evaluate(PLACE_LINKS_JS):
+                if href not in seen:
+                    seen.add(href)
+                    new_items += 1
+                    await found.put(href)
+            if end_of_list:
+                break
 
+            if new_items == 0:
+                consecutive_no_new_data += 1
+                if consecutive_no_new_data > 3: # Faster bail out if scrolling isn't working
+                    break
+            else:
+                consecutive_no_new_data = 0
+
+            # Scroll
+            await feed.focus()
+            await page.mouse.wheel(0, 3000)
+            await asyncio.sleep(FEED_SCROLL_PAUSE)
+            end_of_list = await page.locator("text=You've reached the end of the list").is_visible()
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        pass
+    await found.put(None)
+
+async def fetch_place(context, place_url):
+    """Side panel data of one place page opened in its own tab (None if it did not load)."""
+    tab = None
+    try:
+        tab = await context.new_page()
+        await tab.goto(place_url, timeout=30000, wait_until="domcontentloaded")
         try:
-            addr_btn = page.locator("button[data-item-id='address']").first
-            if addr_btn.is_visible():
-                data["address"] = addr_btn.get_attribute("aria-label").replace("Address: ", "")
-        except: pass
-        
-        try:
-            phone_btn = page.locator("button[data-item-id*='phone']").first
-            if phone_btn.is_visible():
-                raw_phone = phone_btn.get_attribute("aria-label").replace("Phone: ", "")
-                data["phone"] = raw_phone
+            await tab.wait_for_selector("div[role='main'] h1", timeout=10000)
         except: pass
-        
+        data = await extract_panel_data_async(tab)
+        return data if data["name"] else None
+    except Exception:
+        return None
+    finally:
+        if tab is not None:
+            try: await tab.close()
+            except: pass
+
+async def search_google_maps_async(query: str, limit: int = 50, headless: bool = False, output_file: str = "data/master_pg_list.json", city: str = None, storage: str = "journal", on_url=None, manager=None, tabs: int = MAPS_PLACE_TABS):
+    """
+    Async Maps engine (same upsert and early exit as search_google_maps), so Maps
+    can run concurrently with the organic engines.
+    Place URLs are harvested from the scrolled feed and opened `tabs` at a time;
+    panels are ingested in feed order, so the early exit sees the same sequence.
+    on_url(url) is called for every new website as soon as it is found.
+    Pass a shared `manager` when several queries write to the master list at once.
+    """
+    console.print(f"[bold blue]Starting Google Maps Data Scraper (Async) for:[/bold blue] {query}")
+
+    owns_manager = manager is None
+    if owns_manager:
+        manager = MasterDataManager(output_file, city=city, storage=storage)
+    collector = MapsCollector(manager, limit, on_url=on_url, owns_manager=owns_manager)
+
+    cached = get_serp_cache().get("maps", query, limit=limit)
+    if cached is not None:
+        return collector.replay(cached)
+    started = time.monotonic()
+
+    url = f"https://www.google.com/maps/search/{query.replace(' ', '+')}"
+
+    context = None
+    walker = None
+    in_flight = deque()
+    try:
+        context = await get_browser_pool().new_context(
+            headless=headless,
+            block_resources=False,
+            viewport={"width": 1366, "height": 768},
+            locale="en-US"
+        )
+        page = await context.new_page()
+
+        console.print(f"Navigating to: {url}")
+        await get_rate_limiter().wait(url)
+        await page.goto(url, timeout=60000)
+
         try:
-            web_link = page.locator("a[data-item-id='authority']").first
-            if web_link.is_visible():
-                href = web_link.get_attribute("href")
-                data["website"] = href
-        except: pass
-        
-    except: pass
+            await page.wait_for_selector('div[role="feed"]', timeout=20000)
+        except:
+            console.print("[yellow]Feed not found. Checking for results...[/yellow]")
+            await asyncio.sleep(2)
+
+        found = asyncio.Queue(maxsize=2 * tabs)
+        walker = asyncio.create_task(walk_feed(page, found))
+        feed_done = False
+
+        while True:
+            # Keep `tabs` place pages loading; only wait on the feed when no tab is busy
+            while not feed_done and len(in_flight) < tabs and (found.qsize() or not in_flight):
+                place_url = await found.get()
+                if place_url is None:
+                    feed_done = True
+                else:
+                    in_flight.append(asyncio.create_task(fetch_place(context, place_url)))
+            if not in_flight:
+                break
+
+            data = await in_flight.popleft()
+            if data is None:
+                continue
+            collector.ingest(data)
+
+            if collector.limit_reached():
+                break
+            # --- EARLY EXIT LOGIC ---
+            if collector.should_exit_early():
+                break
+
+        websites = collector.finish()
+        collector.cache_results(query, websites, started)
+        return websites
+
+    except asyncio.CancelledError:
+        # Timed out / cancelled by the waterfall: keep what we already upserted
+        collector.finish()
+        raise
+    except Exception as e:
+        console.print(f"[bold red]Critical Error Maps (Async):[/bold red] {e}")
+        return []
+    finally:
+        # Places still loading and the feed walk are not needed any more
+        pending = list(in_flight) + ([walker] if walker is not None else [])
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if context is not None:
+            try: await context.close()
+            except: pass
+
+# --- Side panel in one round trip ---
+# Reading the panel field by field (locator + is_visible + inner_text/get_attribute
+# for the name, stars, address, phone and website) costs 10+ Playwright calls per
+# place. PANEL_JS reads the same elements with the same "first match, if visible"
+# rule in a single evaluate(), with fallbacks when a field has no aria-label.
+PANEL_JS = """
+() => {
+    const visible = (el) => {
+        if (!el) return false;
+        const style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.display === 'none') return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    const shown = (selector) => {
+        const el = document.querySelector(selector);
+        return visible(el) ? el : null;
+    };
+    const label = (el) => el ? (el.getAttribute('aria-label') || '') : '';
+
+    const h1 = shown("div[role='main'] h1");
+    const stars = shown("div[role='main'] span[aria-label*='stars']")
+        || shown("div[role='main'] [role='img'][aria-label*='stars']");
+    const address = shown("button[data-item-id='address']");
+    const phone = shown("button[data-item-id*='phone']");
+    const website = shown("a[data-item-id='authority']");
+    return {
+        name: h1 ? (h1.innerText || '') : '',
+        rating: label(stars),
+        address: address ? (label(address) || address.innerText || '') : '',
+        // data-item-id is "phone:tel:<number>" when the button has no label
+        phone: phone ? (label(phone) || (phone.getAttribute('data-item-id') || '').replace(/^phone:(tel:)?/, '')) : '',
+        website: website ? (website.getAttribute('href') || website.innerText || '') : '',
+    };
+}
+"""
+
+def panel_from_snapshot(raw):
+    """extract_panel_data's dict from a PANEL_JS result"""
+    data = {"name": "", "phone": "", "address": "", "website": "", "rating": "", "reviews": ""}
+    if not isinstance(raw, dict):
+        return data
+    data["name"] = raw.get("name") or ""
+    data["rating"] = raw.get("rating") or ""
+    data["address"] = (raw.get("address") or "").replace("Address: ", "").strip()
+    data["phone"] = (raw.get("phone") or "").replace("Phone: ", "").strip()
+    data["website"] = raw.get("website") or ""
     return data
+
+def extract_panel_data(page):
+    """
+    Extracts details from the currently open side panel (one evaluate()).
+    """
+    try:
+        return panel_from_snapshot(page.evaluate(PANEL_JS))
+    except Exception:
+        return panel_from_snapshot(None)
+
+async def extract_panel_data_async(page):
+    """
+    Async twin of extract_panel_data.
+    """
+    try:
+        return panel_from_snapshot(await page.evaluate(PANEL_JS))
+    except Exception:
+        return panel_from_snapshot(None)
@@ -0,0 +1,14 @@
+import pytest
+
+from src.core import data_manager
+
+
+class NullExporter:
+    def request(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def no_excel_export(monkeypatch):
+    """Keeps save_master from exporting test data to the real data/perfect_pg_list.xlsx at exit."""
+    monkeypatch.setattr(data_manager, "get_background_exporter", NullExporter)
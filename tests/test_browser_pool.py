@@ -0,0 +1,86 @@
+import asyncio
+
+from src.scrapers.core.browser_pool import BrowserPool
+
+
+class FakeContext:
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+        self.routes = []
+
+    async def route(self, pattern, handler):
+        self.routes.append(pattern)
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        return FakeContext(kwargs)
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeChromium:
+    def __init__(self):
+        self.launched = []
+
+    async def launch(self, headless=True, args=None):
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+
+    async def stop(self):
+        pass
+
+
+def make_pool():
+    pool = BrowserPool()
+    fake = FakePlaywright()
+
+    async def seed():
+        # Bind the pool to the runner loop, then swap in the fake driver
+        pool.loop = asyncio.get_running_loop()
+        pool.lock = asyncio.Lock()
+        pool.playwright = fake
+
+    pool.run(seed())
+    return pool, fake
+
+
+def test_pool_launches_once_per_mode():
+    pool, fake = make_pool()
+
+    async def crawl():
+        contexts = await asyncio.gather(*[pool.new_context(headless=True) for _ in range(10)])
+        await pool.new_context(headless=False, block_resources=False)
+        return contexts
+
+    contexts = pool.run(crawl())
+    assert len(fake.chromium.launched) == 2
+    assert pool.stats == {"launches": 2, "contexts": 11, "reused": 9}
+    assert all(c.routes and c.kwargs["user_agent"] for c in contexts)
+
+    # Warm across separate run() calls (e.g. one per query)
+    pool.run(pool.new_context(headless=True))
+    assert pool.stats["launches"] == 2
+    pool.shutdown()
+
+
+def test_pool_relaunches_crashed_browser():
+    pool, fake = make_pool()
+    pool.run(pool.new_context())
+    fake.chromium.launched[0].connected = False
+    pool.run(pool.new_context())
+    assert pool.stats["launches"] == 2
+    pool.shutdown()
@@ -0,0 +1,97 @@
+import asyncio
+import subprocess
+import sys
+
+from src.core.checkpoint import CrawlCheckpoint
+from src.scrapers.core import deep_crawler
+
+
+CRASHING_RUN = """
+import os, sys
+from src.core.checkpoint import CrawlCheckpoint
+checkpoint = CrawlCheckpoint(sys.argv[1])
+checkpoint.enqueue({"a.com": ["https://a.com"], "b.com": ["https://b.com/x"], "c.com": []})
+checkpoint.start("a.com")
+checkpoint.start("b.com")
+checkpoint.finish("b.com", {"root_domain": "b.com", "name": "B PG"})
+os._exit(1)   # killed mid-batch: a.com in flight, b.com crawled but not saved
+"""
+
+
+def test_resume_after_crash_restarts_only_unfinished(tmp_path):
+    path = str(tmp_path / "checkpoint.db")
+    subprocess.run([sys.executable, "-c", CRASHING_RUN, path], check=False)
+
+    checkpoint = CrawlCheckpoint(path)
+    assert checkpoint.recover() == 1
+    assert checkpoint.unsaved() == [("b.com", {"root_domain": "b.com", "name": "B PG"})]
+    assert checkpoint.unfinished() == {"a.com": ["https://a.com"], "c.com": []}
+
+    checkpoint.mark_saved(["b.com"])
+    assert checkpoint.unsaved() == []
+    assert checkpoint.counts() == {"done": 1, "queued": 2}
+
+
+def test_failures_back_off_then_give_up(tmp_path):
+    checkpoint = CrawlCheckpoint(str(tmp_path / "checkpoint.db"), max_attempts=3, backoff=5.0, max_delay=8.0)
+    checkpoint.enqueue({"a.com": []})
+
+    assert checkpoint.start("a.com") == 1
+    assert checkpoint.fail("a.com", "timeout") == 5.0
+    assert checkpoint.wait_time("a.com") > 4.0
+    assert checkpoint.start("a.com") == 2
+    assert checkpoint.fail("a.com", "timeout") == 8.0    # 10s capped
+    checkpoint.start("a.com")
+    assert checkpoint.fail("a.com", "timeout") is None
+    assert checkpoint.counts() == {"failed": 1}
+    assert checkpoint.unsaved() == [("a.com", None)]     # still has to be marked processed
+
+
+class FlakyCrawler:
+    attempts = {}
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def sub_process_domain(self, root, pages):
+        FlakyCrawler.attempts[root] = FlakyCrawler.attempts.get(root, 0) + 1
+        if root == "flaky.com" and FlakyCrawler.attempts[root] == 1:
+            raise deep_crawler.CrawlFailed("flaky.com unreachable")
+        return {"root_domain": root, "name": root}
+
+    def print_tier_stats(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeManager:
+    def __init__(self):
+        self.upserts = []
+
+    def upsert_entity(self, entity):
+        self.upserts.append(entity["root_domain"])
+        return "Inserted"
+
+    def save_master(self):
+        pass
+
+
+def test_run_batch_retries_transient_failures(monkeypatch, tmp_path):
+    processed = set()
+    FlakyCrawler.attempts = {}
+    monkeypatch.setattr(deep_crawler, "AsyncDeepCrawler", FlakyCrawler)
+    monkeypatch.setattr(deep_crawler, "load_processed_sites", lambda: processed)
+    monkeypatch.setattr(deep_crawler, "mark_as_processed", processed.add)
+    checkpoint = CrawlCheckpoint(str(tmp_path / "checkpoint.db"), backoff=0.05)
+    manager = FakeManager()
+
+    urls = ["https://ok.com", "https://flaky.com/rooms", "https://www.other.com"]
+    asyncio.run(deep_crawler.run_batch(urls, None, manager=manager, checkpoint=checkpoint))
+
+    assert FlakyCrawler.attempts == {"ok.com": 1, "flaky.com": 2, "other.com": 1}
+    assert sorted(manager.upserts) == ["flaky.com", "ok.com", "other.com"]
+    assert processed == {"ok.com", "flaky.com", "other.com"}
+    assert checkpoint.counts() == {"done": 3}
+    assert checkpoint.unsaved() == []
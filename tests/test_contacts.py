@@ -0,0 +1,38 @@
+from src.core.contacts import CONTACTS, clean_phone
+
+PAGE = """Sunrise PG for Boys
+Call +91 98765-43210 or 079 2630 1234
+WhatsApp: 09988776655
+Email: stay@sunrisepg.in, 9123456780@gmail.com
+12, Shanti Nagar, Opp. Gurukul Road
+Ahmedabad 380052
+Rooms from Rs 6,500"""
+
+
+def test_single_pass_finds_everything():
+    found = CONTACTS.extract(PAGE)
+
+    # Same rules as before: a 0-prefixed landline and a numeric email local part also count
+    assert found.phones == {"9876543210", "9988776655", "7926301234", "9123456780"}
+    assert found.emails == {"stay@sunrisepg.in", "9123456780@gmail.com"}
+    assert found.pincodes == {"380052"}
+    assert found.address_lines == ["12, Shanti Nagar, Opp. Gurukul Road", "Ahmedabad 380052"]
+
+
+def test_clean_phone_variants():
+    assert clean_phone("+91 98765 43210") == "9876543210"
+    assert clean_phone("09876543210") == "9876543210"
+    assert clean_phone("tel:919876543210") == "9876543210"
+    assert clean_phone("2630 1234") is None
+    assert clean_phone(None) is None
+
+
+def test_long_lines_are_not_address_candidates():
+    text = "near " + "x" * 200 + "\nSector 21, Gandhinagar"
+    assert CONTACTS.extract(text).address_lines == ["Sector 21, Gandhinagar"]
+
+
+def test_pincode_needs_word_boundaries():
+    found = CONTACTS.extract("Flat A380052, Ahmedabad\nPIN: 380009\nRef 1234567")
+    assert found.pincodes == {"380009"}
+    assert found.address_lines == ["PIN: 380009"]
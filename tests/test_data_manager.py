@@ -0,0 +1,194 @@
+from src.core.data_manager import MasterDataManager
+
+
+def make_manager(tmp_path):
+    return MasterDataManager(str(tmp_path / "master.json"))
+
+
+def test_upsert_matches_by_domain(tmp_path):
+    manager = make_manager(tmp_path)
+    assert manager.upsert_entity({"name": "Shree PG", "source": "https://www.shreepg.com", "mobile": ["9876543210"]}) == "Inserted"
+    assert manager.upsert_entity({"name": "Other Name", "source": "https://shreepg.com/contact", "mobile": ["+91 98765 43211"]}) == "Updated"
+    assert len(manager.data) == 1
+    assert sorted(manager.data[0]["mobile"]) == ["9876543210", "9876543211"]
+
+
+def test_upsert_matches_by_name(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.upsert_entity({"name": "Shree PG", "source": "https://shreepg.com"})
+    assert manager.upsert_entity({"name": "SHREE P.G.", "source": "google.com/maps"}) == "Updated"
+    assert len(manager.data) == 1
+
+
+def test_maps_records_do_not_collapse_on_shared_source(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.upsert_entity({"name": "Alpha PG", "source": "google.com/maps", "mobile": ["9876543210"]})
+    manager.upsert_entity({"name": "Beta PG", "source": "google.com/maps", "mobile": ["9876543211"]})
+    assert len(manager.data) == 2
+
+
+def test_indexes_survive_reload(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.upsert_entity({"name": "Shree PG", "source": "https://shreepg.com"})
+    manager.upsert_entity({"name": "Maps Only PG", "source": "google.com/maps"})
+    # Merge fills in a website -> its domain becomes a match key
+    manager.upsert_entity({"name": "Maps Only PG", "source": "google.com/maps", "website": "https://mapsonly.in"})
+    manager.save_master()
+
+    reloaded = make_manager(tmp_path)
+    assert reloaded.domain_index["shreepg.com"] == 0
+    assert reloaded.domain_index["mapsonly.in"] == 1
+    assert reloaded.upsert_entity({"name": "x", "website": "https://mapsonly.in/about"}) == "Updated"
+
+
+def test_journal_appends_and_replays(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.upsert_entity({"name": "Shree PG", "source": "https://shreepg.com", "mobile": ["9876543210"]})
+    manager.save_master()  # first save writes the snapshot
+
+    manager.upsert_entity({"name": "Shree PG", "source": "https://shreepg.com", "mobile": ["9876543211"]})
+    manager.upsert_entity({"name": "Krishna PG", "source": "https://krishnapg.in"})
+    manager.save_master()
+
+    journal = tmp_path / "master.journal.jsonl"
+    assert len(journal.read_text().splitlines()) == 2
+
+    reloaded = make_manager(tmp_path)
+    assert len(reloaded.data) == 2
+    assert sorted(reloaded.data[0]["mobile"]) == ["9876543210", "9876543211"]
+
+
+def test_journal_compaction_and_torn_line(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.upsert_entity({"name": "Shree PG", "source": "https://shreepg.com"})
+    manager.save_master()
+    manager.upsert_entity({"name": "Krishna PG", "source": "https://krishnapg.in"})
+    manager.save_master()
+
+    journal = tmp_path / "master.journal.jsonl"
+    with open(journal, "a") as f:
+        f.write('{"i": 2, "e": {"name": "tor')
+
+    reloaded = make_manager(tmp_path)
+    assert len(reloaded.data) == 2
+
+    reloaded.compact()
+    assert not journal.exists()
+    assert len(make_manager(tmp_path).data) == 2
+
+
+def test_journal_flush_after_torn_line(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.upsert_entity({"name": "Shree PG", "source": "https://shreepg.com"})
+    manager.save_master()
+    manager.upsert_entity({"name": "Krishna PG", "source": "https://krishnapg.in"})
+    manager.save_master()
+
+    journal = tmp_path / "master.journal.jsonl"
+    with open(journal, "a") as f:
+        f.write('{"i": 2, "e": {"name": "tor')
+
+    # The next run appends after the crash: its first entry must not land on the torn line
+    reloaded = make_manager(tmp_path)
+    reloaded.upsert_entity({"name": "Sai PG", "source": "https://saipg.in"})
+    reloaded.save_master()
+
+    assert [e["name"] for e in make_manager(tmp_path).data] == ["Shree PG", "Krishna PG", "Sai PG"]
+
+
+def test_journal_writers_sharing_one_file_keep_each_others_records(tmp_path):
+    seed = make_manager(tmp_path)
+    seed.upsert_entity({"name": "Seed PG", "source": "https://seedpg.in"})
+    seed.close()
+
+    box_a, box_b = make_manager(tmp_path), make_manager(tmp_path)
+    box_a.upsert_entity({"name": "Sun PG", "source": "https://sunpg.in"})
+    box_b.upsert_entity({"name": "Moon PG", "source": "https://moonpg.in"})
+    box_a.save_master()
+    box_b.save_master()                                # both are position 1 of their own list
+    box_a.compact()
+    assert [e["name"] for e in box_a.data] == ["Seed PG", "Sun PG", "Moon PG"]
+
+    # box_b still has the old list: its Sun PG lands on the same record, not a second one
+    box_b.upsert_entity({"name": "Sun PG", "source": "https://sunpg.in", "mobile": ["9876543210"]})
+    box_b.close()
+    entities = make_manager(tmp_path).data
+    assert [e["name"] for e in entities] == ["Seed PG", "Sun PG", "Moon PG"]
+    assert entities[1]["mobile"] == ["9876543210"]
+
+
+def test_legacy_json_backend_rewrites_file(tmp_path):
+    manager = MasterDataManager(str(tmp_path / "master.json"), storage="json")
+    manager.upsert_entity({"name": "Shree PG", "source": "https://shreepg.com"})
+    manager.save_master()
+    assert not (tmp_path / "master.journal.jsonl").exists()
+    assert len(MasterDataManager(str(tmp_path / "master.json")).data) == 1
+
+
+def test_sqlite_backend_matches_and_exports(tmp_path):
+    master = str(tmp_path / "master.json")
+    manager = MasterDataManager(master, storage="sqlite")
+    assert manager.upsert_entity({"name": "Shree PG", "source": "https://shreepg.com", "mobile": ["9876543210"]}) == "Inserted"
+    assert manager.upsert_entity({"name": "SHREE PG", "source": "google.com/maps", "mobile": ["+91 98765 43211"]}) == "Updated"
+    assert manager.store.find_by_phone("9876543211") == manager.store.find_by_phone("9876543210")
+    manager.close()
+
+    # JSON export is a plain list that the default backend can read back
+    assert len(MasterDataManager(master, storage="json").data) == 1
+
+
+def test_sqlite_backend_imports_existing_json(tmp_path):
+    master = str(tmp_path / "master.json")
+    legacy = MasterDataManager(master)
+    legacy.upsert_entity({"name": "Shree PG", "source": "https://shreepg.com"})
+    legacy.close()
+
+    manager = MasterDataManager(master, storage="sqlite")
+    assert manager.store.count() == 1
+    assert manager.upsert_entity({"name": "x", "source": "https://www.shreepg.com/about"}) == "Updated"
+
+
+def test_sqlite_and_journal_backends_alternate_on_one_file(tmp_path):
+    master = str(tmp_path / "master.json")
+    sqlite_run = MasterDataManager(master, storage="sqlite")
+    sqlite_run.upsert_entity({"name": "Shree PG", "source": "https://shreepg.com"})
+    sqlite_run.upsert_entity({"name": "Krishna PG", "source": "https://krishnapg.in"})
+    sqlite_run.close()
+
+    journal_run = MasterDataManager(master)
+    journal_run.upsert_entity({"name": "Sai PG", "source": "https://saipg.in"})
+    journal_run.upsert_entity({"name": "Shree PG", "source": "https://shreepg.com", "mobile": ["9876543210"]})
+    journal_run.save_master()                                     # journal only, no compaction
+
+    # The database picks up what the journal run added, then folds the journal away
+    sqlite_run = MasterDataManager(master, storage="sqlite")
+    assert sqlite_run.store.count() == 3
+    sqlite_run.upsert_entity({"name": "Om PG", "source": "https://ompg.in"})
+    sqlite_run.close()
+    assert not (tmp_path / "master.journal.jsonl").exists()
+
+    entities = {e["name"]: e for e in MasterDataManager(master).data}
+    assert sorted(entities) == ["Krishna PG", "Om PG", "Sai PG", "Shree PG"]
+    assert entities["Shree PG"]["mobile"] == ["9876543210"]
+
+
+def test_sqlite_backend_concurrent_writers(tmp_path):
+    import threading
+
+    master = str(tmp_path / "master.json")
+
+    def worker(n):
+        manager = MasterDataManager(master, storage="sqlite")
+        for i in range(50):
+            # Every worker upserts the same 50 businesses
+            manager.upsert_entity({"name": f"PG {i}", "source": f"https://pg-{i}.com", "mobile": [f"98765{n:02d}{i:03d}"]})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    entities = MasterDataManager(master, storage="sqlite").all_entities()
+    assert len(entities) == 50
+    assert all(len(e["mobile"]) == 5 for e in entities)
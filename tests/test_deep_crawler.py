@@ -0,0 +1,133 @@
+import asyncio
+import time
+
+from src.core.rate_limit import RateLimiter
+from src.scrapers.core.deep_crawler import AsyncDeepCrawler
+from src.scrapers.core.page_cache import PageCache
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    async def inner_text(self):
+        return self.page.body
+
+
+class FakePage:
+    body = "Sunrise PG rooms for boys\nCall 9876543210\nNear Gurukul Road, Ahmedabad"
+
+    async def goto(self, url, timeout=None):
+        await asyncio.sleep(0.01)
+
+    async def wait_for_selector(self, selector, timeout=None):
+        pass
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+    async def evaluate(self, js, arg=None):
+        return {
+            "title": "Sunrise PG | Home", "text": self.body, "h1s": ["Sunrise PG"],
+            "links": [["/contact", "Contact us"]],
+        }
+
+
+class FakeContext:
+    async def new_page(self):
+        return FakePage()
+
+    async def close(self):
+        pass
+
+
+class FakePool:
+    async def new_context(self, **kwargs):
+        return FakeContext()
+
+
+def test_concurrent_domain_crawls_overlap(tmp_path):
+    # One request per second per site, no burst: every contact page waits ~1s
+    crawler = AsyncDeepCrawler(
+        pool=FakePool(), limiter=RateLimiter(site_limit=(1.0, 1)), http_first=False,
+        cache=PageCache(str(tmp_path / "pages.db")),
+    )
+    roots = [f"site{i}.com" for i in range(5)]
+
+    async def crawl_all():
+        return await asyncio.gather(*[crawler.sub_process_domain(r, [f"https://{r}"]) for r in roots])
+
+    start = time.monotonic()
+    results = asyncio.run(crawl_all())
+    elapsed = time.monotonic() - start
+
+    assert all(r and r["mobile"] == ["9876543210"] for r in results)
+    # Run serially that is >= 5s of politeness waits
+    assert elapsed < 2.0
+
+
+class NoBrowserPool:
+    async def new_context(self, **kwargs):
+        raise AssertionError("cache-only crawl opened a browser")
+
+
+def test_cache_only_crawl_replays_cached_pages(tmp_path):
+    cache = PageCache(str(tmp_path / "pages.db"))
+    live = AsyncDeepCrawler(pool=FakePool(), limiter=RateLimiter(site_limit=(1000, 1000)), http_first=False, cache=cache)
+    first = asyncio.run(live.sub_process_domain("sunrise.com", ["https://sunrise.com"]))
+
+    cache.cache_only = True
+    offline = AsyncDeepCrawler(pool=NoBrowserPool(), http_first=False, cache=cache)
+    again = asyncio.run(offline.sub_process_domain("sunrise.com", ["https://sunrise.com"]))
+    missing = asyncio.run(offline.sub_process_domain("other.com", ["https://other.com"]))
+
+    assert again == first
+    assert missing is None
+    assert offline.stats["cache"] == 1
+
+
+class TimedCrawler:
+    def __init__(self, delays):
+        self.delays = delays
+        self.active = self.peak = 0
+
+    async def sub_process_domain(self, root, pages):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delays.get(root, 0.02))
+        self.active -= 1
+        return {"root_domain": root}
+
+    def print_tier_stats(self):
+        pass
+
+
+class OrderManager:
+    def __init__(self):
+        self.order = []
+
+    def upsert_entity(self, entity):
+        self.order.append(entity["root_domain"])
+        return "Inserted"
+
+    def save_master(self):
+        pass
+
+
+def test_run_batch_keeps_window_full_past_slow_site():
+    from src.scrapers.core.deep_crawler import run_batch
+
+    crawler = TimedCrawler({"slow.com": 0.3})
+    manager = OrderManager()
+    urls = ["https://slow.com"] + [f"https://fast{i}.com" for i in range(20)]
+
+    start = time.monotonic()
+    asyncio.run(run_batch(urls, None, manager=manager, track_processed=False, crawler=crawler, concurrency=3))
+    elapsed = time.monotonic() - start
+
+    assert crawler.peak == 3
+    assert len(manager.order) == 21
+    # The other two workers got through every fast site while slow.com was loading
+    assert manager.order[-1] == "slow.com"
+    assert elapsed < 0.6
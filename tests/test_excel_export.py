@@ -0,0 +1,51 @@
+import threading
+import time
+
+from src.exporters.excel import BackgroundExporter, export_to_excel_perfect
+
+
+def test_background_exporter_coalesces_requests():
+    calls = []
+    done = threading.Event()
+
+    def fake_export(input_file, data=None):
+        calls.append(data)
+        done.set()
+
+    exporter = BackgroundExporter(export_fn=fake_export, min_interval=60)
+    exporter.request("master.json", data_fn=lambda: [1])
+    assert done.wait(5)  # first export is not delayed
+
+    for i in range(10):
+        exporter.request("master.json", data_fn=lambda i=i: [i])
+    time.sleep(0.1)
+    assert len(calls) == 1  # still inside the debounce window
+
+    exporter.close()  # end of run: pending export is flushed once
+    assert calls == [[1], [9]]
+    assert exporter.stats == {"requested": 11, "exported": 2, "coalesced": 9, "failed": 0}
+
+
+def test_background_exporter_does_not_block_caller():
+    started = threading.Event()
+
+    def slow_export(input_file, data=None):
+        started.set()
+        time.sleep(0.5)
+
+    exporter = BackgroundExporter(export_fn=slow_export, min_interval=0)
+    t0 = time.monotonic()
+    exporter.request("master.json")
+    assert started.wait(5)
+    exporter.request("master.json")
+    assert time.monotonic() - t0 < 0.4
+    exporter.close()
+    assert exporter.stats["exported"] == 2
+
+
+def test_background_exporter_counts_failed_exports(tmp_path):
+    exporter = BackgroundExporter(export_fn=export_to_excel_perfect, min_interval=0)
+    missing_dir = str(tmp_path / "missing" / "perfect.xlsx")
+    exporter.request("master.json", missing_dir, data_fn=lambda: [{"name": "Shree PG", "mobile": ["9876543210"]}])
+    exporter.close()
+    assert exporter.stats["exported"] == 0 and exporter.stats["failed"] == 1
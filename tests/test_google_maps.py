@@ -0,0 +1,149 @@
+import asyncio
+
+from src.scrapers.engines import google_maps
+
+PLACES = [
+    {"url": f"https://www.google.com/maps/place/PG+{i}", "name": f"PG {i}", "address": f"{i} SG Highway, Ahmedabad",
+     "phone": f"098250 {i:05d}", "website": f"https://pg{i}.in/" if i % 3 == 0 else ""}
+    for i in range(14)
+]
+
+
+def panel_snapshot(place):
+    """What PANEL_JS returns for an open place panel"""
+    return {"name": place["name"], "rating": "4.2 stars", "address": "Address: " + place["address"],
+            "phone": "Phone: " + place["phone"], "website": place["website"]}
+
+
+class Element:
+    def __init__(self, page, selector):
+        self.page, self.selector = page, selector
+
+    first = property(lambda self: self)
+
+    async def focus(self):
+        pass
+
+    async def is_visible(self):
+        return self.page.feed["shown"] >= len(PLACES)      # "You've reached the end of the list"
+
+
+class Page:
+    def __init__(self, feed, opened):
+        self.feed, self.opened, self.place = feed, opened, None
+        self.mouse = self
+
+    async def wheel(self, x, y):
+        self.feed["shown"] += 5
+
+    async def goto(self, url, timeout=None, wait_until="load"):
+        for place in PLACES:
+            if place["url"] == url:
+                self.opened.append(place["name"])
+                # Later places load faster: panels finish out of feed order
+                await asyncio.sleep(0.05 * (3 - len(self.opened) % 4))
+                self.place = place
+
+    async def wait_for_selector(self, selector, timeout=None):
+        pass
+
+    async def evaluate(self, js, arg=None):
+        if js == google_maps.PANEL_JS:
+            return panel_snapshot(self.place)
+        return [place["url"] for place in PLACES[:self.feed["shown"]]]
+
+    def locator(self, selector):
+        return Element(self, selector)
+
+    async def close(self):
+        pass
+
+
+class Pool:
+    def __init__(self):
+        self.opened = []
+
+    async def new_context(self, **kwargs):
+        feed, opened = {"shown": 5}, self.opened
+
+        class Context:
+            async def new_page(self):
+                return Page(feed, opened)
+
+            async def close(self):
+                pass
+
+        return Context()
+
+
+class Manager:
+    def __init__(self, known=()):
+        self.known, self.upserted = set(known), []
+
+    def upsert_entity(self, entity):
+        self.upserted.append(entity["name"])
+        return "Skipped (Already exists)" if entity["name"] in self.known else "Added"
+
+    def save_master(self):
+        pass
+
+
+class NoSerpCache:
+    def get(self, *args, **kwargs):
+        return None
+
+    def put(self, *args, **kwargs):
+        pass
+
+
+def search(monkeypatch, manager, tabs=4):
+    pool = Pool()
+    monkeypatch.setattr(google_maps, "get_browser_pool", lambda: pool)
+    monkeypatch.setattr(google_maps, "get_serp_cache", NoSerpCache)
+    monkeypatch.setattr(google_maps, "save_unique_urls", lambda urls, path: None)
+    monkeypatch.setattr(google_maps, "FEED_SCROLL_PAUSE", 0.01)
+    found = []
+    websites = asyncio.run(google_maps.search_google_maps_async(
+        "PG in Ahmedabad", limit=0, headless=True, on_url=found.append, manager=manager, tabs=tabs
+    ))
+    return pool, websites, found
+
+
+def test_place_tabs_are_ingested_in_feed_order(monkeypatch):
+    manager = Manager()
+    pool, websites, found = search(monkeypatch, manager)
+
+    assert manager.upserted == [place["name"] for place in PLACES]
+    assert sorted(pool.opened) == sorted(manager.upserted)            # every place page opened once
+    assert found == [f"https://pg{i}.in/" for i in range(0, 14, 3)]
+    assert sorted(websites) == sorted(found)
+
+
+def test_early_exit_on_duplicates_stops_the_tabs(monkeypatch):
+    manager = Manager(known=[place["name"] for place in PLACES[3:]])
+    pool, websites, found = search(monkeypatch, manager, tabs=3)
+
+    # 3 new places, then 5 existing ones in a row
+    assert manager.upserted == [place["name"] for place in PLACES[:8]]
+    assert len(pool.opened) <= 8 + 3                                  # at most a window of tabs beyond it
+
+
+def test_panel_is_read_in_one_evaluate():
+    class PanelPage:
+        calls = []
+
+        def evaluate(self, js, arg=None):
+            self.calls.append(js)
+            return {"name": "Sai PG", "rating": "4.2 stars", "address": "Address: 12, SG Highway, Ahmedabad ",
+                    "phone": "Phone: 098250 12345", "website": None}
+
+        def locator(self, selector):
+            raise AssertionError("panel fields are not read one by one")
+
+    page = PanelPage()
+    assert google_maps.extract_panel_data(page) == {
+        "name": "Sai PG", "phone": "098250 12345", "address": "12, SG Highway, Ahmedabad", "website": "",
+        "rating": "4.2 stars", "reviews": "",
+    }
+    assert page.calls == [google_maps.PANEL_JS]
+    assert google_maps.panel_from_snapshot(None)["name"] == ""
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.core.rate_limit import RateLimiter
+from src.scrapers.core.deep_crawler import AsyncDeepCrawler
+from src.scrapers.core.http_fetch import HttpFetcher
+from src.scrapers.core.page_cache import PageCache
+
+pytest.importorskip("httpx")
+
+FILLER = "<p>Spacious rooms with attached bathrooms, home cooked food, Wi-Fi, laundry and 24x7 security for students and working professionals.</p>" * 2
+
+PAGES = {
+    "/": f"""<html><head><title>Sunrise PG | Home</title></head><body>
+        <h1>Sunrise PG</h1>{FILLER}
+        <a href="/contact-us">Contact</a> <a href="https://other.com/contact">Elsewhere</a>
+        </body></html>""",
+    "/contact-us": """<html><body><p>Call <span>98765 43210</span></p>
+        <p>Email: stay@sunrisepg.in</p><p>12 Gurukul Road, near Drive-in, Ahmedabad 380052</p></body></html>""",
+}
+SHELL = """<html><head><title>Loading</title></head><body><div id="root"></div>
+    <script src="/app.js"></script></body></html>"""
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        host = self.headers.get("Host", "")
+        body = SHELL if host.startswith("localhost") else PAGES.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+
+
+class BrowserCalled(Exception):
+    pass
+
+
+class RecordingPool:
+    def __init__(self):
+        self.calls = 0
+
+    async def new_context(self, **kwargs):
+        self.calls += 1
+        raise BrowserCalled()
+
+
+def make_crawler(pool, tmp_path):
+    return AsyncDeepCrawler(
+        pool=pool, limiter=RateLimiter(site_limit=(1000, 1000)), fetcher=HttpFetcher(timeout=2),
+        cache=PageCache(str(tmp_path / "pages.db")),
+    )
+
+
+def test_static_site_is_served_by_http_tier(server, tmp_path):
+    pool = RecordingPool()
+    crawler = make_crawler(pool, tmp_path)
+
+    async def crawl():
+        try:
+            return await crawler.sub_process_domain(f"127.0.0.1:{server}", [])
+        finally:
+            await crawler.close()
+
+    entity = asyncio.run(crawl())
+
+    assert pool.calls == 0
+    assert entity["name"] == "Sunrise PG"
+    assert entity["mobile"] == ["9876543210"]
+    assert entity["email"] == ["stay@sunrisepg.in"]
+    assert "Gurukul Road" in entity["address"]
+    assert crawler.tier_stats()["http_hit_rate"] == 1.0
+
+
+def test_js_shell_escalates_to_browser(server, tmp_path):
+    pool = RecordingPool()
+    crawler = make_crawler(pool, tmp_path)
+
+    async def crawl():
+        try:
+            return await crawler.sub_process_domain(f"localhost:{server}", [])
+        finally:
+            await crawler.close()
+
+    with pytest.raises(BrowserCalled):
+        asyncio.run(crawl())
+
+    assert pool.calls == 1
+    assert crawler.stats == {"cache": 0, "http": 0, "browser": 1, "escalated": 1}
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import time
+
+from src.core.rate_limit import RateLimiter
+from src.scrapers.core.listing import AsyncListingExtractor, ListingOutput, extract_websites
+from src.scrapers.core.page_cache import PageCache
+
+CARD = "Rooms with meals and wifi for students and working professionals, twin and triple sharing available. "
+PAGES = {
+    "https://listings.in/pg": {"title": "PGs", "scanned_cards": True, "cards": [
+        {"text": CARD + "Call 98250 11111", "heading": "Sun PG", "heading_href": None, "first_href": None, "tel_links": []},
+        {"text": CARD, "heading": "Moon PG", "heading_href": "/moon", "first_href": None, "tel_links": []},
+        {"text": CARD, "heading": "Moon PG Annex", "heading_href": None, "first_href": "/moon", "tel_links": []},
+    ]},
+    "https://listings.in/moon": {"text": "Moon PG", "tel_links": ["tel:+91 99250 12345"]},
+    "https://star-pg.in": {"title": "Star PG", "text": "Star PG\nCall 97250 22222\nGota, Ahmedabad 382481"},
+}
+
+
+class FakeLocator:
+    first = property(lambda self: self)
+
+    async def is_visible(self):
+        return False
+
+    async def all(self):
+        return []
+
+
+class FakePage:
+    def __init__(self, visits):
+        self.url = "about:blank"
+        self.visits = visits
+
+    async def goto(self, url, timeout=None):
+        self.visits.append(url)
+        await asyncio.sleep(0.05)
+        self.url = url
+
+    async def wait_for_load_state(self, state, timeout=None):
+        pass
+
+    def locator(self, selector):
+        return FakeLocator()
+
+    async def content(self):
+        return "<html></html>"
+
+    async def evaluate(self, js, arg=None):
+        if js.startswith("window.scrollBy"):
+            return None
+        data = dict(PAGES.get(self.url, {}))
+        data["scanned_cards"] = bool(arg)
+        return data
+
+    async def close(self):
+        pass
+
+
+class FakePool:
+    def __init__(self):
+        self.visits = []
+
+    async def new_context(self, **kwargs):
+        pool = self
+
+        class Context:
+            async def new_page(self):
+                return FakePage(pool.visits)
+
+            async def close(self):
+                pass
+
+        return Context()
+
+
+def test_async_extractor_streams_cards_and_direct_sites(tmp_path):
+    pool = FakePool()
+    extractor = AsyncListingExtractor(pool=pool, limiter=RateLimiter(site_limit=(1000, 1000)),
+                                      cache=PageCache(str(tmp_path / "pages.db")))
+    output_file = tmp_path / "pg.json"
+    output_file.write_text(json.dumps([{"name": "Sun PG", "source": "https://listings.in/pg"}]))
+    output = ListingOutput(str(output_file))
+
+    start = time.perf_counter()
+    asyncio.run(extract_websites(["https://listings.in/pg", "https://star-pg.in"], output,
+                                 concurrency=2, extractor=extractor))
+    elapsed = time.perf_counter() - start
+    output.close()
+
+    saved = {pg["name"]: pg for pg in json.loads(output_file.read_text())}
+    assert set(saved) == {"Sun PG", "Moon PG", "Moon PG Annex", "Star PG"}      # Sun PG was already there
+    assert saved["Moon PG"]["mobile"] == saved["Moon PG Annex"]["mobile"] == ["9925012345"]    # detail page
+    assert saved["Moon PG"]["source"] == "https://listings.in/moon"
+    assert saved["Star PG"]["type"] == "Direct Site" and saved["Star PG"]["address"] == "Gota, Ahmedabad 382481"
+    # Both Moon cards link to one detail page: it is loaded once
+    assert pool.visits == ["https://listings.in/pg", "https://star-pg.in", "https://listings.in/moon"]
+    assert elapsed < 2 * 1.5        # each URL scrolls for 1.5s; they ran side by side
+
+
+def record(name, source="https://listings.in/pg"):
+    return {"name": name, "mobile": ["9825011111"], "email": [], "address": "Not Found", "source": source}
+
+
+def test_output_appends_jsonl_and_keeps_keys_across_runs(tmp_path):
+    output_file = tmp_path / "pg.json"
+    output_file.write_text(json.dumps([record("Sun PG")]))
+
+    first = ListingOutput(str(output_file))
+    assert first.add([record("Sun PG"), record("Moon PG")]) == 1
+    assert first.add([record("Moon PG"), record("Star PG")]) == 1
+    assert len(json.loads(output_file.read_text())) == 1          # untouched until compaction
+    assert len((tmp_path / "pg.jsonl").read_text().splitlines()) == 2
+    first.keys.close()                                            # crash: no compaction
+
+    second = ListingOutput(str(output_file))
+    assert second.add([record("Star PG"), record("Moon\nPG")]) == 1
+    assert second.close() == 4
+    assert [pg["name"] for pg in json.loads(output_file.read_text())] == ["Sun PG", "Moon PG", "Star PG", "Moon\nPG"]
+    assert not (tmp_path / "pg.jsonl").exists()
+
+    output_file.unlink()                                          # deleted by hand: start over
+    third = ListingOutput(str(output_file))
+    assert third.add([record("Sun PG")]) == 1 and third.close() == 1
@@ -0,0 +1,66 @@
+import time
+
+from src.scrapers.core.page_cache import PageCache
+from src.scrapers.core.snapshot import PageSnapshot
+
+
+def test_roundtrip_keyed_by_normalized_url(tmp_path):
+    cache = PageCache(str(tmp_path / "pages.db"))
+    cache.put("http://www.sunrise.com/contact/", PageSnapshot({
+        "title": "Contact", "text": "Call 9876543210", "h1s": ["Sunrise PG"], "links": [["/about", "About"]],
+    }))
+
+    page = cache.get("https://sunrise.com/contact")
+    assert page.text == "Call 9876543210"
+    assert page.h1s == ["Sunrise PG"]
+    assert page.links == [("/about", "About")]
+    assert cache.get("https://sunrise.com/") is None
+
+
+def test_expired_pages_miss_unless_cache_only(tmp_path):
+    cache = PageCache(str(tmp_path / "pages.db"), ttl=0.05)
+    cache.put("https://sunrise.com", "old body")
+    time.sleep(0.1)
+
+    assert cache.get("https://sunrise.com") is None
+    assert cache.summary()["expired"] == 1
+    cache.cache_only = True
+    assert cache.get("https://sunrise.com").text == "old body"
+
+
+def test_least_recently_used_pages_are_evicted_by_size(tmp_path):
+    cache = PageCache(str(tmp_path / "pages.db"))
+    cache.put("https://a.com", "x" * 700)
+    cache.max_bytes = 3 * cache.total_bytes     # room for three pages
+    for name in ("a", "b", "c"):
+        cache.put(f"https://{name}.com", "x" * 700)
+        time.sleep(0.01)
+    cache.get("https://a.com")      # a is now more recent than b
+    time.sleep(0.01)
+    cache.put("https://d.com", "x" * 700)
+
+    assert cache.get("https://b.com") is None
+    assert all(cache.get(f"https://{n}.com") for n in ("a", "c", "d"))
+    assert cache.summary()["bytes"] <= cache.max_bytes
+
+    reopened = PageCache(str(tmp_path / "pages.db"))
+    assert reopened.total_bytes == cache.total_bytes
+
+
+def test_listing_replays_cards_and_detail_pages_from_cache(tmp_path):
+    from src.scrapers.core.listing import extract_from_cache
+
+    cache = PageCache(str(tmp_path / "pages.db"))
+    card = {"heading": None, "heading_href": None, "first_href": None, "tel_links": []}
+    cache.put("https://listings.in/pg", PageSnapshot({"scanned_cards": True, "cards": [
+        dict(card, text="Sunrise PG, Near Gurukul Road, Ahmedabad 380052\nCall 9876543210"),
+        dict(card, text="Moon PG rooms", heading="Moon PG", heading_href="/moon", tel_links=[]),
+    ]}))
+    cache.put("https://listings.in/moon", PageSnapshot({"text": "Moon PG", "tel_links": ["tel:+91 99250 12345"]}))
+    cache.put("https://crawled.in", "Homepage cached by the deep crawler")
+
+    results = extract_from_cache("https://listings.in/pg", cache)
+    assert [r["mobile"] for r in results] == [["9876543210"], ["9925012345"]]
+    assert results[1]["source"] == "https://listings.in/moon"
+    # Not looked at for cards: extract_pg_data has to fetch it
+    assert extract_from_cache("https://crawled.in", cache) is None
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+from src.scrapers.core import pipeline
+
+
+class FakeManager:
+    def __init__(self):
+        self.upserts = []
+
+    def upsert_entity(self, entity):
+        self.upserts.append((time.monotonic(), entity["root_domain"]))
+        return "Inserted"
+
+    def save_master(self):
+        pass
+
+
+class SlowCrawler:
+    active = 0
+    peak = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def sub_process_domain(self, root, pages):
+        SlowCrawler.active += 1
+        SlowCrawler.peak = max(SlowCrawler.peak, SlowCrawler.active)
+        await asyncio.sleep(0.05)
+        SlowCrawler.active -= 1
+        return {"root_domain": root, "name": root, "mobile": ["9876543210"]}
+
+    def tier_stats(self):
+        return {}
+
+    def print_tier_stats(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+def install(monkeypatch, urls, delay, processed=()):
+    produced = []
+
+    async def fake_stream(*args, **kwargs):
+        for url in urls:
+            await asyncio.sleep(delay)
+            produced.append(time.monotonic())
+            yield url
+
+    SlowCrawler.active = SlowCrawler.peak = 0
+    monkeypatch.setattr(pipeline, "stream_waterfall", fake_stream)
+    monkeypatch.setattr(pipeline, "AsyncDeepCrawler", SlowCrawler)
+    monkeypatch.setattr(pipeline, "load_processed_sites", lambda: set(processed))
+    monkeypatch.setattr(pipeline, "mark_as_processed", lambda root: None)
+    return produced
+
+
+def test_first_lead_arrives_before_discovery_ends(monkeypatch):
+    urls = [f"https://site{i}.com/page" for i in range(10)] + ["https://www.site0.com/other"]
+    produced = install(monkeypatch, urls, delay=0.05, processed={"site9.com"})
+    manager = FakeManager()
+
+    stats = asyncio.run(pipeline.DiscoveryPipeline("pg in x", manager=manager, workers=3).run())
+
+    assert stats["domains"] == 9
+    assert stats["skipped"] == 1
+    assert stats["leads"] == 9
+    # Crawling started while the engines were still producing
+    assert manager.upserts[0][0] < produced[-1]
+
+
+def test_bounded_queues_cap_work_in_flight(monkeypatch):
+    urls = [f"https://site{i}.com" for i in range(30)]
+    install(monkeypatch, urls, delay=0)
+
+    stats = asyncio.run(pipeline.DiscoveryPipeline(
+        "pg in x", manager=FakeManager(), workers=2, url_queue_size=2, result_queue_size=2
+    ).run())
+
+    assert stats["leads"] == 30
+    assert SlowCrawler.peak == 2
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+
+from src.core.processed import ProcessedSites
+
+
+def test_marks_survive_restart_via_index_and_log_tail(tmp_path):
+    path = str(tmp_path / "processed_sites.txt")
+    sites = ProcessedSites(path, batch_size=1000, compact_every=3)
+    for domain in ("a.com", "b.com", "c.com", "d.com"):
+        sites.add(domain)
+    assert "a.com" in sites and "e.com" not in sites
+    assert not os.path.exists(path)       # buffered until flush
+    sites.flush()
+    assert os.path.exists(path + ".idx")  # 4 new lines >= compact_every
+
+    sites.add("e.com")
+    sites.add("a.com")                    # already known: not written twice
+    sites.flush()
+    with open(path) as f:
+        assert f.read().split() == ["a.com", "b.com", "c.com", "d.com", "e.com"]
+
+    reopened = ProcessedSites(path)
+    assert len(reopened) == 5
+    assert all(d in reopened for d in ("a.com", "c.com", "e.com"))
+    assert "f.com" not in reopened
+
+
+def test_stale_index_is_ignored_after_fresh(tmp_path):
+    path = str(tmp_path / "processed_sites.txt")
+    sites = ProcessedSites(path)
+    sites.add("a.com")
+    sites.close()
+    os.remove(path)                       # --fresh used to delete only the log
+
+    assert "a.com" not in ProcessedSites(path)
+
+
+WRITER = """
+import sys
+from src.core.processed import ProcessedSites
+sites = ProcessedSites(sys.argv[1], batch_size=50)
+for i in range(1000):
+    sites.add(f"{sys.argv[2]}{i}.com")
+sites.close()
+"""
+
+
+def test_concurrent_runs_do_not_lose_or_tear_lines(tmp_path):
+    path = str(tmp_path / "processed_sites.txt")
+    procs = [
+        subprocess.Popen([sys.executable, "-c", WRITER, path, prefix], cwd=os.getcwd())
+        for prefix in ("x", "y", "z")
+    ]
+    assert all(p.wait(timeout=60) == 0 for p in procs)
+
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 3000 and len(set(lines)) == 3000
+    sites = ProcessedSites(path)
+    assert len(sites) == 3000
+    assert "y999.com" in sites
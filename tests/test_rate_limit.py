@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+from src.core.rate_limit import RateLimiter, TokenBucket
+
+
+def test_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # Third token is 0.1s away, fourth 0.2s
+    assert 0.08 < bucket.reserve() <= 0.1
+    assert 0.18 < bucket.reserve() <= 0.2
+
+
+def test_engines_and_sites_have_separate_budgets():
+    limiter = RateLimiter(engine_limits={"bing.com": (1, 1)}, site_limit=(1, 1), host_limits={"slow.com": (0.5, 1)})
+
+    assert limiter.reserve("https://www.bing.com/search?q=pg") == 0
+    assert limiter.reserve("https://bing.com/search?q=hostel") > 0
+    # Target sites are unaffected by the engine's debt, and each host has its own bucket
+    assert limiter.reserve("https://a.com") == 0
+    assert limiter.reserve("https://b.com/contact") == 0
+    assert limiter.reserve("https://a.com/about") > 0
+    # Subdomains fall under the parent's override
+    limiter.reserve("https://m.slow.com")
+    assert limiter.reserve("https://slow.com/x") > 1.5
+
+    summary = limiter.summary()
+    assert summary["engines"]["requests"] == 2 and summary["engines"]["waited"] == 1
+    assert summary["sites"]["requests"] == 5 and summary["sites"]["waited"] == 2
+
+
+def test_waits_only_block_the_calling_host():
+    limiter = RateLimiter(site_limit=(5, 1))
+
+    async def hit(url, times):
+        for _ in range(times):
+            await limiter.wait(url)
+
+    async def main():
+        await asyncio.gather(hit("https://a.com", 3), hit("https://b.com", 3))
+
+    start = time.monotonic()
+    asyncio.run(main())
+    # 2 paced requests per host at 5/s, hosts in parallel
+    assert 0.35 < time.monotonic() - start < 0.6
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import time
+
+from src.core.data_manager import MasterDataManager
+from src.scrapers.core import pipeline, scheduler
+from src.scrapers.core.deep_crawler import collect_shared
+
+
+class FakeManager:
+    def __init__(self, *args, **kwargs):
+        self.closed = False
+
+    def export_snapshot(self):
+        return []
+
+    def save_master(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeExporter:
+    def __init__(self, *args, **kwargs):
+        self.requests = 0
+
+    def request(self, *args, **kwargs):
+        self.requests += 1
+
+    def close(self):
+        pass
+
+
+class FakeCrawler:
+    crawled = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def sub_process_domain(self, root, pages):
+        FakeCrawler.crawled.append(root)
+        await asyncio.sleep(0.05)
+        return None
+
+    def tier_stats(self):
+        return {}
+
+    def print_tier_stats(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+def test_queries_overlap_and_engine_limit_holds(monkeypatch, tmp_path):
+    in_flight = {"maps": 0, "peak": 0}
+    FakeCrawler.crawled = []
+
+    async def fake_stream(query, *args, engine_limits=None, **kwargs):
+        async with engine_limits["maps"]:
+            in_flight["maps"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["maps"])
+            await asyncio.sleep(0.1)
+            in_flight["maps"] -= 1
+        for url in [f"https://{query}.com", "https://shared.com"]:
+            yield url
+
+    monkeypatch.setattr(scheduler, "MasterDataManager", FakeManager)
+    monkeypatch.setattr(scheduler, "BackgroundExporter", FakeExporter)
+    monkeypatch.setattr(pipeline, "stream_waterfall", fake_stream)
+    monkeypatch.setattr(pipeline, "AsyncDeepCrawler", FakeCrawler)
+    monkeypatch.setattr(pipeline, "load_processed_sites", lambda: set())
+    monkeypatch.setattr(pipeline, "mark_as_processed", lambda root: None)
+
+    status_file = tmp_path / "status.json"
+    queries = [f"q{i}" for i in range(6)]
+    sched = scheduler.QueryScheduler(
+        queries, set(), status_file=str(status_file),
+        concurrency=6, engine_concurrency=2, domain_interval=0
+    )
+
+    start = time.monotonic()
+    stats = asyncio.run(sched.run())
+    elapsed = time.monotonic() - start
+
+    assert stats["done"] == 6
+    assert in_flight["peak"] == 2
+    # 6 searches, 2 at a time -> ~0.3s; sequential would be ~0.6s of search + crawl
+    assert elapsed < 0.6
+    # The shared domain is crawled once across all queries
+    assert FakeCrawler.crawled.count("shared.com") == 1
+    assert sorted(json.loads(status_file.read_text())) == queries
+
+
+def test_domain_slot_spaces_out_visits():
+    politeness = scheduler.DomainPoliteness(min_interval=0.1)
+    visits = []
+
+    async def visit():
+        async with politeness.slot("a.com"):
+            visits.append(time.monotonic())
+
+    async def main():
+        await asyncio.gather(visit(), visit(), visit())
+
+    asyncio.run(main())
+    gaps = [b - a for a, b in zip(visits, visits[1:])]
+    assert all(gap >= 0.09 for gap in gaps)
+
+
+def test_two_boxes_share_one_run_through_the_queue(monkeypatch, tmp_path):
+    from src.core.work_queue import SqliteWorkQueue
+
+    FakeCrawler.crawled = []
+    searched = []
+
+    async def fake_stream(query, *args, manager=None, **kwargs):
+        searched.append(query)
+        # Maps upserts its places; "Shared PG" shows up on every query
+        for name in [f"{query} PG", "Shared PG"]:
+            manager.upsert_entity({"name": name, "address": "Gota, Ahmedabad", "source": "google.com/maps"})
+        await asyncio.sleep(0.02)
+        for url in [f"https://{query}.com", "https://shared.com"]:
+            yield url
+
+    monkeypatch.setattr(pipeline, "stream_waterfall", fake_stream)
+    monkeypatch.setattr(pipeline, "AsyncDeepCrawler", FakeCrawler)
+    monkeypatch.setattr(pipeline, "load_processed_sites", lambda: set())
+    path = str(tmp_path / "queue.db")
+    queries = [f"q{i}" for i in range(6)]
+
+    def box():
+        return scheduler.QueryScheduler(
+            queries, set(), concurrency=2, domain_interval=0,
+            query_queue=SqliteWorkQueue(path, "queries"), domain_queue=SqliteWorkQueue(path, "domains"),
+            place_queue=SqliteWorkQueue(path, "places")
+        )
+
+    async def main():
+        return await asyncio.gather(box().run(), box().run())
+
+    stats = asyncio.run(main())
+
+    assert sorted(searched) == queries                      # every query ran on exactly one box
+    assert sum(s["done"] for s in stats) == 6
+    assert sorted(FakeCrawler.crawled) == sorted([f"q{i}.com" for i in range(6)] + ["shared.com"])
+    assert set(SqliteWorkQueue(path, "queries").results()) == set(queries)
+    assert len(SqliteWorkQueue(path, "domains").results()) == 7
+    # Maps places went to the shared store, not a local master list, and collect merges them
+    places = SqliteWorkQueue(path, "places")
+    assert len(places.results()) == 7
+    master = str(tmp_path / "master.json")
+    collect_shared([SqliteWorkQueue(path, "domains"), places], master)
+    assert {e["name"] for e in MasterDataManager(master).data} == {f"q{i} PG" for i in range(6)} | {"Shared PG"}
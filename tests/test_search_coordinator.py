@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+from src.scrapers.core import search_coordinator
+
+
+def fake_async_engine(urls, delay):
+    async def engine(*args, on_url=None, **kwargs):
+        for url in urls:
+            await asyncio.sleep(delay)
+            on_url(url)
+        return list(urls)
+    return engine
+
+
+def install_fakes(monkeypatch, maps_delay=0.1, brave_delay=0.1):
+    monkeypatch.setattr(search_coordinator, "search_google_maps_async", fake_async_engine(["https://a.com", "https://b.com"], maps_delay))
+    monkeypatch.setattr(search_coordinator, "search_brave", fake_async_engine(["https://b.com", "https://c.com"], brave_delay))
+    monkeypatch.setattr(search_coordinator, "search_bing", fake_async_engine(["https://d.com"], 0.1))
+
+    def ddg(query, limit, headless, on_url=None):
+        time.sleep(0.1)
+        on_url("https://e.com")
+        return ["https://e.com"]
+    monkeypatch.setattr(search_coordinator, "search_ddg", ddg)
+
+
+def test_engines_run_concurrently_and_dedupe(monkeypatch):
+    install_fakes(monkeypatch)
+
+    async def collect():
+        return await search_coordinator.search_waterfall_async("pg in x")
+
+    start = time.monotonic()
+    urls = asyncio.run(collect())
+    elapsed = time.monotonic() - start
+
+    assert sorted(urls) == ["https://a.com", "https://b.com", "https://c.com", "https://d.com", "https://e.com"]
+    # Sequential would be ~0.2 (maps) + 0.2 (brave) + 0.1 + 0.1
+    assert elapsed < 0.45
+
+
+def test_slow_engine_is_cut_off_but_keeps_streamed_urls(monkeypatch):
+    install_fakes(monkeypatch, maps_delay=5)
+
+    async def collect():
+        seen = []
+        async for url in search_coordinator.stream_waterfall("pg in x", timeouts={"maps": 0.3}):
+            seen.append(url)
+        return seen
+
+    start = time.monotonic()
+    urls = asyncio.run(collect())
+    assert time.monotonic() - start < 1.5
+    assert "https://a.com" not in urls
+    assert "https://c.com" in urls
+
+
+def test_consumer_can_stop_early(monkeypatch):
+    install_fakes(monkeypatch, maps_delay=5, brave_delay=0.05)
+
+    async def first():
+        async for url in search_coordinator.stream_waterfall("pg in x", engines=("maps", "brave")):
+            return url
+
+    start = time.monotonic()
+    assert asyncio.run(first()) == "https://b.com"
+    assert time.monotonic() - start < 1
@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+from src.scrapers.core.serp_cache import SerpCache, normalize_query
+from src.scrapers.engines import brave, duckduckgo
+
+
+def test_overlapping_queries_share_a_key():
+    assert normalize_query("PG near Gota, Ahmedabad") == normalize_query("pg in gota ahmedabad")
+    assert normalize_query("Girls PG in Gota Ahmedabad") != normalize_query("PG in Gota Ahmedabad")
+
+
+def test_entry_answers_only_limits_it_covers(tmp_path):
+    cache = SerpCache(str(tmp_path / "serp.db"))
+    cache.put("bing", "pg in gota", ["https://a.com"] * 10, limit=10, complete=False, elapsed=4.0)
+    cache.put("ddg", "pg in gota", ["https://a.com"], limit=50, complete=True, elapsed=2.0)
+
+    assert cache.get("bing", "PG near Gota", limit=5) is not None
+    assert cache.get("bing", "PG near Gota", limit=50) is None
+    assert cache.get("bing", "PG near Gota", limit=0) is None
+    # Engine ran dry: the entry answers any limit
+    assert cache.get("ddg", "pg in gota", limit=500) is not None
+
+    stats = cache.summary()
+    assert stats["bing"]["hits"] == 1 and stats["bing"]["misses"] == 2
+    assert stats["ddg"]["hit_ratio"] == 1.0
+    assert stats["bing"]["saved_seconds"] + stats["ddg"]["saved_seconds"] == 6.0
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = SerpCache(str(tmp_path / "serp.db"), ttl=0.05)
+    cache.put("bing", "pg in gota", ["https://a.com"])
+    time.sleep(0.1)
+    assert cache.get("bing", "pg in gota") is None
+
+
+def test_engines_answer_from_cache_without_searching(tmp_path, monkeypatch):
+    cache = SerpCache(str(tmp_path / "serp.db"))
+    cache.put("ddg", "PG in Gota", ["https://a.com", "https://b.com"], limit=10, complete=True)
+    cache.put("brave", "PG in Gota", ["https://a.com", "https://c.com"], page=1, complete=False)
+    cache.put("brave", "PG in Gota", ["https://d.com"], page=2, complete=True)
+
+    def no_browser():
+        raise AssertionError("cache hit opened a browser")
+
+    monkeypatch.setattr(duckduckgo, "get_serp_cache", lambda: cache)
+    monkeypatch.setattr(duckduckgo, "get_rate_limiter", no_browser)
+    monkeypatch.setattr(brave, "get_serp_cache", lambda: cache)
+    monkeypatch.setattr(brave, "get_browser_pool", no_browser)
+    monkeypatch.setattr(brave, "load_crawler_state", lambda query: 1)
+
+    streamed = []
+    assert duckduckgo.search_ddg("PG near Gota", limit=10, on_url=streamed.append) == ["https://a.com", "https://b.com"]
+    assert streamed == ["https://a.com", "https://b.com"]
+
+    urls = asyncio.run(brave.search_brave("pg near gota", limit=0))
+    assert sorted(urls) == ["https://a.com", "https://c.com", "https://d.com"]
@@ -0,0 +1,58 @@
+import os
+
+from src.scrapers.core.sharding import partition, run_sharded
+
+
+class PidCrawler:
+    """Stand-in crawler that reports which process crawled each domain."""
+    def __init__(self):
+        self.count = 0
+
+    async def sub_process_domain(self, root, pages):
+        self.count += 1
+        return {"root_domain": root, "pid": os.getpid()}
+
+    def tier_stats(self):
+        return {"http": self.count}
+
+    async def close(self):
+        pass
+
+
+def make_crawler():
+    return PidCrawler()
+
+
+class RecordingManager:
+    def __init__(self):
+        self.entities = []
+        self.saves = 0
+
+    def upsert_entity(self, entity):
+        self.entities.append(entity)
+        return "Inserted"
+
+    def save_master(self):
+        self.saves += 1
+
+
+def test_partition_is_stable_and_complete():
+    domain_map = {f"site{i}.com": [] for i in range(100)}
+    parts = partition(domain_map, 4)
+    assert sum(len(p) for p in parts) == 100
+    assert all(parts[i].keys() == partition(domain_map, 4)[i].keys() for i in range(4))
+    assert min(len(p) for p in parts) > 10
+
+
+def test_shards_crawl_in_parallel_processes_with_one_writer():
+    manager = RecordingManager()
+    urls = [f"https://site{i}.com/rooms" for i in range(40)]
+
+    tiers = run_sharded(urls, None, shards=2, concurrency=3, track_processed=False, manager=manager,
+                        crawler_factory=make_crawler)
+
+    assert sorted(e["root_domain"] for e in manager.entities) == sorted(f"site{i}.com" for i in range(40))
+    pids = {e["pid"] for e in manager.entities}
+    assert len(pids) == 2 and os.getpid() not in pids
+    assert tiers["http"] == 40
+    assert manager.saves >= 4
@@ -0,0 +1,363 @@
+import asyncio
+import socketserver
+import threading
+import time
+
+import pytest
+
+from src.core.work_queue import RespClient, RedisWorkQueue, SqliteWorkQueue, open_work_queue
+from src.scrapers.core import deep_crawler
+from src.scrapers.core.deep_crawler import crawl_shared
+
+
+# --- Stand-in Redis server: the commands RedisWorkQueue uses, in memory ---
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+        self.lua = None
+
+    drop_reply = None                                  # command whose reply is lost once (connection drops)
+
+    def live(self, key):
+        if key in self.expires and self.expires[key] <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+    def handle(self, cmd, *args):
+        with self.lock:
+            return getattr(self, "cmd_" + cmd.lower())(*args)
+
+    def cmd_ping(self):
+        return "+PONG"
+
+    def cmd_set(self, key, value, *opts):
+        opts = [o.upper() for o in opts]
+        if "NX" in opts and self.live(key) is not None:
+            return None
+        self.data[key] = value
+        self.expires.pop(key, None)
+        if "PX" in opts:
+            self.expires[key] = time.time() + int(opts[opts.index("PX") + 1]) / 1000
+        return "+OK"
+
+    def cmd_get(self, key):
+        return self.live(key)
+
+    def cmd_del(self, *keys):
+        return sum(1 for key in keys if self.live(key) is not None and self.data.pop(key) is not None)
+
+    def cmd_pexpire(self, key, ms):
+        if self.live(key) is None:
+            return 0
+        self.expires[key] = time.time() + int(ms) / 1000
+        return 1
+
+    def hash(self, key):
+        return self.data.setdefault(key, {})
+
+    def cmd_hsetnx(self, key, field, value):
+        h = self.hash(key)
+        if field in h:
+            return 0
+        h[field] = value
+        return 1
+
+    def cmd_hset(self, key, field, value):
+        self.hash(key)[field] = value
+        return 1
+
+    def cmd_hget(self, key, field):
+        return self.hash(key).get(field)
+
+    def cmd_hincrby(self, key, field, amount):
+        h = self.hash(key)
+        h[field] = str(int(h.get(field, 0)) + int(amount))
+        return int(h[field])
+
+    def cmd_hlen(self, key):
+        return len(self.hash(key))
+
+    def cmd_hgetall(self, key):
+        return [x for pair in self.hash(key).items() for x in pair]
+
+    def cmd_zadd(self, key, *args):
+        z = self.hash(key)
+        xx = args[0].upper() == "XX"
+        score, member = args[-2:]
+        if xx and member not in z:
+            return 0
+        added = member not in z
+        z[member] = float(score)
+        return int(added)
+
+    def cmd_zrem(self, key, member):
+        return int(self.hash(key).pop(member, None) is not None)
+
+    def cmd_zscore(self, key, member):
+        score = self.hash(key).get(member)
+        return None if score is None else repr(score)
+
+    def cmd_zcard(self, key):
+        return len(self.hash(key))
+
+    @staticmethod
+    def bound(value):
+        if value in ("-inf", "+inf"):
+            return float(value), False
+        if value.startswith("("):
+            return float(value[1:]), True
+        return float(value), False
+
+    def in_range(self, score, low, high):
+        (lo, lo_open), (hi, hi_open) = self.bound(low), self.bound(high)
+        return (score > lo if lo_open else score >= lo) and (score < hi if hi_open else score <= hi)
+
+    def cmd_zrangebyscore(self, key, low, high, *opts):
+        members = sorted((s, m) for m, s in self.hash(key).items() if self.in_range(s, low, high))
+        if opts:
+            offset, count = int(opts[1]), int(opts[2])
+            members = members[offset:offset + count]
+        return [m for _, m in members]
+
+    def cmd_zcount(self, key, low, high):
+        return sum(1 for s in self.hash(key).values() if self.in_range(s, low, high))
+
+    def cmd_zrange(self, key, start, stop, *opts):
+        members = sorted((s, m) for m, s in self.hash(key).items())
+        stop = int(stop)
+        members = members[int(start):None if stop == -1 else stop + 1]
+        if opts:
+            return [x for s, m in members for x in (m, repr(s))]
+        return [m for _, m in members]
+
+
+    def cmd_eval(self, script, numkeys, *args):
+        """Runs the real Lua (lupa) with redis.call bound to this store, atomically like Redis."""
+        import lupa
+        if self.lua is None:
+            self.lua = lupa.LuaRuntime()
+            self.lua.globals().redis = self.lua.table_from({"call": self.lua_call})
+        keys, argv = args[:int(numkeys)], args[int(numkeys):]
+        self.lua.globals().KEYS = self.lua.table_from(keys)
+        self.lua.globals().ARGV = self.lua.table_from(argv)
+        return self.from_lua(self.lua.execute(script))
+
+    def lua_call(self, cmd, *args):
+        args = [str(int(a)) if isinstance(a, float) and a.is_integer() else str(a) for a in args]
+        return self.to_lua(getattr(self, "cmd_" + cmd.lower())(*args))
+
+    def to_lua(self, reply):
+        if reply is None:
+            return False
+        if isinstance(reply, list):
+            return self.lua.table_from([self.to_lua(r) for r in reply])
+        if isinstance(reply, str) and reply.startswith("+"):
+            return self.lua.table_from({"ok": reply[1:]})
+        return reply
+
+    def from_lua(self, value):
+        if value is None or value is False:
+            return None
+        if value is True:
+            return 1
+        if isinstance(value, (int, float)):
+            return int(value)
+        if isinstance(value, str):
+            return value
+        if value["ok"] is not None:
+            return "+" + value["ok"]
+        return [self.from_lua(value[i]) for i in range(1, len(value) + 1)]
+
+
+def encode(reply):
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, list):
+        return b"*%d\r\n" % len(reply) + b"".join(encode(r) for r in reply)
+    if reply.startswith("+"):
+        return reply.encode() + b"\r\n"
+    data = reply.encode()
+    return b"$%d\r\n%s\r\n" % (len(data), data)
+
+
+@pytest.fixture
+def redis_server():
+    pytest.importorskip("lupa")                       # the stand-in runs the queue's Lua scripts
+    store = FakeRedis()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            while True:
+                line = self.rfile.readline()
+                if not line:
+                    return
+                args = []
+                for _ in range(int(line[1:])):
+                    size = int(self.rfile.readline()[1:])
+                    args.append(self.rfile.read(size + 2)[:-2].decode())
+                reply = store.handle(*args)
+                if store.drop_reply == args[0].upper():
+                    store.drop_reply = None
+                    return                             # the command ran, its reply never arrives
+                self.wfile.write(encode(reply))
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1]
+    server.shutdown()
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def make_queue(request, tmp_path):
+    opened = []
+
+    def make(name="domains", **kwargs):
+        if request.param == "sqlite":
+            work_queue = SqliteWorkQueue(str(tmp_path / "queue.db"), name, **kwargs)
+        else:
+            port = request.getfixturevalue("redis_server")
+            work_queue = RedisWorkQueue(RespClient("127.0.0.1", port), name, **kwargs)
+        opened.append(work_queue)
+        return work_queue
+
+    yield make
+    for work_queue in opened:
+        work_queue.close()
+
+
+def test_leases_expire_and_results_are_shared(make_queue):
+    box_a, box_b = make_queue(visibility=0.3), make_queue(visibility=0.3)
+    assert box_a.put({"a.com": ["https://a.com"], "b.com": []}) == 2
+    assert box_b.put(["a.com", "c.com"]) == 1          # each item is added once, by whichever box
+
+    leases = box_a.lease("box-a", 2)
+    assert [lease.item for lease in leases] == ["a.com", "b.com"]
+    assert leases[0].payload == ["https://a.com"]
+    (other,) = box_b.lease("box-b", 5)                 # a.com, b.com are invisible
+    assert other.item == "c.com" and box_b.complete(other, None)
+
+    time.sleep(0.2)
+    assert box_a.heartbeat(leases[0])                  # a.com kept, b.com lets its lease run out
+    time.sleep(0.2)
+    stolen = box_b.lease("box-b", 5)
+    assert [lease.item for lease in stolen] == ["b.com"]
+    assert stolen[0].attempts == 2
+    assert not box_a.complete(leases[1], {"name": "late"})   # lease lost
+
+    assert box_a.complete(leases[0], {"name": "A PG"})
+    assert box_b.complete(stolen[0], None)
+    assert box_b.put(["a.com"]) == 0 and box_b.claim("a.com", "box-b") is None
+    assert box_a.results() == {"a.com": {"name": "A PG"}, "b.com": None, "c.com": None}
+    assert box_b.counts() == {"queued": 0, "leased": 0, "done": 3, "failed": 0}
+
+
+def test_release_retries_then_fails(make_queue):
+    work_queue = make_queue(max_attempts=2)
+    lease = work_queue.claim("flaky.com", "box-a", ["https://flaky.com"])
+    assert lease is not None and work_queue.claim("flaky.com", "box-b") is None
+
+    assert work_queue.release(lease, "timeout", retry_after=0.2)
+    assert work_queue.lease("box-a") == []              # waiting out the retry delay
+    time.sleep(0.25)
+    (lease,) = work_queue.lease("box-b")
+    assert lease.attempts == 2 and lease.payload == ["https://flaky.com"]
+    assert work_queue.release(lease, "timeout")
+    assert work_queue.counts()["failed"] == 1
+    assert work_queue.lease("box-a") == []
+
+
+def test_finished_item_is_not_leased_again_from_a_stale_candidate(redis_server):
+    box_a = RedisWorkQueue(RespClient("127.0.0.1", redis_server), "domains")
+    box_b = RedisWorkQueue(RespClient("127.0.0.1", redis_server), "domains")
+    box_a.put({"x.com": ["https://x.com"]})
+
+    # box-a picked x.com from ZRANGEBYSCORE; before it takes the lease, box-b leases and finishes it
+    picked_at = time.time()
+    (lease,) = box_b.lease("box-b")
+    assert box_b.complete(lease, {"name": "X PG"})
+
+    assert box_a.take("x.com", "box-a", picked_at) is None
+    assert box_a.lease("box-a") == [] and box_a.next_visible() is None
+    assert box_a.counts() == {"queued": 0, "leased": 0, "done": 1, "failed": 0}
+    box_a.close()
+    box_b.close()
+
+
+def test_lost_eval_reply_is_raised_not_resent(redis_server, monkeypatch):
+    work_queue = RedisWorkQueue(RespClient("127.0.0.1", redis_server), "domains")
+    work_queue.put(["x.com"])
+
+    monkeypatch.setattr(FakeRedis, "drop_reply", "EVAL")
+    with pytest.raises(ConnectionError):
+        work_queue.lease("box-a")
+    # The lease script ran once on the server; it is not sent a second time
+    assert work_queue.counts() == {"queued": 0, "leased": 1, "done": 0, "failed": 0}
+
+    monkeypatch.setattr(FakeRedis, "drop_reply", "HLEN")
+    assert work_queue.counts()["leased"] == 1          # reads are simply sent again
+    work_queue.close()
+
+
+class CountingCrawler:
+    def __init__(self, crawled):
+        self.crawled = crawled
+
+    async def sub_process_domain(self, root, pages):
+        self.crawled.append(root)
+        await asyncio.sleep(0.01)
+        return {"root_domain": root}
+
+
+def test_two_boxes_drain_one_domain_queue(make_queue):
+    seed = make_queue()
+    seed.put({f"site{i}.com": [] for i in range(30)})
+    crawled = []
+
+    async def two_boxes():
+        return await asyncio.gather(
+            crawl_shared(make_queue(), CountingCrawler(crawled), concurrency=3, holder="box-a", poll_interval=0.05),
+            crawl_shared(make_queue(), CountingCrawler(crawled), concurrency=3, holder="box-b", poll_interval=0.05),
+        )
+
+    counts = asyncio.run(two_boxes())
+    assert sum(counts) == 30 and all(counts)
+    assert sorted(crawled) == sorted(f"site{i}.com" for i in range(30))
+    assert len(seed.results()) == 30
+
+
+class FlakyCrawler(CountingCrawler):
+    async def sub_process_domain(self, root, pages):
+        self.crawled.append(root)
+        if self.crawled.count(root) == 1:
+            raise TimeoutError("first visit times out")
+        return {"root_domain": root}
+
+
+def test_failed_domain_is_retried_after_its_backoff(make_queue, monkeypatch):
+    monkeypatch.setattr(deep_crawler, "CRAWL_RETRY_BACKOFF", 0.2)
+    work_queue = make_queue()
+    work_queue.put(["flaky.com"])
+    crawled = []
+
+    # The released domain is invisible when the only worker looks again: it waits instead of exiting
+    assert asyncio.run(crawl_shared(work_queue, FlakyCrawler(crawled), concurrency=1, holder="box-a")) == 1
+    assert crawled == ["flaky.com", "flaky.com"]
+    assert work_queue.counts() == {"queued": 0, "leased": 0, "done": 1, "failed": 0}
+    assert work_queue.next_visible() is None
+
+
+def test_open_work_queue_picks_backend(tmp_path, redis_server):
+    sqlite_queue = open_work_queue(f"sqlite:///{tmp_path}/q.db", "queries")
+    redis_queue = open_work_queue(f"redis://127.0.0.1:{redis_server}/0", "queries")
+    assert isinstance(sqlite_queue, SqliteWorkQueue) and isinstance(redis_queue, RedisWorkQueue)
+    assert redis_queue.put(["pg in gota"]) == 1 and redis_queue.counts()["queued"] == 1
+    with pytest.raises(ValueError):
+        open_work_queue("kafka://x", "queries")
+    sqlite_queue.close()
+    redis_queue.close()